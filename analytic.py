@@ -0,0 +1,279 @@
+import numpy as np
+
+from distributions import get_distribution
+
+# Les lois viennent du registre de distributions.py, comme dans
+# QueueSimulator.generate_times : une durée de taux nominal rate suit la
+# loi de moyenne 1 mise à l'échelle 1/rate (vectorisé sur rate)
+
+
+def moments(rate, distribution="exponential"):
+    """
+    Moments d'ordre 1 et 2 d'une durée de taux nominal rate
+
+    Paramètres:
+    -----------
+    rate : float ou np.array
+        Taux nominal (moyenne 1/rate)
+    distribution : str, dict ou Distribution
+        Spécification de loi (voir distributions.get_distribution)
+
+    Retourne:
+    ---------
+    tuple : (E[X], E[X²])
+    """
+    unit = get_distribution(distribution)
+    mean = 1.0 / np.asarray(rate, dtype=np.float64)
+    return unit.mean * mean, unit.second_moment * mean**2
+
+
+def laplace_transform(s, rate, distribution="exponential"):
+    """
+    Transformée de Laplace-Stieltjes E[exp(-s X)] d'une durée de taux nominal rate
+
+    Paramètres:
+    -----------
+    s : np.array
+        Points d'évaluation (s ≥ 0 ; s < 0 donne la fonction génératrice des moments)
+    rate : float ou np.array
+        Taux nominal (moyenne 1/rate)
+    distribution : str, dict ou Distribution
+        Spécification de loi (voir distributions.get_distribution)
+
+    Retourne:
+    ---------
+    np.array : Valeurs de la transformée (NaN si elle n'est pas connue)
+    """
+    s = np.asarray(s, dtype=np.float64)
+    return get_distribution(distribution).laplace_transform(s / np.asarray(rate, dtype=np.float64))
+
+
+def mg1_metrics(lambda_values, mu=1.0, distribution="uniform"):
+    """
+    Métriques exactes de la file M/G/1 (formule de Pollaczek-Khinchine)
+
+    E[W] = λ E[S²] / (2 (1 - ρ)), E[T] = E[W] + E[S], ρ = λ E[S]
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Taux d'arrivée (tous calculés à la fois)
+    mu : float
+        Taux de service nominal
+    distribution : str, dict ou Distribution
+        Loi des services (comme simulate_MG1)
+
+    Retourne:
+    ---------
+    dict : Métriques moyennes par λ (NaN si ρ ≥ 1)
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    service_mean, service_second = moments(mu, distribution)
+    rho = lambda_values * service_mean
+    stable = rho < 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wait = np.where(stable, lambda_values * service_second / (2 * (1 - rho)), np.nan)
+    response = wait + service_mean
+    return {
+        "lambda": lambda_values,
+        "server_utilization": rho,
+        "mean_wait_time": wait,
+        "mean_response_time": response,
+        "mean_number_in_system": lambda_values * response,
+        "mean_number_in_queue": lambda_values * wait
+    }
+
+
+def mg1_discipline_metrics(lambda_values, mu=1.0, distribution="exponential", discipline="fifo",
+                           class_probabilities=None, grid_size=100000):
+    """
+    Métriques exactes de la file M/G/1 selon la discipline de service
+
+    Avec W0 = λ E[S²] / 2 (travail résiduel moyen) :
+    - "fifo" : Pollaczek-Khinchine, E[W] = W0 / (1 - ρ)
+    - "priority" (non préemptive, formule de Cobham) : la classe k, de
+      charge cumulée σ_k = ρ (p_0 + ... + p_k), attend
+      E[W_k] = W0 / ((1 - σ_{k-1}) (1 - σ_k))
+    - "sjf" (non préemptif) : un service x attend W0 / (1 - ρ(x⁻))², avec
+      ρ(x) = λ E[S ; S ≤ x], moyenné sur la loi des services par quadrature
+      sur sa fonction quantile (grid_size points)
+    - "ps" : E[T] = E[S] / (1 - ρ), quelle que soit la loi des services
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Taux d'arrivée (tous calculés à la fois)
+    mu : float
+        Taux de service nominal
+    distribution : str, dict ou Distribution
+        Loi des services
+    discipline : str
+        "fifo", "priority", "sjf" ou "ps"
+    class_probabilities : np.array
+        Probabilité de chaque classe (discipline "priority")
+    grid_size : int
+        Nombre de points de quadrature (discipline "sjf")
+
+    Retourne:
+    ---------
+    dict : Métriques moyennes par λ (NaN si ρ ≥ 1), avec pour "priority"
+           l'attente par classe "class_mean_wait_time" de forme (λ, classes)
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    service_mean, service_second = moments(mu, distribution)
+    rho = lambda_values * service_mean
+    residual = lambda_values * service_second / 2
+    stable = rho < 1
+    metrics = {"lambda": lambda_values, "server_utilization": rho}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if discipline == "fifo":
+            wait = residual / (1 - rho)
+        elif discipline == "priority":
+            if class_probabilities is None:
+                raise ValueError("La discipline 'priority' nécessite class_probabilities")
+            cumulative = np.cumsum(np.asarray(class_probabilities, dtype=np.float64))
+            sigma = rho[:, None] * cumulative
+            sigma_before = rho[:, None] * np.concatenate(([0.0], cumulative[:-1]))
+            class_wait = residual[:, None] / ((1 - sigma_before) * (1 - sigma))
+            metrics["class_mean_wait_time"] = np.where(stable[:, None], class_wait, np.nan)
+            wait = class_wait @ (np.asarray(class_probabilities) / cumulative[-1])
+        elif discipline == "sjf":
+            # Quantiles des services aux milieux de la grille, ρ(x⁻) par somme cumulée
+            u = (np.arange(grid_size) + 0.5) / grid_size
+            quantiles = get_distribution(distribution, 1.0 / mu).ppf(u)
+            partial_mean = (np.cumsum(quantiles) - quantiles) / grid_size
+            load_before = lambda_values[:, None] * partial_mean
+            wait = residual * np.mean(1 / (1 - load_before)**2, axis=1)
+        elif discipline == "ps":
+            wait = service_mean / (1 - rho) - service_mean
+        else:
+            raise ValueError(f"Discipline non supportée : {discipline}")
+    wait = np.where(stable, wait, np.nan)
+    response = wait + service_mean
+    metrics.update({
+        "mean_wait_time": wait,
+        "mean_response_time": response,
+        "mean_number_in_system": lambda_values * response,
+        "mean_number_in_queue": lambda_values * wait
+    })
+    return metrics
+
+
+def gm1_sigma(lambda_values, mu=1.0, distribution="uniform", tol=1e-14, max_iter=100):
+    """
+    Racine σ ∈ (0, 1) de σ = A*(μ (1 - σ)) pour la file G/M/1
+
+    A* est la transformée de Laplace des inter-arrivées. La fonction
+    f(σ) = A*(μ (1 - σ)) - σ est positive en 0 et négative juste sous 1
+    lorsque ρ < 1 : la racine est encadrée puis obtenue par dichotomie,
+    pour tous les λ à la fois (convergence garantie, ≈ 50 itérations).
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Taux d'arrivée nominaux
+    mu : float
+        Taux de service
+    distribution : str, dict ou Distribution
+        Loi des inter-arrivées (comme simulate_GM1)
+    tol : float
+        Largeur finale de l'encadrement
+    max_iter : int
+        Nombre maximal d'itérations
+
+    Retourne:
+    ---------
+    np.array : σ par λ (NaN si ρ ≥ 1 ou si la transformée de la loi n'est pas connue)
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    arrival_mean, _ = moments(lambda_values, distribution)
+    if np.isnan(laplace_transform(1.0, 1.0, distribution)):
+        return np.full(lambda_values.shape, np.nan)
+    low = np.zeros(lambda_values.shape)
+    high = np.full(lambda_values.shape, 1 - 1e-9)
+    for _ in range(max_iter):
+        middle = 0.5 * (low + high)
+        positive = laplace_transform(mu * (1 - middle), lambda_values, distribution) > middle
+        low = np.where(positive, middle, low)
+        high = np.where(positive, high, middle)
+        if np.all(high - low < tol):
+            break
+    return np.where(mu * arrival_mean > 1, 0.5 * (low + high), np.nan)
+
+
+def gm1_metrics(lambda_values, mu=1.0, distribution="uniform", quantiles=None):
+    """
+    Métriques exactes de la file G/M/1 à partir de σ (voir gm1_sigma)
+
+    T suit une loi Exp(μ (1 - σ)), P(W > t) = σ exp(-μ (1 - σ) t) ;
+    E[T] = 1 / (μ (1 - σ)), E[W] = σ / (μ (1 - σ)).
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Taux d'arrivée nominaux
+    mu : float
+        Taux de service
+    distribution : str, dict ou Distribution
+        Loi des inter-arrivées (comme simulate_GM1)
+    quantiles : dict
+        {suffixe: niveau} des quantiles à calculer (ex. {"p99": 0.99})
+
+    Retourne:
+    ---------
+    dict : Métriques par λ, dont "sigma" et les quantiles demandés
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    arrival_mean, _ = moments(lambda_values, distribution)
+    sigma = gm1_sigma(lambda_values, mu, distribution)
+    decay = mu * (1 - sigma)
+    arrival_rate = 1 / arrival_mean
+    metrics = {
+        "lambda": lambda_values,
+        "sigma": sigma,
+        "server_utilization": arrival_rate / mu,
+        "mean_wait_time": sigma / decay,
+        "mean_response_time": 1 / decay,
+        "mean_number_in_system": arrival_rate / decay,
+        "mean_number_in_queue": arrival_rate * sigma / decay
+    }
+    for label, level in (quantiles or {}).items():
+        metrics[f"response_time_{label}"] = -np.log(1 - level) / decay
+        metrics[f"wait_time_{label}"] = np.maximum(np.log(sigma / (1 - level)), 0) / decay
+    return metrics
+
+
+def analytic_metrics(model, lambda_values, mu=1.0, distribution="uniform", quantiles=None):
+    """
+    Métriques exactes d'un modèle, avec les mêmes lois que la simulation
+
+    Paramètres:
+    -----------
+    model : str
+        "MM1", "GM1" ou "MG1" (M/M/1 est traité comme G/M/1 exponentielle,
+        ce qui donne aussi ses quantiles)
+    lambda_values : np.array
+        Taux d'arrivée
+    mu : float
+        Taux de service
+    distribution : str, dict ou Distribution
+        Loi générale de G/M/1 (arrivées) ou M/G/1 (services)
+    quantiles : dict
+        {suffixe: niveau} des quantiles (G/M/1 et M/M/1 ; NaN pour M/G/1)
+
+    Retourne:
+    ---------
+    dict : Métriques par λ, aux mêmes clés que run_experiments
+    """
+    if model == "MM1":
+        return gm1_metrics(lambda_values, mu, "exponential", quantiles)
+    if model == "GM1":
+        return gm1_metrics(lambda_values, mu, distribution, quantiles)
+    if model == "MG1":
+        metrics = mg1_metrics(lambda_values, mu, distribution)
+        # Pas de forme close simple pour les quantiles de M/G/1
+        for label in (quantiles or {}):
+            metrics[f"response_time_{label}"] = np.full(len(metrics["lambda"]), np.nan)
+            metrics[f"wait_time_{label}"] = np.full(len(metrics["lambda"]), np.nan)
+        return metrics
+    raise ValueError(f"Modèle non supporté : {model}")
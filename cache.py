@@ -0,0 +1,209 @@
+import ast
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Version du format des entrées (stockage .npz) ; les changements de calcul
+# sont détectés par le contenu des modules (voir _kernel_files)
+CACHE_VERSION = 3
+
+# Module qui définit les cellules (simulate_cell, ...) : son contenu et celui
+# de tous les modules locaux qu'il importe, directement ou non, font partie
+# de la clé
+_ROOT_MODULE = "simulation.py"
+
+
+def _kernel_files(directory):
+    """
+    Modules locaux importés (transitivement) par _ROOT_MODULE, lui compris
+
+    Les imports sont lus dans le code source (ast), y compris ceux placés
+    dans les fonctions : toute modification d'un module dont une cellule
+    peut dépendre change la clé.
+
+    Retourne:
+    ---------
+    list : Noms de fichiers, triés
+    """
+    pending, found = [_ROOT_MODULE], set()
+    while pending:
+        name = pending.pop()
+        path = os.path.join(directory, name)
+        if name in found or not os.path.exists(path):
+            continue
+        found.add(name)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=name)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            else:
+                continue
+            pending.extend(module.split(".")[0] + ".py" for module in modules)
+    return sorted(found)
+
+
+def _code_version():
+    """
+    Empreinte du code de calcul : CACHE_VERSION, noms et contenu des modules de _kernel_files
+    """
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in _kernel_files(directory):
+        digest.update(name.encode())
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    """
+    Représentation JSON stable d'un paramètre de cellule
+
+    Les graines (SeedSequence) sont réduites à leur entropie et leur
+    spawn_key, les tableaux numpy à des listes, les lois (distributions.py)
+    à leurs paramètres et les fonctions à leur nom.
+    """
+    if isinstance(value, np.random.SeedSequence):
+        return {"entropy": str(value.entropy), "spawn_key": list(value.spawn_key)}
+    if isinstance(value, np.ndarray):
+        return [_canonical(v) for v in value.tolist()]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "describe"):
+        return _canonical(value.describe())
+    if callable(value):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, float):
+        return repr(value)
+    return value
+
+
+def _flatten(output, prefix=""):
+    """
+    Aplatit un résultat de cellule ({nom: tableau} ou {(i, modèle): {nom: tableau}})
+    en {"chemin/nom": tableau} pour un stockage .npz
+    """
+    flat = {}
+    for key, value in output.items():
+        name = "/".join(map(str, key)) if isinstance(key, tuple) else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix + name + "/"))
+        else:
+            flat[prefix + name] = np.asarray(value)
+    return flat
+
+
+def _unflatten(flat):
+    """
+    Opération inverse de _flatten
+    """
+    output = {}
+    for path, value in flat.items():
+        parts = path.split("/")
+        if len(parts) == 1:
+            output[path] = value
+            continue
+        key = tuple(int(part) if part.isdigit() else part for part in parts[:-1])
+        output.setdefault(key, {})[parts[-1]] = value
+    return output
+
+
+class ResultCache:
+    """
+    Cache disque des résultats de cellules, adressé par contenu
+
+    Chaque cellule est identifiée par l'empreinte SHA-256 de ses paramètres
+    (fonction, modèle, distribution, λ, μ, nb_clients, flux aléatoire, ...)
+    et de la version du code. Les résultats (statistiques résumées, ou tout
+    autre tableau) sont stockés dans un fichier .npz par cellule. La taille
+    totale est plafonnée : les entrées les moins récemment utilisées (date
+    de modification, rafraîchie à chaque lecture) sont supprimées en premier.
+    """
+
+    def __init__(self, directory=".cache_simulation", max_bytes=1024 ** 3):
+        """
+        Paramètres:
+        -----------
+        directory : str
+            Répertoire du cache (créé si besoin)
+        max_bytes : int
+            Taille maximale du cache sur disque
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.code_version = _code_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, task):
+        """
+        Clé (empreinte hexadécimale) d'une tâche (fonction, arguments)
+        """
+        payload = json.dumps({"code": self.code_version, "task": _canonical(task)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def contains(self, key):
+        """
+        Indique si une entrée est présente (sans la lire)
+        """
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """
+        Lit une entrée du cache
+
+        Retourne:
+        ---------
+        dict ou None : Résultat de la cellule, None si absent
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                output = _unflatten({name: data[name] for name in data.files})
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        # Rafraîchit la date d'utilisation (politique LRU)
+        os.utime(path)
+        return output
+
+    def put(self, key, output):
+        """
+        Enregistre le résultat d'une cellule (écriture atomique)
+
+        Le plafond de taille est appliqué par evict(), à appeler après une série d'écritures.
+        """
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as f:
+            np.savez(f, **_flatten(output))
+        os.replace(temporary, self._path(key))
+
+    def evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de max_bytes
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,469 @@
+import copy
+import hashlib
+
+import numpy as np
+
+# scipy.special (≈ 0.2 s d'import) n'est importé que par les lois qui s'en
+# servent, à la première utilisation
+
+
+class Distribution:
+    """
+    Loi d'une durée positive, paramétrée par sa moyenne et son SCV
+
+    Le SCV (carré du coefficient de variation, Var[X] / E[X]²) fixe la
+    forme de la loi, la moyenne son échelle : chaque famille implémente
+    sa version de moyenne 1 (_unit_sample, _unit_ppf, ...) et les
+    méthodes publiques la mettent à l'échelle. scaled() change d'échelle
+    sans recalculer les tables (lois empiriques), ce qui permet de
+    construire une loi une fois et de la réutiliser pour tout un balayage.
+    """
+
+    name = None
+    default_scv = 1.0
+
+    def __init__(self, mean=1.0, scv=None):
+        """
+        Paramètres:
+        -----------
+        mean : float
+            Moyenne de la loi
+        scv : float
+            Carré du coefficient de variation (None = valeur par défaut de la famille)
+        """
+        if mean <= 0:
+            raise ValueError("La moyenne d'une durée doit être strictement positive")
+        self.mean = mean
+        self.scv = self.default_scv if scv is None else scv
+
+    @property
+    def variance(self):
+        """
+        Variance de la loi
+        """
+        return self.scv * self.mean**2
+
+    @property
+    def second_moment(self):
+        """
+        Moment d'ordre 2, E[X²]
+        """
+        return (1 + self.scv) * self.mean**2
+
+    def scaled(self, mean):
+        """
+        Même loi (même forme) avec une autre moyenne
+        """
+        distribution = copy.copy(self)
+        distribution.mean = mean
+        return distribution
+
+    def sample(self, rng, size):
+        """
+        Tire des valeurs (vectorisé)
+
+        Paramètres:
+        -----------
+        rng : np.random.Generator
+            Flux aléatoire
+        size : int ou tuple
+            Nombre (ou forme) des valeurs
+
+        Retourne:
+        ---------
+        np.array : Valeurs tirées
+        """
+        return self._unit_sample(rng, size) * self.mean
+
+    def ppf(self, u):
+        """
+        Fonction quantile (inverse de la fonction de répartition), croissante en u
+
+        Utilisée pour les variables communes et antithétiques, qui
+        transforment des uniformes déjà tirées.
+        """
+        return self._unit_ppf(np.asarray(u, dtype=np.float64)) * self.mean
+
+    def laplace_transform(self, s):
+        """
+        Transformée de Laplace-Stieltjes E[exp(-s X)] (NaN si inconnue)
+
+        Pour s < 0 on obtient la fonction génératrice des moments E[exp(|s| X)],
+        infinie hors de son domaine.
+        """
+        return self._unit_laplace_transform(np.asarray(s, dtype=np.float64) * self.mean)
+
+    def tilted_sample(self, rng, eta, size):
+        """
+        Tire des valeurs sous la loi basculée de densité ∝ exp(η x) f(x)
+        (échantillonnage préférentiel, voir importance_sampling.py)
+        """
+        return self._unit_tilted_sample(rng, eta * self.mean, size) * self.mean
+
+    def describe(self):
+        """
+        Paramètres de la loi (affichage, clés du cache)
+        """
+        return {"name": self.name, "mean": self.mean, "scv": self.scv}
+
+    def _unit_sample(self, rng, size):
+        return self._unit_ppf(rng.random(size))
+
+    def _unit_laplace_transform(self, s):
+        return np.full(np.shape(s), np.nan)[()]
+
+    def _unit_tilted_sample(self, rng, eta, size):
+        raise ValueError(f"La loi {self.name} n'admet pas de basculement exponentiel (queue lourde ou non implémentée)")
+
+    def __repr__(self):
+        return f"{type(self).__name__}(mean={self.mean:.6g}, scv={self.scv:.6g})"
+
+
+class Exponential(Distribution):
+    """
+    Loi exponentielle (SCV = 1)
+    """
+
+    name = "exponential"
+
+    def __init__(self, mean=1.0, scv=None):
+        if scv not in (None, 1, 1.0):
+            raise ValueError("La loi exponentielle a un SCV égal à 1")
+        super().__init__(mean, 1.0)
+
+    def _unit_sample(self, rng, size):
+        return rng.standard_exponential(size)
+
+    def _unit_ppf(self, u):
+        return -np.log1p(-u)
+
+    def _unit_laplace_transform(self, s):
+        with np.errstate(divide="ignore"):
+            return np.where(1 + s > 0, 1 / (1 + s), np.inf)[()]
+
+    def _unit_tilted_sample(self, rng, eta, size):
+        return rng.standard_exponential(size) / (1 - eta)
+
+
+class Uniform(Distribution):
+    """
+    Loi uniforme centrée sur la moyenne (SCV ≤ 1/3 ; 1/12 par défaut : [0.5 m, 1.5 m])
+    """
+
+    name = "uniform"
+    default_scv = 1 / 12
+
+    def __init__(self, mean=1.0, scv=None):
+        super().__init__(mean, scv)
+        self.width = np.sqrt(12 * self.scv)       # Largeur du support (moyenne 1)
+        if self.width > 2:
+            raise ValueError("Une loi uniforme positive a un SCV au plus égal à 1/3")
+        self.low = 1 - self.width / 2
+
+    def _unit_ppf(self, u):
+        return self.low + self.width * u
+
+    def _unit_laplace_transform(self, s):
+        # (e^{-s a} - e^{-s b}) / (s (b - a)), écrit avec expm1 pour rester précis quand s → 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            value = np.exp(-s * self.low) * -np.expm1(-s * self.width) / (s * self.width)
+        return np.where(s == 0, 1.0, value)[()]
+
+    def _unit_tilted_sample(self, rng, eta, size):
+        u = rng.random(size)
+        if eta == 0:
+            return self.low + self.width * u
+        # Exponentielle tronquée à [a, b], par inversion
+        return self.low + np.log1p(u * np.expm1(eta * self.width)) / eta
+
+
+class TruncatedNormal(Distribution):
+    """
+    Loi normale tronquée à ]0, ∞[ de moyenne et SCV exacts (SCV < 1 ; 1/9 par défaut)
+
+    Les paramètres (c, σ) de la normale d'origine sont ajustés pour que la
+    loi conditionnée à X > 0 ait exactement la moyenne et le SCV demandés
+    (contrairement à |X|, qui décale la moyenne).
+    """
+
+    name = "normal"
+    default_scv = 1 / 9
+
+    def __init__(self, mean=1.0, scv=None, max_iter=200):
+        super().__init__(mean, scv)
+        if not 0 < self.scv < 1:
+            raise ValueError("Une loi normale tronquée a un SCV compris entre 0 et 1")
+        # Point fixe sur (c, σ) à partir de la normale non tronquée
+        self.center, self.std = 1.0, np.sqrt(self.scv)
+        for _ in range(max_iter):
+            mean_t, variance_t = self._truncated_moments(self.center, self.std)
+            if abs(mean_t - 1) < 1e-13 and abs(variance_t - self.scv) < 1e-13:
+                break
+            self.center += 1 - mean_t
+            self.std *= np.sqrt(self.scv / variance_t)
+        else:
+            raise ValueError(f"SCV {self.scv} inaccessible pour une loi normale tronquée")
+
+    @staticmethod
+    def _truncated_moments(center, std):
+        from scipy import special
+
+        # Rapport de Mills φ(α) / (1 - Φ(α)) en α = -c/σ, calculé de façon stable
+        alpha = -center / std
+        mills = np.sqrt(2 / np.pi) / special.erfcx(alpha / np.sqrt(2))
+        return center + std * mills, std**2 * (1 + alpha * mills - mills**2)
+
+    def _truncated_ppf(self, u, center):
+        from scipy import special
+
+        lower = special.ndtr(-center / self.std)
+        return center + self.std * special.ndtri(lower + u * (1 - lower))
+
+    def _unit_ppf(self, u):
+        return self._truncated_ppf(u, self.center)
+
+    def _unit_laplace_transform(self, s):
+        from scipy import special
+
+        return (np.exp(-s * self.center + 0.5 * (s * self.std)**2)
+                * special.ndtr(self.center / self.std - s * self.std) / special.ndtr(self.center / self.std))
+
+    def _unit_tilted_sample(self, rng, eta, size):
+        # exp(η x) φ((x - c)/σ) ∝ φ((x - c - η σ²)/σ) : normale tronquée décalée
+        return self._truncated_ppf(rng.random(size), self.center + eta * self.std**2)
+
+
+class LogNormal(Distribution):
+    """
+    Loi lognormale : ln X ~ N(m, s²) avec s² = ln(1 + SCV)
+    """
+
+    name = "lognormal"
+
+    def __init__(self, mean=1.0, scv=None):
+        super().__init__(mean, scv)
+        self.sigma = np.sqrt(np.log1p(self.scv))
+        self.mu = -0.5 * self.sigma**2
+
+    def _unit_sample(self, rng, size):
+        return rng.lognormal(self.mu, self.sigma, size)
+
+    def _unit_ppf(self, u):
+        from scipy import special
+
+        return np.exp(self.mu + self.sigma * special.ndtri(u))
+
+
+class Gamma(Distribution):
+    """
+    Loi gamma de forme k = 1/SCV et d'échelle SCV (moyenne 1)
+    """
+
+    name = "gamma"
+
+    def __init__(self, mean=1.0, scv=None):
+        super().__init__(mean, scv)
+        self.shape = 1 / self.scv
+
+    def _unit_sample(self, rng, size):
+        return rng.gamma(self.shape, self.scv, size)
+
+    def _unit_ppf(self, u):
+        from scipy import special
+
+        return special.gammaincinv(self.shape, u) * self.scv
+
+    def _unit_laplace_transform(self, s):
+        base = 1 + s * self.scv
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(base > 0, base ** -self.shape, np.inf)[()]
+
+    def _unit_tilted_sample(self, rng, eta, size):
+        return rng.gamma(self.shape, self.scv / (1 - eta * self.scv), size)
+
+
+class Pareto(Distribution):
+    """
+    Loi de Pareto P(X > x) = (x_m / x)^α, x ≥ x_m
+
+    Paramétrée par le SCV (α = 1 + √(1 + 1/SCV) > 2, 2 par défaut) ou
+    directement par alpha > 1 (variance infinie si α ≤ 2).
+    """
+
+    name = "pareto"
+    default_scv = 2.0
+
+    def __init__(self, mean=1.0, scv=None, alpha=None):
+        if alpha is not None:
+            if alpha <= 1:
+                raise ValueError("La loi de Pareto n'a une moyenne finie que pour alpha > 1")
+            scv = 1 / (alpha * (alpha - 2)) if alpha > 2 else np.inf
+        super().__init__(mean, scv)
+        self.alpha = alpha if alpha is not None else 1 + np.sqrt(1 + 1 / self.scv)
+        self.scale = (self.alpha - 1) / self.alpha       # x_m pour une moyenne 1
+
+    def _unit_sample(self, rng, size):
+        # (1 - U)^(-1/α) = exp(E / α) avec E ~ Exp(1)
+        return self.scale * np.exp(rng.standard_exponential(size) / self.alpha)
+
+    def _unit_ppf(self, u):
+        return self.scale * np.exp(-np.log1p(-u) / self.alpha)
+
+    def describe(self):
+        return {**super().describe(), "alpha": self.alpha}
+
+
+class Empirical(Distribution):
+    """
+    Loi empirique d'un échantillon (éventuellement pondéré, ex. histogramme)
+
+    Les valeurs sont ramenées à la moyenne 1 et les tables construites une
+    seule fois : tirage en O(1) par valeur, par lecture directe dans
+    l'échantillon trié (sans poids) ou par table d'alias de Walker (avec
+    poids) ; la fonction quantile utilise l'échantillon trié.
+    """
+
+    name = "empirical"
+
+    def __init__(self, values, weights=None, mean=None):
+        """
+        Paramètres:
+        -----------
+        values : np.array
+            Valeurs observées (positives)
+        weights : np.array
+            Poids des valeurs (None = échantillon brut)
+        mean : float
+            Moyenne de la loi (None = moyenne de l'échantillon)
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0 or np.any(values < 0):
+            raise ValueError("Une loi empirique demande des valeurs positives ou nulles")
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64).ravel()[order]
+            weights = weights / weights.sum()
+        data_mean = np.average(values, weights=weights)
+        self.values = values / data_mean              # Valeurs de moyenne 1, triées
+        self.weights = weights
+        scv = np.average((self.values - 1)**2, weights=weights)
+        super().__init__(data_mean if mean is None else mean, scv)
+        if weights is not None:
+            self.cumulative = np.cumsum(weights)
+            self.probability, self.alias = self._alias_table(weights)
+
+    @staticmethod
+    def _alias_table(weights):
+        """
+        Table d'alias de Walker (méthode de Vose), construite en O(n)
+        """
+        n = len(weights)
+        scaled = weights * n
+        probability = np.ones(n)
+        alias = np.arange(n)
+        small = list(np.flatnonzero(scaled < 1))
+        large = list(np.flatnonzero(scaled >= 1))
+        while small and large:
+            i, j = small.pop(), large.pop()
+            probability[i] = scaled[i]
+            alias[i] = j
+            scaled[j] -= 1 - scaled[i]
+            (small if scaled[j] < 1 else large).append(j)
+        return probability, alias
+
+    def _unit_sample(self, rng, size):
+        n = len(self.values)
+        u = rng.random(size) * n
+        index = u.astype(np.int64)
+        if self.weights is None:
+            return self.values[index]
+        # Partie fractionnaire de u n : choix entre la case et son alias
+        index = np.where(u - index < self.probability[index], index, self.alias[index])
+        return self.values[index]
+
+    def _unit_ppf(self, u):
+        if self.weights is None:
+            index = (u * len(self.values)).astype(np.int64)
+        else:
+            index = np.searchsorted(self.cumulative, u, side="right")
+        return self.values[np.minimum(index, len(self.values) - 1)]
+
+    def _unit_laplace_transform(self, s):
+        s = np.asarray(s, dtype=np.float64)
+        terms = np.exp(-np.multiply.outer(s, self.values))
+        return np.average(terms, axis=-1, weights=self.weights)[()]
+
+    def describe(self):
+        digest = hashlib.sha256(self.values.tobytes())
+        if self.weights is not None:
+            digest.update(self.weights.tobytes())
+        return {**super().describe(), "size": len(self.values), "digest": digest.hexdigest()}
+
+
+# Registre des familles de lois : nom -> fabrique(mean=..., scv=..., **paramètres)
+DISTRIBUTIONS = {
+    "exponential": Exponential,
+    "uniform": Uniform,
+    "normal": TruncatedNormal,
+    "lognormal": LogNormal,
+    "gamma": Gamma,
+    "pareto": Pareto
+}
+
+
+def register_distribution(name, factory):
+    """
+    Ajoute une famille de lois au registre
+
+    Paramètres:
+    -----------
+    name : str
+        Nom utilisé dans les spécifications
+    factory : callable
+        Fabrique appelée avec mean=..., scv=... et les paramètres de la
+        spécification, renvoyant une Distribution
+    """
+    DISTRIBUTIONS[name] = factory
+
+
+def get_distribution(spec, mean=1.0):
+    """
+    Construit la loi décrite par une spécification, avec la moyenne demandée
+
+    Paramètres:
+    -----------
+    spec : str, dict ou Distribution
+        Nom d'une famille du registre ("lognormal"), dictionnaire
+        ({"name": "gamma", "scv": 4}) ou loi déjà construite (mise à
+        l'échelle sans recalcul de ses tables)
+    mean : float
+        Moyenne de la loi (1/taux pour des inter-arrivées ou des services)
+
+    Retourne:
+    ---------
+    Distribution : Loi de moyenne mean
+    """
+    if isinstance(spec, Distribution):
+        return spec.scaled(mean)
+    if isinstance(spec, str):
+        name, params = spec, {}
+    elif isinstance(spec, dict):
+        params = dict(spec)
+        name = params.pop("name", None)
+    else:
+        raise ValueError(f"Spécification de loi non supportée : {spec!r}")
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"Distribution non supportée : {name} (choix : {', '.join(DISTRIBUTIONS)})")
+    return DISTRIBUTIONS[name](mean=mean, **params)
+
+
+def distribution_key(spec):
+    """
+    Clé hachable d'une spécification de loi (cache des temps de moyenne 1)
+    """
+    if isinstance(spec, Distribution):
+        return tuple(sorted((k, v) for k, v in spec.describe().items() if k != "mean"))
+    if isinstance(spec, dict):
+        return tuple(sorted(spec.items()))
+    return spec
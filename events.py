@@ -0,0 +1,268 @@
+import heapq
+import time
+from collections import deque
+
+import numpy as np
+
+# Disciplines de service disponibles ; "fifo" passe par les récursions
+# vectorisées (lindley.py, multiserver.py), les autres par le moteur à événements
+DISCIPLINES = ("fifo", "priority", "sjf", "ps")
+
+# Types d'événements du calendrier
+ARRIVAL = 0
+DEPARTURE = 1
+
+
+class FifoQueue:
+    """
+    File d'attente FIFO (deque)
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self):
+        self.items = deque()
+
+    def push(self, customer):
+        self.items.append(customer)
+
+    def pop(self):
+        return self.items.popleft()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class ClassQueues:
+    """
+    Priorités non préemptives : une deque par classe (0 = plus prioritaire)
+
+    pop() sert la première classe non vide, FIFO à l'intérieur d'une classe ;
+    le coût est O(nombre de classes), faible en pratique.
+    """
+
+    __slots__ = ("classes", "queues", "size")
+
+    def __init__(self, classes, n_classes):
+        """
+        Paramètres:
+        -----------
+        classes : list
+            Classe de chaque client
+        n_classes : int
+            Nombre de classes
+        """
+        self.classes = classes
+        self.queues = [deque() for _ in range(n_classes)]
+        self.size = 0
+
+    def push(self, customer):
+        self.queues[self.classes[customer]].append(customer)
+        self.size += 1
+
+    def pop(self):
+        self.size -= 1
+        for queue in self.queues:
+            if queue:
+                return queue.popleft()
+
+    def __len__(self):
+        return self.size
+
+
+class ShortestJobQueue:
+    """
+    Plus court service d'abord (SJF non préemptif) : tas binaire des (service, client)
+
+    À service égal, le client arrivé le premier est servi d'abord.
+    """
+
+    __slots__ = ("service_times", "heap")
+
+    def __init__(self, service_times):
+        """
+        Paramètres:
+        -----------
+        service_times : list
+            Durée de service de chaque client
+        """
+        self.service_times = service_times
+        self.heap = []
+
+    def push(self, customer):
+        heapq.heappush(self.heap, (self.service_times[customer], customer))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[1]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+def _run_non_preemptive(arrivals, services, queue, servers):
+    """
+    Moteur à événements des disciplines non préemptives (FIFO, priorités, SJF)
+
+    Le calendrier est un tas binaire (date, numéro d'ordre, type, client) :
+    insertion et extraction du prochain événement en O(log n). Il contient
+    au plus la prochaine arrivée et un départ par serveur occupé.
+    """
+    n = len(arrivals)
+    departures = [0.0] * n
+    waits = [0.0] * n
+    calendar = [(arrivals[0], 0, ARRIVAL, 0)]
+    sequence = 1
+    free_servers = servers
+    n_events = 0
+    push, pop = heapq.heappush, heapq.heappop
+    while calendar:
+        now, _, kind, customer = pop(calendar)
+        n_events += 1
+        if kind == ARRIVAL:
+            if customer + 1 < n:
+                push(calendar, (arrivals[customer + 1], sequence, ARRIVAL, customer + 1))
+                sequence += 1
+            if free_servers == 0:
+                queue.push(customer)
+                continue
+            free_servers -= 1
+        else:
+            departures[customer] = now
+            if not queue:
+                free_servers += 1
+                continue
+            customer = queue.pop()
+        # Début de service du client
+        waits[customer] = now - arrivals[customer]
+        push(calendar, (now + services[customer], sequence, DEPARTURE, customer))
+        sequence += 1
+    return departures, waits, n_events
+
+
+def _run_processor_sharing(arrivals, services, servers):
+    """
+    Moteur à événements du partage de processeur (PS)
+
+    Avec n clients présents, chacun est servi au taux min(1, c/n). Le temps
+    virtuel V(t) (service reçu par chaque client présent) croît à ce taux :
+    le client arrivé en V_a part quand V atteint V_a + S. Les fins
+    virtuelles sont gardées dans un tas ; le calendrier ne contient qu'un
+    départ valide, reprogrammé (numéro de version) à chaque changement de n.
+    """
+    n = len(arrivals)
+    departures = [0.0] * n
+    waits = [0.0] * n
+    calendar = [(arrivals[0], 0, ARRIVAL, 0)]
+    sequence = 1
+    jobs = []                 # Tas des (fin virtuelle, client)
+    virtual_time = 0.0
+    last_time = 0.0
+    version = 0               # Version du départ programmé
+    n_events = 0
+    push, pop = heapq.heappush, heapq.heappop
+    while calendar:
+        now, _, kind, data = pop(calendar)
+        if kind == DEPARTURE and data != version:
+            continue          # Départ périmé (n a changé depuis)
+        n_events += 1
+        if jobs:
+            virtual_time += (now - last_time) * min(1.0, servers / len(jobs))
+        last_time = now
+        if kind == ARRIVAL:
+            if data + 1 < n:
+                push(calendar, (arrivals[data + 1], sequence, ARRIVAL, data + 1))
+                sequence += 1
+            push(jobs, (virtual_time + services[data], data))
+        else:
+            virtual_time, customer = pop(jobs)
+            departures[customer] = now
+            waits[customer] = now - arrivals[customer] - services[customer]
+        # Reprogrammation du prochain départ
+        version += 1
+        if jobs:
+            rate = min(1.0, servers / len(jobs))
+            push(calendar, (now + (jobs[0][0] - virtual_time) / rate, sequence, DEPARTURE, version))
+            sequence += 1
+    return departures, waits, n_events
+
+
+def run_event_simulation(arrival_times, service_times, discipline="priority", classes=None, servers=1):
+    """
+    Simule une file à c serveurs avec une discipline de service donnée
+
+    Paramètres:
+    -----------
+    arrival_times : np.array
+        Temps d'arrivée absolus (croissants)
+    service_times : np.array
+        Tableau des temps de service
+    discipline : str
+        "fifo", "priority" (priorités non préemptives, classe 0 la plus
+        prioritaire), "sjf" (plus court service d'abord, non préemptif) ou
+        "ps" (partage de processeur)
+    classes : np.array
+        Classe de chaque client (entiers ≥ 0, discipline "priority")
+    servers : int
+        Nombre de serveurs
+
+    Retourne:
+    ---------
+    tuple : (departure_times, wait_times, nombre d'événements traités) ;
+            en PS, l'attente est le temps de réponse moins le service
+    """
+    if discipline not in DISCIPLINES:
+        raise ValueError(f"Discipline non supportée : {discipline} (choix : {', '.join(DISCIPLINES)})")
+    # Listes Python : accès élément par élément bien plus rapides que numpy
+    arrivals = np.asarray(arrival_times, dtype=np.float64).tolist()
+    services = np.asarray(service_times, dtype=np.float64).tolist()
+    if discipline == "ps":
+        departures, waits, n_events = _run_processor_sharing(arrivals, services, servers)
+    else:
+        if discipline == "priority":
+            if classes is None:
+                raise ValueError("La discipline 'priority' nécessite la classe de chaque client (classes)")
+            classes = np.asarray(classes, dtype=np.int64)
+            queue = ClassQueues(classes.tolist(), int(classes.max()) + 1)
+        elif discipline == "sjf":
+            queue = ShortestJobQueue(services)
+        else:
+            queue = FifoQueue()
+        departures, waits, n_events = _run_non_preemptive(arrivals, services, queue, servers)
+    return np.array(departures), np.array(waits), n_events
+
+
+def benchmark(discipline="priority", nb_clients=200000, rho=0.9, servers=1, n_classes=3, seed=0):
+    """
+    Débit du moteur à événements, en événements traités par seconde
+
+    Arrivées et services exponentiels (charge rho), classes équiprobables
+    pour la discipline "priority".
+
+    Paramètres:
+    -----------
+    discipline : str
+        Discipline simulée (voir run_event_simulation)
+    nb_clients : int
+        Nombre de clients simulés
+    rho : float
+        Charge λ / (c μ)
+    servers : int
+        Nombre de serveurs
+    n_classes : int
+        Nombre de classes de priorité
+    seed : int
+        Graine des tirages
+
+    Retourne:
+    ---------
+    dict : Nombre d'événements, durée (s) et débit ("events_per_second")
+    """
+    rng = np.random.default_rng(seed)
+    arrival_times = np.cumsum(rng.exponential(1.0 / (rho * servers), nb_clients))
+    service_times = rng.exponential(1.0, nb_clients)
+    classes = rng.integers(0, n_classes, nb_clients)
+    start = time.perf_counter()
+    _, _, n_events = run_event_simulation(arrival_times, service_times, discipline, classes, servers)
+    elapsed = time.perf_counter() - start
+    return {"discipline": discipline, "nb_clients": nb_clients, "events": n_events, "seconds": elapsed,
+            "events_per_second": n_events / elapsed}
@@ -0,0 +1,185 @@
+import numpy as np
+
+from lindley import lindley_recursion
+
+# Backends disponibles pour la récursion à capacité finie (file G/G/1/K FIFO)
+BACKENDS = ("python", "numpy", "numba")
+
+# Taille minimale des segments du backend "numpy" ; en dessous d'une
+# longueur moyenne de DENSE_REFUSALS × MIN_SEGMENT clients entre deux
+# refus, les segments sont trop courts pour être rentables et le reste du
+# bloc passe par la boucle
+MIN_SEGMENT = 64
+DENSE_REFUSALS = 4
+
+_numba_loop = None
+
+
+def _finite_loop(arrival_times, service_times, ring, last_departure, departure_times, wait_times):
+    """
+    Récursion client par client avec refus des clients trouvant K clients présents
+
+    `ring` contient les départs des K derniers clients admis, le plus ancien
+    en position 0 (-inf si la place n'a jamais été occupée) : un client est
+    admis si le K-ième admis avant lui est déjà parti. Remplit
+    `departure_times` et `wait_times` en place (NaN pour les clients
+    refusés), met à jour `ring` et retourne le dernier départ.
+    """
+    capacity = ring.shape[0]
+    position = 0
+    for i in range(arrival_times.shape[0]):
+        if ring[position] > arrival_times[i]:
+            # File pleine : le client est refusé
+            departure_times[i] = np.nan
+            wait_times[i] = np.nan
+            continue
+        wait_times[i] = max(0.0, last_departure - arrival_times[i])
+        departure_times[i] = arrival_times[i] + wait_times[i] + service_times[i]
+        last_departure = departure_times[i]
+        ring[position] = last_departure
+        position += 1
+        if position == capacity:
+            position = 0
+    # Le plus ancien départ revient en position 0
+    rotated = np.concatenate((ring[position:], ring[:position]))
+    ring[:] = rotated
+    return last_departure
+
+
+def _get_numba_loop():
+    """
+    Compile (une seule fois) la boucle à capacité finie avec numba
+    """
+    global _numba_loop
+    if _numba_loop is None:
+        try:
+            import numba
+        except ImportError as exc:
+            raise ImportError("Le backend 'numba' nécessite le paquet numba (pip install numba)") from exc
+        _numba_loop = numba.njit(cache=True)(_finite_loop)
+    return _numba_loop
+
+
+def _numba_available():
+    """
+    Indique si numba peut être importé
+    """
+    try:
+        _get_numba_loop()
+    except ImportError:
+        return False
+    return True
+
+
+def _segmented_recursion(arrival_times, service_times, ring, last_departure, departure_times, wait_times):
+    """
+    Même récursion, vectorisée par segments (backend "numpy")
+
+    Chaque segment est d'abord simulé sans refus (forme close de
+    lindley_recursion). Le nombre de clients présents à chaque arrivée
+    s'obtient par recherche dichotomique dans les départs croissants des
+    admis (départs reportés du segment précédent et départs du segment) :
+    le préfixe précédant la première arrivée trouvant K clients est exact
+    et admis en bloc, ce client est refusé et le segment suivant repart
+    juste après. La longueur des segments s'adapte à la distance entre
+    refus : peu de refus donnent de longs segments, et le coût reste
+    linéaire quand la file est rarement pleine. Si les refus deviennent
+    fréquents, la fin du bloc est confiée à la boucle client par client.
+    """
+    capacity = ring.shape[0]
+    n = arrival_times.shape[0]
+    index = 0
+    refusals = 0
+    segment = max(MIN_SEGMENT, capacity)
+    while index < n:
+        if refusals >= MIN_SEGMENT and index < refusals * DENSE_REFUSALS * MIN_SEGMENT:
+            last_departure = _finite_loop(arrival_times[index:], service_times[index:], ring, last_departure,
+                                          departure_times[index:], wait_times[index:])
+            return ring, last_departure
+        stop = min(n, index + segment)
+        arrivals = arrival_times[index:stop]
+        services = service_times[index:stop]
+        departures, waits = lindley_recursion(arrivals, services, "numpy", last_departure)
+
+        # Clients présents à chaque arrivée : admis reportés encore là et
+        # clients du segment arrivés avant et pas encore partis
+        carried = ring.shape[0] - np.searchsorted(ring, arrivals, side="right")
+        earlier = np.arange(len(arrivals)) - np.searchsorted(departures, arrivals, side="right")
+        full = np.flatnonzero(carried + earlier >= capacity)
+        admitted = len(arrivals) if len(full) == 0 else full[0]
+
+        departure_times[index:index + admitted] = departures[:admitted]
+        wait_times[index:index + admitted] = waits[:admitted]
+        if admitted > 0:
+            last_departure = departures[admitted - 1]
+            ring = np.concatenate((ring, departures[:admitted]))[-capacity:]
+        index += admitted
+        if len(full) > 0:
+            departure_times[index] = np.nan
+            wait_times[index] = np.nan
+            index += 1
+            refusals += 1
+            segment = max(MIN_SEGMENT, 2 * admitted)
+        else:
+            segment *= 2
+    return ring, last_departure
+
+
+def finite_capacity_recursion(arrival_times, service_times, capacity, backend="numpy", state=None):
+    """
+    Calcule les départs et les attentes d'une file FIFO mono-serveur de capacité K
+
+    K est le nombre maximal de clients dans le système (en service compris) :
+    un client qui arrive alors que K clients sont présents est refusé et
+    quitte le système. Les refus empêchent l'écriture en somme cumulée de
+    lindley_recursion ; trois noyaux donnent le même résultat :
+
+    - "numba" : boucle compilée avec un tampon circulaire des K derniers
+      départs admis ;
+    - "python" : même boucle interprétée (référence) ;
+    - "numpy" : boucle compilée si numba est installé, sinon segments
+      simulés par la forme close puis coupés au premier refus (voir
+      _segmented_recursion).
+
+    Paramètres:
+    -----------
+    arrival_times : np.array
+        Temps d'arrivée absolus (croissants), 1-D
+    service_times : np.array
+        Tableau des temps de service
+    capacity : int
+        Capacité K du système (≥ 1)
+    backend : str
+        "python", "numpy" ou "numba"
+    state : tuple
+        (départs des K derniers admis, dernier départ) reportés du bloc
+        précédent (None = système vide à t = 0)
+
+    Retourne:
+    ---------
+    tuple : (departure_times, wait_times, state) ; départs et attentes
+            valent NaN pour les clients refusés
+    """
+    if capacity < 1:
+        raise ValueError("La capacité K doit être au moins 1")
+    arrival_times = np.asarray(arrival_times, dtype=np.float64)
+    service_times = np.asarray(service_times, dtype=np.float64)
+    if state is None:
+        ring, last_departure = np.full(capacity, -np.inf), 0.0
+    else:
+        ring, last_departure = np.array(state[0], dtype=np.float64), float(state[1])
+    departure_times = np.empty(arrival_times.shape)
+    wait_times = np.empty(arrival_times.shape)
+
+    if backend == "numpy" and _numba_available():
+        backend = "numba"
+
+    if backend == "numpy":
+        ring, last_departure = _segmented_recursion(arrival_times, service_times, ring, last_departure,
+                                                    departure_times, wait_times)
+    elif backend in ("python", "numba"):
+        loop = _finite_loop if backend == "python" else _get_numba_loop()
+        last_departure = loop(arrival_times, service_times, ring, last_departure, departure_times, wait_times)
+    else:
+        raise ValueError(f"Backend non supporté : {backend} (choix : {', '.join(BACKENDS)})")
+    return departure_times, wait_times, (ring, last_departure)
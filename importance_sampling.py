@@ -0,0 +1,192 @@
+import numpy as np
+
+from analytic import laplace_transform, moments
+from distributions import get_distribution
+
+# Estimation de P(W > x) en régime stationnaire par échantillonnage
+# préférentiel (algorithme de Siegmund). D'après la récursion de Lindley,
+#     W = sup_{n≥0} (X_1 + ... + X_n),   X_k = S_k - A_k,
+# donc P(W > x) est la probabilité que la marche aléatoire X (de dérive
+# négative si ρ < 1) franchisse x. Sous la loi basculée exponentiellement
+# par θ*, racine de Cramér de E[exp(θ X)] = 1, la dérive devient positive,
+# le franchissement a lieu presque sûrement en τ pas, et
+#     Z = exp(-θ* (X_1 + ... + X_τ))
+# est un estimateur sans biais de P(W > x), d'erreur relative bornée
+# quel que soit x (alors que la méthode directe exige ~ 1/P(W > x) clients).
+
+
+def log_mgf(theta, rate, distribution="exponential"):
+    """
+    Logarithme de E[exp(θ X)] pour une durée de taux nominal rate (lois de distributions.py)
+
+    Paramètres:
+    -----------
+    theta : float ou np.array
+        Paramètre de basculement
+    rate : float
+        Taux nominal (moyenne 1/rate)
+    distribution : str, dict ou Distribution
+        Spécification de loi (transformée de Laplace connue)
+
+    Retourne:
+    ---------
+    np.array : log E[exp(θ X)] (inf hors du domaine de définition)
+    """
+    with np.errstate(divide="ignore"):
+        return np.log(laplace_transform(-np.asarray(theta, dtype=np.float64), rate, distribution))
+
+
+def cramer_root(lmbda, mu, arrival_distribution="exponential", service_distribution="exponential",
+                tol=1e-13, max_iter=200):
+    """
+    Racine θ* > 0 de log E[exp(θ S)] + log E[exp(-θ A)] = 0
+
+    La fonction est convexe, nulle en 0 et de pente E[S] - E[A] < 0 : la
+    racine positive est encadrée par doublement (la fonction vaut +inf au
+    bord du domaine de la génératrice) puis obtenue par dichotomie.
+
+    Paramètres:
+    -----------
+    lmbda, mu : float
+        Taux nominaux d'arrivée et de service
+    arrival_distribution, service_distribution : str, dict ou Distribution
+        Lois des inter-arrivées et des services
+    tol : float
+        Précision relative de θ*
+    max_iter : int
+        Nombre maximal d'itérations
+
+    Retourne:
+    ---------
+    float : θ*
+    """
+    arrival_mean, _ = moments(lmbda, arrival_distribution)
+    service_mean, _ = moments(mu, service_distribution)
+    if service_mean >= arrival_mean:
+        raise ValueError("ρ ≥ 1 : la file n'est pas stable, P(W > x) = 1")
+
+    def drift(theta):
+        return log_mgf(theta, mu, service_distribution) + log_mgf(-theta, lmbda, arrival_distribution)
+
+    if np.isnan(drift(1 / service_mean)):
+        raise ValueError("Transformée de Laplace inconnue : pas de racine de Cramér (loi à queue lourde ?)")
+    low, high = 0.0, 1 / service_mean
+    while drift(high) <= 0:
+        low, high = high, 2 * high
+    for _ in range(max_iter):
+        middle = 0.5 * (low + high)
+        if drift(middle) > 0:
+            high = middle
+        else:
+            low = middle
+        if high - low < tol * high:
+            break
+    return 0.5 * (low + high)
+
+
+def tilted_sample(rng, rate, distribution, eta, size):
+    """
+    Tire des durées selon la loi basculée de densité ∝ exp(η x) f(x)
+
+    Paramètres:
+    -----------
+    rng : np.random.Generator
+        Flux aléatoire
+    rate : float
+        Taux nominal de la loi d'origine (moyenne 1/rate)
+    distribution : str, dict ou Distribution
+        Spécification de loi : exponentielle (→ Exp(rate - η)), uniforme
+        (exponentielle tronquée), normale tronquée (normale tronquée
+        décalée) ou gamma (gamma d'échelle réduite) ; ValueError sinon
+    eta : float
+        Paramètre de basculement
+    size : int ou tuple
+        Forme du tableau tiré
+
+    Retourne:
+    ---------
+    np.array : Durées tirées sous la loi basculée
+    """
+    return get_distribution(distribution, 1.0 / rate).tilted_sample(rng, eta, size)
+
+
+def siegmund_tail_probability(x, lmbda, mu, arrival_distribution="exponential",
+                              service_distribution="exponential", n_paths=10000, arrival_rng=None,
+                              service_rng=None, confidence=0.95, block_size=64):
+    """
+    Estime P(W > x) en régime stationnaire par l'algorithme de Siegmund
+
+    Les n_paths marches basculées sont simulées ensemble, par blocs de
+    block_size pas (somme cumulée vectorisée) ; une marche s'arrête au
+    premier franchissement de x et contribue exp(-θ* S_τ).
+
+    Paramètres:
+    -----------
+    x : float
+        Seuil d'attente
+    lmbda, mu : float
+        Taux nominaux d'arrivée et de service
+    arrival_distribution, service_distribution : str, dict ou Distribution
+        Lois des inter-arrivées et des services (transformée de Laplace connue)
+    n_paths : int
+        Nombre de marches (d'échantillons indépendants)
+    arrival_rng, service_rng : np.random.Generator
+        Flux aléatoires des inter-arrivées et des services
+    confidence : float
+        Niveau de l'intervalle de confiance (loi normale)
+    block_size : int
+        Nombre de pas tirés à la fois par marche
+
+    Retourne:
+    ---------
+    dict : Probabilité estimée, erreur relative, intervalle de confiance,
+           θ*, nombre moyen de pas par marche, facteur de réduction de
+           variance par rapport à la méthode directe (p (1 - p) / Var(Z))
+           et gain de calcul à précision égale (clients simulés par la
+           méthode directe, supposés indépendants donc de façon optimiste
+           pour elle, rapportés aux pas de marche)
+    """
+    if x < 0:
+        raise ValueError("Le seuil x doit être positif ou nul")
+    arrival_rng = arrival_rng or np.random.default_rng()
+    service_rng = service_rng or np.random.default_rng()
+    theta = cramer_root(lmbda, mu, arrival_distribution, service_distribution)
+    service = get_distribution(service_distribution, 1.0 / mu)
+    arrival = get_distribution(arrival_distribution, 1.0 / lmbda)
+
+    position = np.zeros(n_paths)          # Somme X_1 + ... + X_k de chaque marche
+    crossing = np.empty(n_paths)          # S_τ au franchissement
+    active = np.arange(n_paths)           # Marches n'ayant pas encore franchi x
+    total_steps = 0
+    while len(active) > 0:
+        shape = (len(active), block_size)
+        steps = (service.tilted_sample(service_rng, theta, shape)
+                 - arrival.tilted_sample(arrival_rng, -theta, shape))
+        paths = position[active, None] + np.cumsum(steps, axis=1)
+        above = paths > x
+        crossed = above.any(axis=1)
+        first = np.argmax(above, axis=1)
+
+        done = active[crossed]
+        crossing[done] = paths[crossed, first[crossed]]
+        total_steps += int(np.sum(first[crossed] + 1)) + block_size * int(np.sum(~crossed))
+        position[active[~crossed]] = paths[~crossed, -1]
+        active = active[~crossed]
+
+    from scipy import special
+
+    samples = np.exp(-theta * crossing)
+    probability = np.mean(samples)
+    std = np.std(samples, ddof=1)
+    half_width = special.ndtri((1 + confidence) / 2) * std / np.sqrt(n_paths)
+    return {
+        "threshold": x,
+        "probability": probability,
+        "relative_error": std / np.sqrt(n_paths) / probability,
+        "ci": (probability - half_width, probability + half_width),
+        "theta": theta,
+        "n_paths": n_paths,
+        "mean_steps": total_steps / n_paths,
+        "variance_reduction": probability * (1 - probability) / std**2,
+        "efficiency_gain": probability * (1 - probability) / std**2 / (total_steps / n_paths)
+    }
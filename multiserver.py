@@ -0,0 +1,179 @@
+import warnings
+
+import numpy as np
+
+from lindley import lindley_recursion
+
+# Backends disponibles pour la récursion multi-serveurs (file G/G/c FIFO)
+BACKENDS = ("python", "numpy", "numba")
+
+_numba_loop = None
+
+
+def _heap_loop(arrival_times, service_times, free_times, departure_times, wait_times, servers):
+    """
+    Récursion client par client avec un tas binaire des dates de libération
+
+    Le tas (tableaux heap_time / heap_server, ordre lexicographique
+    (date, serveur)) donne en O(1) le serveur libéré le plus tôt ; après
+    affectation du client, sa nouvelle date de libération redescend en
+    O(log c). Remplit `departure_times`, `wait_times` et `servers` en place
+    et met à jour `free_times` (date de libération de chaque serveur).
+    """
+    c = free_times.shape[0]
+    heap_server = np.argsort(free_times, kind="mergesort")
+    heap_time = free_times[heap_server]
+    for i in range(arrival_times.shape[0]):
+        # Le client prend le serveur libéré le plus tôt (FIFO)
+        start = max(heap_time[0], arrival_times[i])
+        wait_times[i] = start - arrival_times[i]
+        departure_times[i] = start + service_times[i]
+        servers[i] = heap_server[0]
+
+        # Descente de la nouvelle date de libération dans le tas
+        time = departure_times[i]
+        server = heap_server[0]
+        k = 0
+        while True:
+            child = 2 * k + 1
+            if child >= c:
+                break
+            right = child + 1
+            if right < c and (heap_time[right] < heap_time[child] or
+                              (heap_time[right] == heap_time[child] and heap_server[right] < heap_server[child])):
+                child = right
+            if heap_time[child] < time or (heap_time[child] == time and heap_server[child] < server):
+                heap_time[k] = heap_time[child]
+                heap_server[k] = heap_server[child]
+                k = child
+            else:
+                break
+        heap_time[k] = time
+        heap_server[k] = server
+
+    for k in range(c):
+        free_times[heap_server[k]] = heap_time[k]
+
+
+def _get_numba_loop():
+    """
+    Compile (une seule fois) la boucle à tas avec numba
+    """
+    global _numba_loop
+    if _numba_loop is None:
+        try:
+            import numba
+        except ImportError as exc:
+            raise ImportError("Le backend 'numba' nécessite le paquet numba (pip install numba)") from exc
+        _numba_loop = numba.njit(cache=True)(_heap_loop)
+    return _numba_loop
+
+
+def _numba_available():
+    """
+    Indique si numba peut être importé
+    """
+    try:
+        _get_numba_loop()
+    except ImportError:
+        return False
+    return True
+
+
+def multiserver_recursion(arrival_times, service_times, c, backend="numpy", free_times=None):
+    """
+    Calcule les départs et les attentes d'une file FIFO à c serveurs
+
+    Récursion de Kiefer-Wolfowitz : chaque client, dans l'ordre d'arrivée,
+    est servi par le serveur libéré le plus tôt (à date égale, celui de plus
+    petit indice), à partir de max(arrivée, libération). L'état reporté
+    d'un bloc à l'autre est le vecteur des dates de libération des serveurs.
+
+    - "numba" : boucle à tas binaire compilée, O(n log c) (≈ 1 s pour
+      10^7 clients à c = 64) ;
+    - "python" : même boucle interprétée (référence) ;
+    - "numpy" : pour des tableaux 2-D, une itération par client vectorisée
+      sur toutes les réplications (argmin sur les c serveurs) ; adaptée aux
+      lots de nombreuses réplications courtes. Une réplication isolée n'a
+      pas de forme vectorisée : elle passe par la boucle à tas, compilée si
+      numba est installé ; sans numba, le repli sur la boucle interprétée
+      (≈ 100× plus lente) émet un RuntimeWarning. Avec c = 1, la forme close de
+      lindley.lindley_recursion est utilisée.
+
+    Les trois backends affectent les clients aux mêmes serveurs.
+
+    Paramètres:
+    -----------
+    arrival_times : np.array
+        Temps d'arrivée absolus (croissants), 1-D ou 2-D (une réplication
+        par ligne, la récursion porte sur le dernier axe)
+    service_times : np.array
+        Tableau des temps de service
+    c : int
+        Nombre de serveurs
+    backend : str
+        "python", "numpy" ou "numba"
+    free_times : np.array
+        Dates de libération des serveurs au début du bloc, de forme
+        (..., c) (None = serveurs libres à t = 0) ; non modifié
+
+    Retourne:
+    ---------
+    tuple : (departure_times, wait_times, servers, free_times), où servers
+            est l'indice du serveur de chaque client et free_times les dates
+            de libération à la fin du bloc
+    """
+    arrival_times = np.asarray(arrival_times, dtype=np.float64)
+    service_times = np.asarray(service_times, dtype=np.float64)
+    batch_shape = arrival_times.shape[:-1]
+    if free_times is None:
+        free_times = np.zeros(batch_shape + (c,))
+    else:
+        free_times = np.array(np.broadcast_to(free_times, batch_shape + (c,)), dtype=np.float64)
+
+    if backend == "numpy" and c > 1 and arrival_times.ndim == 1:
+        if _numba_available():
+            backend = "numba"
+        else:
+            warnings.warn("multiserver_recursion : pas de forme vectorisée pour une réplication isolée "
+                          "à c > 1 et numba absent, repli sur la boucle Python (≈ 100× plus lente) ; "
+                          "installer numba ou passer backend=\"python\" explicitement",
+                          RuntimeWarning, stacklevel=2)
+            backend = "python"
+
+    if backend == "numpy":
+        if c == 1:
+            departure_times, wait_times = lindley_recursion(arrival_times, service_times, "numpy",
+                                                            free_times[..., 0])
+            free_times[..., 0] = departure_times[..., -1]
+            return departure_times, wait_times, np.zeros(arrival_times.shape, dtype=np.int64), free_times
+        # Réplications sur les lignes, une itération par client
+        free = free_times.reshape(-1, c)
+        arrivals = arrival_times.reshape(-1, arrival_times.shape[-1])
+        services = service_times.reshape(arrivals.shape)
+        rows = np.arange(free.shape[0])
+        departure_times = np.empty(arrivals.shape)
+        wait_times = np.empty(arrivals.shape)
+        servers = np.empty(arrivals.shape, dtype=np.int64)
+        for i in range(arrivals.shape[1]):
+            chosen = np.argmin(free, axis=1)
+            start = np.maximum(free[rows, chosen], arrivals[:, i])
+            wait_times[:, i] = start - arrivals[:, i]
+            departure_times[:, i] = start + services[:, i]
+            servers[:, i] = chosen
+            free[rows, chosen] = departure_times[:, i]
+        return (departure_times.reshape(arrival_times.shape), wait_times.reshape(arrival_times.shape),
+                servers.reshape(arrival_times.shape), free.reshape(free_times.shape))
+
+    if backend in ("python", "numba"):
+        loop = _heap_loop if backend == "python" else _get_numba_loop()
+        departure_times = np.empty(arrival_times.shape)
+        wait_times = np.empty(arrival_times.shape)
+        servers = np.empty(arrival_times.shape, dtype=np.int64)
+        # Une réplication (ligne) à la fois pour les tableaux 2-D
+        for index in np.ndindex(batch_shape):
+            loop(arrival_times[index], service_times[index], free_times[index],
+                 departure_times[index], wait_times[index], servers[index])
+        return departure_times, wait_times, servers, free_times
+
+    raise ValueError(f"Backend non supporté : {backend} (choix : {', '.join(BACKENDS)})")
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Réseau de files FIFO : chaque station est décrite par un dictionnaire
+#     {"mu": taux de service par serveur, "distribution": loi des services,
+#      "servers": nombre de serveurs}
+# (valeurs par défaut : mu du simulateur, "exponential", 1 serveur) et le
+# routage par une matrice P, P[i, j] étant la probabilité qu'un client
+# sortant de i aille en j ; il quitte le réseau avec la probabilité
+# 1 - Σ_j P[i, j]. Une ligne en tandem (0 → 1 → ... → n-1 → sortie)
+# correspond à tandem_routing(n).
+
+
+def tandem_routing(n_stations):
+    """
+    Matrice de routage d'une ligne en tandem 0 → 1 → ... → n-1 → sortie
+    """
+    return np.eye(n_stations, k=1)
+
+
+def check_routing(routing, entry_probabilities=None):
+    """
+    Vérifie et normalise le routage d'un réseau
+
+    Paramètres:
+    -----------
+    routing : np.array
+        Matrice de routage (n, n)
+    entry_probabilities : np.array
+        Probabilité qu'une arrivée externe entre par chaque station
+        (None = toutes par la station 0)
+
+    Retourne:
+    ---------
+    tuple : (routing, entry_probabilities) en tableaux numpy
+    """
+    routing = np.atleast_2d(np.asarray(routing, dtype=np.float64))
+    n_stations = routing.shape[0]
+    if routing.shape != (n_stations, n_stations):
+        raise ValueError("La matrice de routage doit être carrée (une ligne et une colonne par station)")
+    if np.any(routing < 0) or np.any(routing.sum(axis=1) > 1 + 1e-12):
+        raise ValueError("Chaque ligne de routage doit contenir des probabilités de somme ≤ 1")
+    if entry_probabilities is None:
+        entry_probabilities = np.eye(n_stations)[0]
+    entry_probabilities = np.asarray(entry_probabilities, dtype=np.float64)
+    if entry_probabilities.shape != (n_stations,) or abs(entry_probabilities.sum() - 1) > 1e-12:
+        raise ValueError("Les probabilités d'entrée doivent avoir une valeur par station et sommer à 1")
+    return routing, entry_probabilities
+
+
+def topological_order(routing):
+    """
+    Ordre des stations tel que tout client ne va que vers des stations ultérieures
+
+    La simulation station par station (les départs d'une station forment
+    les arrivées des suivantes) exige un routage sans cycle.
+
+    Retourne:
+    ---------
+    list : Indices des stations dans l'ordre de traitement
+    """
+    links = np.asarray(routing) > 0
+    remaining_inputs = links.sum(axis=0)
+    ready = [k for k in range(len(links)) if remaining_inputs[k] == 0]
+    order = []
+    while ready:
+        station = ready.pop(0)
+        order.append(station)
+        for target in np.flatnonzero(links[station]):
+            remaining_inputs[target] -= 1
+            if remaining_inputs[target] == 0:
+                ready.append(target)
+    if len(order) < len(links):
+        raise ValueError("Le routage contient un cycle : seuls les réseaux sans retour (feed-forward) sont simulés")
+    return order
+
+
+def route(rng, probabilities, size):
+    """
+    Tire la destination de size clients (tableau des cumuls + recherche dichotomique)
+
+    Paramètres:
+    -----------
+    rng : np.random.Generator
+        Flux aléatoire du routage
+    probabilities : np.array
+        Probabilité de chaque destination (la masse manquante = sortie)
+    size : int
+        Nombre de clients
+
+    Retourne:
+    ---------
+    np.array : Indice de la destination de chaque client (len(probabilities) = sortie)
+    """
+    cumulative = np.cumsum(probabilities)
+    return np.searchsorted(cumulative, rng.random(size), side="right")
+
+
+def traffic_rates(lmbda, routing, entry_probabilities):
+    """
+    Taux d'arrivée total de chaque station (équations de trafic de Jackson)
+
+    λ_k = λ e_k + Σ_i λ_i P[i, k], soit λ = (I - Pᵀ)⁻¹ λ e
+
+    Retourne:
+    ---------
+    np.array : Taux d'arrivée par station
+    """
+    n_stations = len(entry_probabilities)
+    return np.linalg.solve(np.eye(n_stations) - np.asarray(routing).T, lmbda * np.asarray(entry_probabilities))
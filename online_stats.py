@@ -0,0 +1,355 @@
+import numpy as np
+
+
+class RunningStats:
+    """
+    Statistiques courantes (effectif, moyenne, variance, min, max) d'une série
+
+    Les valeurs sont ajoutées par blocs (tableaux numpy) et combinées avec la
+    formule de Chan et al. (généralisation par blocs de l'algorithme de
+    Welford) : une seule passe, mémoire constante, et deux instances
+    calculées séparément (blocs, réplications, processus) se fusionnent
+    exactement avec merge().
+    """
+
+    def __init__(self):
+        self.count = 0            # Nombre de valeurs agrégées
+        self.mean = 0.0           # Moyenne courante
+        self.m2 = 0.0             # Somme des carrés des écarts à la moyenne
+        self.min = np.inf         # Plus petite valeur
+        self.max = -np.inf        # Plus grande valeur
+
+    def update(self, values):
+        """
+        Ajoute un bloc de valeurs
+
+        Paramètres:
+        -----------
+        values : np.array
+            Valeurs à agréger
+
+        Retourne:
+        ---------
+        RunningStats : L'instance elle-même
+        """
+        values = np.asarray(values)
+        if values.size == 0:
+            return self
+        block = RunningStats()
+        block.count = values.size
+        block.mean = np.mean(values)
+        block.m2 = np.var(values) * values.size
+        block.min = np.min(values)
+        block.max = np.max(values)
+        return self.merge(block)
+
+    def merge(self, other):
+        """
+        Fusionne les statistiques d'une autre instance dans celle-ci
+
+        Paramètres:
+        -----------
+        other : RunningStats
+            Statistiques à fusionner
+
+        Retourne:
+        ---------
+        RunningStats : L'instance elle-même
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """
+        Variance empirique (non biaisée) des valeurs agrégées
+        """
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        """
+        Écart-type empirique des valeurs agrégées
+        """
+        return np.sqrt(self.variance)
+
+    def to_dict(self):
+        """
+        Résumé sous forme de dictionnaire (pour l'affichage ou la sauvegarde)
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.min,
+            "max": self.max
+        }
+
+    def __repr__(self):
+        return (f"RunningStats(count={self.count}, mean={self.mean:.6g}, "
+                f"variance={self.variance:.6g}, min={self.min:.6g}, max={self.max:.6g})")
+
+
+def mser_truncation(series, batch_size=5):
+    """
+    Point de troncature du régime transitoire selon la règle MSER-m
+
+    La série est regroupée en moyennes de lots de batch_size valeurs
+    (MSER-5 par défaut) ; on retient le nombre de lots supprimés d qui
+    minimise l'erreur standard de la moyenne des lots restants,
+        MSER(d) = Σ_{j≥d} (Z_j - Z̄_d)² / (k - d)²,
+    calculée pour tous les d à la fois par sommes cumulées inversées.
+    Comme d'usage, d est limité à la première moitié de la série.
+
+    Paramètres:
+    -----------
+    series : np.array
+        Série observée (par exemple les temps d'attente successifs)
+    batch_size : int
+        Taille des lots
+
+    Retourne:
+    ---------
+    int : Nombre d'observations à supprimer en début de série
+    """
+    n_batches = len(series) // batch_size
+    if n_batches < 2:
+        return 0
+    batch_means = np.mean(np.reshape(series[:n_batches * batch_size], (n_batches, batch_size)), axis=1)
+
+    # Sommes des lots restants (d..k-1) pour chaque d
+    suffix_sum = np.cumsum(batch_means[::-1])[::-1]
+    suffix_sum_sq = np.cumsum((batch_means * batch_means)[::-1])[::-1]
+    remaining = np.arange(n_batches, 0, -1)
+    sse = suffix_sum_sq - suffix_sum * suffix_sum / remaining
+    mser = sse / (remaining * remaining)
+
+    best = int(np.argmin(mser[:n_batches // 2]))
+    return best * batch_size
+
+
+class QueueLengthStats:
+    """
+    Processus du nombre de clients N(t) et ses moyennes temporelles
+
+    Les dates d'arrivée et de départ (toutes deux croissantes en FIFO) sont
+    fusionnées par un tri stable, N(t) est obtenu par somme cumulée des
+    sauts +1/-1, puis chaque palier est pondéré par sa durée : aucune
+    boucle sur les événements. Les blocs successifs du mode stream sont
+    traités avec un horizon (dernière arrivée du bloc) : les départs
+    postérieurs sont conservés pour le bloc suivant, ce qui donne les mêmes
+    paliers qu'un traitement en une fois. Avec plusieurs serveurs, les
+    départs ne sont plus dans l'ordre des arrivées et sont triés.
+    """
+
+    def __init__(self, observation_start=0.0, servers=1):
+        """
+        Paramètres:
+        -----------
+        observation_start : float
+            Début de la fenêtre d'observation (après le régime transitoire)
+        servers : int
+            Nombre de serveurs c (Lq est la moyenne de max(N(t) - c, 0))
+        """
+        self.observation_start = observation_start
+        self.servers = servers
+        self.time = 0.0                   # Dernier instant traité
+        self.number = 0                   # Nombre de clients à cet instant
+        self.pending = np.empty(0)        # Départs connus postérieurs à l'horizon
+        self.area = 0.0                   # ∫ N(t) dt
+        self.queue_area = 0.0             # ∫ max(N(t) - c, 0) dt
+        self.occupancy = np.zeros(1)      # Temps passé avec n clients
+
+    def update(self, arrival_times, departure_times, horizon=np.inf):
+        """
+        Intègre les événements d'un bloc jusqu'à l'horizon
+
+        Paramètres:
+        -----------
+        arrival_times, departure_times : np.array
+            Dates d'arrivée et de départ des clients du bloc
+        horizon : float
+            Instant jusqu'auquel tous les événements sont connus (dernière
+            arrivée du bloc ; np.inf pour le dernier bloc)
+        """
+        # Les départs en attente précèdent ceux du bloc (FIFO mono-serveur)
+        departures = np.concatenate((self.pending, departure_times))
+        if self.servers > 1:
+            departures.sort()
+        n_departures = np.searchsorted(departures, horizon, side="right")
+        self.pending = departures[n_departures:]
+        departures = departures[:n_departures]
+        if len(arrival_times) + n_departures == 0:
+            return self
+
+        # Fusion des événements et niveaux successifs de N(t)
+        times = np.concatenate((arrival_times, departures))
+        steps = np.concatenate((np.ones(len(arrival_times), dtype=np.int64),
+                                -np.ones(n_departures, dtype=np.int64)))
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        levels = self.number + np.cumsum(steps[order])
+
+        # Paliers [t_k, t_{k+1}) restreints à la fenêtre d'observation
+        bounds = np.maximum(np.concatenate(([self.time], times)), self.observation_start)
+        durations = np.diff(bounds)
+        segment_levels = np.concatenate(([self.number], levels[:-1]))
+
+        self.area += np.dot(segment_levels, durations)
+        self.queue_area += np.dot(np.maximum(segment_levels - self.servers, 0), durations)
+        occupancy = np.bincount(segment_levels, weights=durations)
+        if len(occupancy) > len(self.occupancy):
+            occupancy[:len(self.occupancy)] += self.occupancy
+            self.occupancy = occupancy
+        else:
+            self.occupancy[:len(occupancy)] += occupancy
+
+        self.time = times[-1]
+        self.number = levels[-1]
+        return self
+
+    def summary(self):
+        """
+        Moyennes temporelles sur la fenêtre d'observation
+
+        Retourne:
+        ---------
+        dict : L (mean_number_in_system), Lq (mean_number_in_queue) et
+               P(N=n) (queue_length_distribution, indice n)
+        """
+        total_time = self.time - self.observation_start
+        return {
+            "mean_number_in_system": self.area / total_time,
+            "mean_number_in_queue": self.queue_area / total_time,
+            "queue_length_distribution": self.occupancy / total_time
+        }
+
+
+class QuantileSketch:
+    """
+    Quantiles approchés d'une série par histogramme à classes logarithmiques
+
+    Les valeurs de [min_value, max_value) sont réparties dans des classes
+    [m γ^(i-1), m γ^i) avec γ = (1 + α) / (1 - α) : le représentant de
+    chaque classe est à moins de α (précision relative) de toute valeur de
+    la classe, donc tout quantile est estimé à α près en relatif (sans
+    erreur de rang au-delà de la classe). Les valeurs inférieures à
+    min_value (attentes nulles) forment la classe 0, estimée par 0, et
+    celles supérieures à max_value la dernière classe.
+
+    La mémoire est fixe (≈ 1400 classes pour α = 1 % sur 12 décades), la
+    mise à jour d'un bloc est vectorisée (logarithme + bincount) et deux
+    histogrammes de mêmes paramètres se fusionnent exactement par addition
+    des effectifs (blocs, réplications, processus).
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-6, max_value=1e6):
+        """
+        Paramètres:
+        -----------
+        relative_accuracy : float
+            Précision relative α des quantiles estimés
+        min_value, max_value : float
+            Plage des valeurs résolues
+        """
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        n_buckets = int(np.ceil(np.log(max_value / min_value) / self.log_gamma))
+        self.counts = np.zeros(n_buckets + 2, dtype=np.int64)   # Effectif par classe
+
+    @property
+    def count(self):
+        """
+        Nombre de valeurs agrégées
+        """
+        return int(np.sum(self.counts))
+
+    def update(self, values):
+        """
+        Ajoute un bloc de valeurs
+
+        Paramètres:
+        -----------
+        values : np.array
+            Valeurs à agréger (positives ou nulles)
+
+        Retourne:
+        ---------
+        QuantileSketch : L'instance elle-même
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+        # Classe 1 + ⌊log_γ(x / m)⌋, bornée aux classes extrêmes
+        indices = np.log(np.maximum(values, 0.5 * self.min_value) / self.min_value)
+        indices /= self.log_gamma
+        indices = np.floor(indices).astype(np.int64) + 1
+        np.clip(indices, 0, len(self.counts) - 1, out=indices)
+        self.counts += np.bincount(indices, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        """
+        Fusionne les effectifs d'une autre instance (mêmes paramètres)
+
+        Paramètres:
+        -----------
+        other : QuantileSketch ou np.array
+            Histogramme à fusionner, ou directement ses effectifs
+
+        Retourne:
+        ---------
+        QuantileSketch : L'instance elle-même
+        """
+        counts = other.counts if isinstance(other, QuantileSketch) else np.asarray(other)
+        if counts.shape != self.counts.shape:
+            raise ValueError("Histogrammes de paramètres différents : fusion impossible")
+        self.counts += counts.astype(np.int64)
+        return self
+
+    def quantile(self, q):
+        """
+        Quantile(s) approché(s)
+
+        Paramètres:
+        -----------
+        q : float ou np.array
+            Niveau(x) dans [0, 1]
+
+        Retourne:
+        ---------
+        float ou np.array : Quantile(s) estimé(s), NaN si l'histogramme est vide
+        """
+        q = np.asarray(q, dtype=np.float64)
+        total = self.count
+        if total == 0:
+            return np.full(q.shape, np.nan)[()]
+        # Classe contenant la valeur de rang ⌊q (n - 1)⌋ (0-indexé)
+        ranks = np.floor(q * (total - 1))
+        buckets = np.searchsorted(np.cumsum(self.counts), ranks, side="right")
+
+        # Représentant de la classe [m γ^(i-1), m γ^i) : 2 m γ^i / (1 + γ)
+        estimates = 2 * self.min_value * self.gamma ** buckets.astype(np.float64) / (1 + self.gamma)
+        estimates = np.where(buckets == 0, 0.0, estimates)
+        estimates = np.where(buckets == len(self.counts) - 1, self.max_value, estimates)
+        return estimates[()]
+
+    def __repr__(self):
+        return f"QuantileSketch(count={self.count}, relative_accuracy={self.relative_accuracy})"
@@ -1,3 +1,4 @@
+import math
 import time
 from datetime import datetime
 
@@ -38,7 +39,11 @@ def save_results_to_txt(results_mm1, results_gm1, results_mg1, theory, filename=
         f.write(f"│ Taux de service (μ)           : {1.0:.1f} clients/unité de temps\n")
         f.write(f"│ Nombre de points λ testés     : {len(results_mm1['lambda'])}\n")
         f.write(f"│ Plage de λ                   : [{min(results_mm1['lambda']):.1f} - {max(results_mm1['lambda']):.1f}]\n")
-        f.write(f"│ Pas d'incrémentation          : {results_mm1['lambda'][1] - results_mm1['lambda'][0]:.1f}\n")
+        steps = [b - a for a, b in zip(results_mm1['lambda'][:-1], results_mm1['lambda'][1:])]
+        if steps and max(steps) - min(steps) > 1e-9:
+            f.write(f"│ Pas d'incrémentation          : variable (grille adaptative, {min(steps):.4f} à {max(steps):.4f})\n")
+        else:
+            f.write(f"│ Pas d'incrémentation          : {steps[0] if steps else 0:.1f}\n")
         f.write("│\n")
         f.write("│ MODÈLES SIMULÉS :\n")
         f.write("│   • M/M/1 : Arrivées exponentielles, Services exponentiels\n")
@@ -123,6 +128,32 @@ def save_results_to_txt(results_mm1, results_gm1, results_mg1, theory, filename=
         f.write("│ Critères de qualité : Écart moyen < 2% = EXCELLENTE │ < 5% = TRÈS BONNE │ < 10% = BONNE\n")
         f.write("└" + "─" * 99 + "\n\n")
         
+        # Validation par les formules exactes (run_experiments(..., mode="both"))
+        if 'analytic' in results_gm1:
+            f.write("┌─ VALIDATION ANALYTIQUE - P-K (M/G/1) ET RACINE σ (G/M/1) " + "─" * 40 + "\n")
+            f.write("│\n")
+            f.write("│ " + "─" * 78 + "\n")
+            f.write("│ │ {:^8} ║ {:^20} ║ {:^20} ║ {:^20} │\n".format("λ", "M/M/1", "G/M/1", "M/G/1"))
+            f.write("│ │ {:^8} ║ {:^5} │ {:^5} │ {:^5} ║ {:^5} │ {:^5} │ {:^5} ║ {:^5} │ {:^5} │ {:^5} │\n".format(
+                "", "Sim.", "Exact", "Δ%", "Sim.", "Exact", "Δ%", "Sim.", "Exact", "Δ%"
+            ))
+            f.write("│ " + "─" * 78 + "\n")
+            
+            for i, lmbda in enumerate(results_mm1["lambda"]):
+                cells = []
+                for results in (results_mm1, results_gm1, results_mg1):
+                    tr_sim = results['mean_response_time'][i]
+                    tr_exact = results['analytic']['mean_response_time'][i]
+                    cells += [tr_sim, tr_exact, (tr_sim - tr_exact) / tr_exact * 100]
+                f.write("│ │ {:^8.2f} ║ {:^5.2f} │ {:^5.2f} │ {:^+5.1f} ║ {:^5.2f} │ {:^5.2f} │ {:^+5.1f} ║ {:^5.2f} │ {:^5.2f} │ {:^+5.1f} │\n".format(
+                    lmbda, *cells
+                ))
+            
+            f.write("│ " + "─" * 78 + "\n")
+            f.write("│\n")
+            f.write("│ Exact : E[W] = λE[S²]/(2(1-ρ)) pour M/G/1 │ E[T] = 1/(μ(1-σ)), σ = A*(μ(1-σ)) pour G/M/1\n")
+            f.write("└" + "─" * 99 + "\n\n")
+        
         # Analyse comparative des modèles
         f.write("┌─ ANALYSE COMPARATIVE DES MODÈLES " + "─" * 65 + "\n")
         f.write("│\n")
@@ -164,6 +195,71 @@ def save_results_to_txt(results_mm1, results_gm1, results_mg1, theory, filename=
         f.write("│   • Δ% : Variation percentuelle par rapport à M/M/1\n")
         f.write("└" + "─" * 99 + "\n\n")
         
+        # Quantiles de queue (histogrammes fusionnés sur toutes les répétitions)
+        if 'response_time_p99' in results_mm1:
+            labels = (("p50", "p50"), ("p95", "p95"), ("p99", "p99"), ("p999", "p99.9"))
+            f.write("┌─ QUANTILES DU TEMPS DE RÉPONSE " + "─" * 66 + "\n")
+            f.write("│\n")
+            f.write("│ " + "─" * 95 + "\n")
+            f.write("│ │ {:^8} ║ {:^27} ║ {:^27} ║ {:^27} │\n".format("λ", "M/M/1", "G/M/1", "M/G/1"))
+            f.write("│ │ {:^8} ║".format("") + " ║".join(
+                " │".join(" {:^5}".format(name) for _, name in labels) for _ in range(3)
+            ) + " │\n")
+            f.write("│ " + "─" * 95 + "\n")
+            
+            for i, lmbda in enumerate(results_mm1["lambda"]):
+                f.write("│ │ {:^8.2f} ║".format(lmbda) + " ║".join(
+                    " │".join(" {:^5.2f}".format(results[f'response_time_{key}'][i]) for key, _ in labels)
+                    for results in (results_mm1, results_gm1, results_mg1)
+                ) + " │\n")
+            
+            f.write("│ " + "─" * 95 + "\n")
+            f.write("│\n")
+            f.write("│ Validation M/M/1 (T ~ Exp(μ - λ)) :\n")
+            f.write("│\n")
+            f.write("│ " + "─" * 65 + "\n")
+            f.write("│ │ {:^8} ║ {:^15} ║ {:^15} ║ {:^15} │\n".format("λ", "p95", "p99", "p99.9"))
+            f.write("│ │ {:^8} ║ {:^6} │ {:^6} ║ {:^6} │ {:^6} ║ {:^6} │ {:^6} │\n".format(
+                "", "Sim.", "Théo.", "Sim.", "Théo.", "Sim.", "Théo."
+            ))
+            f.write("│ " + "─" * 65 + "\n")
+            
+            for i, lmbda in enumerate(results_mm1["lambda"]):
+                f.write("│ │ {:^8.2f} ║ {:^6.2f} │ {:^6.2f} ║ {:^6.2f} │ {:^6.2f} ║ {:^6.2f} │ {:^6.2f} │\n".format(
+                    lmbda,
+                    results_mm1['response_time_p95'][i], theory['response_time_p95'][i],
+                    results_mm1['response_time_p99'][i], theory['response_time_p99'][i],
+                    results_mm1['response_time_p999'][i], theory['response_time_p999'][i]
+                ))
+            
+            f.write("│ " + "─" * 65 + "\n")
+            f.write("│\n")
+            f.write("│ Quantiles estimés par histogramme logarithmique (précision relative 1 %)\n")
+            f.write("└" + "─" * 99 + "\n\n")
+        
+        # Nombre moyen de clients et loi de Little (si calculés : queue_metrics=True)
+        if any(not math.isnan(value) for value in results_mm1.get('mean_number_in_system', [math.nan])):
+            f.write("┌─ NOMBRE MOYEN DE CLIENTS - LOI DE LITTLE (M/M/1) " + "─" * 48 + "\n")
+            f.write("│\n")
+            f.write("│ " + "─" * 65 + "\n")
+            f.write("│ │ {:^8} ║ {:^8} │ {:^8} ║ {:^8} │ {:^8} ║ {:^8} │\n".format(
+                "λ", "L sim.", "L théo.", "Lq sim.", "Lq théo.", "λ·TR"
+            ))
+            f.write("│ " + "─" * 65 + "\n")
+            
+            for i, lmbda in enumerate(results_mm1["lambda"]):
+                f.write("│ │ {:^8.2f} ║ {:^8.3f} │ {:^8.3f} ║ {:^8.3f} │ {:^8.3f} ║ {:^8.3f} │\n".format(
+                    lmbda,
+                    results_mm1['mean_number_in_system'][i], theory['mean_number_in_system'][i],
+                    results_mm1['mean_number_in_queue'][i], theory['mean_number_in_queue'][i],
+                    lmbda * results_mm1['mean_response_time'][i]
+                ))
+            
+            f.write("│ " + "─" * 65 + "\n")
+            f.write("│\n")
+            f.write("│ L et Lq : moyennes temporelles de N(t) │ λ·TR : estimation par la loi de Little (L = λ·E[T])\n")
+            f.write("└" + "─" * 99 + "\n\n")
+        
         # Statistiques de synthèse
         f.write("┌─ STATISTIQUES DE SYNTHÈSE " + "─" * 71 + "\n")
         f.write("│\n")
@@ -1,16 +1,309 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import stats
+import argparse
+import inspect
+import json
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from functools import partial
 from save_result import save_results_to_txt
+from lindley import arrival_times_from, lindley_recursion
+from multiserver import multiserver_recursion
+from finite_capacity import finite_capacity_recursion
+from network import check_routing, route, tandem_routing, topological_order, traffic_rates
+from events import DISCIPLINES, run_event_simulation
+from analytic import analytic_metrics, moments
+from distributions import distribution_key, get_distribution
+from importance_sampling import siegmund_tail_probability
+from online_stats import QuantileSketch, QueueLengthStats, RunningStats, mser_truncation
+from traces import TraceReader, TraceWriter
+from cache import ResultCache
+from work_queue import WorkQueue
+
+# matplotlib et scipy ne sont importés qu'à la première utilisation (tracés,
+# quantiles de Student), pour que les traitements par lots démarrent vite
+
+# Lois (arrivées, services) de chaque modèle ; None = loi générale choisie
+MODEL_DISTRIBUTIONS = {
+    "MM1": ("exponential", "exponential"),
+    "GM1": (None, "exponential"),
+    "MG1": ("exponential", None)
+}
+
+# Générateurs pseudo-aléatoires disponibles (numpy.random.Generator)
+BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "sfc64": np.random.SFC64,
+    "philox": np.random.Philox,
+    "mt19937": np.random.MT19937
+}
+
+# Schéma de dérivation des flux aléatoires (clés ajoutées au spawn_key) :
+#   SeedSequence(seed)
+#    └─ (i_λ, i_modèle)                   cellule (λ, modèle) de run_experiments
+#        └─ (..., REPLICATION_STREAM, r)  réplication r
+#            ├─ (..., ARRIVAL_STREAM)     temps inter-arrivées
+#            ├─ (..., SERVICE_STREAM)     temps de service
+#            │   └─ (..., k)              station k d'un réseau (simulate_network)
+#            ├─ (..., CLASS_STREAM)       classes de priorité (simulate_discipline)
+#            └─ (..., ROUTING_STREAM, k)  routage en sortie de la station k
+#                                         (k = nombre de stations : entrée)
+# Chaque flux est ainsi indépendant des autres, quel que soit l'ordre
+# (ou le processus) dans lequel les cellules sont simulées.
+ARRIVAL_STREAM = 0
+SERVICE_STREAM = 1
+REPLICATION_STREAM = 2
+CLASS_STREAM = 3
+ROUTING_STREAM = 4
+MODEL_INDEX = {"MM1": 0, "GM1": 1, "MG1": 2}
+
+# Nombre de clients par bloc en mode stream
+DEFAULT_CHUNK_SIZE = 100000
+
+# Préfixe (en clients admis) dans lequel MSER-5 cherche la fin du régime
+# transitoire : le même en mode stream et sans découpage, quelle que soit
+# la taille des blocs
+WARMUP_WINDOW = DEFAULT_CHUNK_SIZE
+
+# Quantiles de queue reportés (suffixe du nom de la métrique : niveau)
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99, "p999": 0.999}
+
+
+def derive_seed_sequence(seed, *keys):
+    """
+    Dérive un flux enfant déterministe d'une graine
+    
+    Contrairement à SeedSequence.spawn, le résultat ne dépend que de la
+    graine et des clés, pas du nombre d'enfants déjà créés.
+    
+    Paramètres:
+    -----------
+    seed : int, None ou np.random.SeedSequence
+        Graine parente
+    keys : int
+        Clés ajoutées au spawn_key du parent
+        
+    Retourne:
+    ---------
+    np.random.SeedSequence : Graine du flux enfant
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + tuple(keys),
+                                  pool_size=seed.pool_size)
+
+
+def replication_seed_sequence(seed, replication):
+    """
+    Graine de la réplication `replication` d'une cellule (voir le schéma ci-dessus)
+    """
+    return derive_seed_sequence(seed, REPLICATION_STREAM, replication)
+
+
+def cell_seed_sequence(seed, lambda_index, model):
+    """
+    Graine de la cellule (λ, modèle) d'une expérience (voir le schéma ci-dessus)
+    """
+    return derive_seed_sequence(seed, lambda_index, MODEL_INDEX[model])
+
+
+def confidence_interval(values, confidence=0.95):
+    """
+    Moyenne, variance et intervalle de confiance (Student) d'un échantillon
+    
+    Paramètres:
+    -----------
+    values : np.array
+        Valeurs observées (une par réplication)
+    confidence : float
+        Niveau de confiance
+        
+    Retourne:
+    ---------
+    tuple : (moyenne, variance, (borne inférieure, borne supérieure))
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mean = np.mean(values)
+    if n < 2:
+        # Une seule réplication : variance non estimable
+        return mean, np.nan, (np.nan, np.nan)
+    from scipy import special
+    
+    variance = np.var(values, ddof=1)
+    # Quantile de la loi de Student (scipy.stats.t.ppf, sans importer scipy.stats)
+    half_width = special.stdtrit(n - 1, (1 + confidence) / 2) * np.sqrt(variance / n)
+    return mean, variance, (mean - half_width, mean + half_width)
+
+
+def control_variate_estimate(values, controls, control_means, confidence=0.95):
+    """
+    Estimateur par variables de contrôle et son intervalle de confiance
+    
+    La moyenne de Y est corrigée par Ŷ = Ȳ - β (C̄ - E[C]), où β est
+    estimé par moindres carrés sur les réplications : Ŷ est l'ordonnée
+    à l'origine de la régression de Y sur C - E[C], et sa variance celle
+    de ce coefficient (n - 1 - q degrés de liberté pour q contrôles).
+    Un contrôle constant sur les réplications (par exemple la moyenne des
+    inter-arrivées uniformes d'une paire antithétique, égale à E[A]) est
+    écarté et reçoit β = 0.
+    
+    Paramètres:
+    -----------
+    values : np.array
+        Valeurs observées de Y (une par réplication)
+    controls : np.array
+        Valeurs des contrôles, de forme (réplications, q)
+    control_means : np.array
+        Espérances connues des q contrôles
+    confidence : float
+        Niveau de confiance
+        
+    Retourne:
+    ---------
+    tuple : (estimation, variance de l'estimation, (borne inférieure, borne supérieure), β)
+    """
+    from scipy import special
+    
+    values = np.asarray(values, dtype=float)
+    control_means = np.asarray(control_means, dtype=float)
+    centered = np.atleast_2d(np.asarray(controls, dtype=float).T).T - control_means
+    informative = np.ptp(centered, axis=0) > 1e-12 * np.maximum(np.abs(control_means), 1.0)
+    n, q = len(values), int(np.sum(informative))
+    design = np.column_stack((np.ones(n), centered[:, informative]))
+    if n - 1 - q < 1:
+        raise ValueError(f"Au moins {q + 2} réplications sont nécessaires pour {q} variable(s) de contrôle")
+    coefficients, _, _, _ = np.linalg.lstsq(design, values, rcond=None)
+    residuals = values - design @ coefficients
+    dof = n - 1 - q
+    variance = np.sum(residuals**2) / dof * np.linalg.inv(design.T @ design)[0, 0]
+    half_width = special.stdtrit(dof, (1 + confidence) / 2) * np.sqrt(variance)
+    estimate = coefficients[0]
+    beta = np.zeros(len(informative))
+    beta[informative] = coefficients[1:]
+    return estimate, variance, (estimate - half_width, estimate + half_width), beta
+
+
+def quantile_metrics(name, sketch):
+    """
+    Quantiles QUANTILES d'un histogramme, nommés name + "_p50", name + "_p95", ...
+    
+    Paramètres:
+    -----------
+    name : str
+        Préfixe des métriques ("wait_time" ou "response_time")
+    sketch : QuantileSketch
+        Histogramme des valeurs observées
+        
+    Retourne:
+    ---------
+    dict : {nom de la métrique: quantile estimé}
+    """
+    estimates = sketch.quantile(list(QUANTILES.values()))
+    return {f"{name}_{label}": value for label, value in zip(QUANTILES, estimates)}
+
+
+class CommonRandomNumbers:
+    """
+    Variables aléatoires communes (CRN) à tout un balayage λ × modèles
+    
+    Une réplication tire une seule fois nb_clients uniformes pour les
+    arrivées et autant pour les services. Chaque loi de moyenne 1 en est
+    déduite par inversion, avec la fonction quantile de distributions.py
+    (ex. exponentielle : -ln(1 - U) ; calculée une fois puis gardée en
+    cache), et les temps d'un modèle s'obtiennent par simple mise à l'échelle 1/rate.
+    Tous les λ et les trois modèles partagent ainsi les mêmes aléas, ce qui
+    réduit le coût de génération et surtout la variance des écarts et des
+    ratios entre modèles.
+    
+    Avec antithetic=True, les uniformes sont remplacées par 1 - U : les
+    inversions étant croissantes, la réplication obtenue est négativement
+    corrélée à celle de même graine (variables antithétiques).
+    """
+    
+    def __init__(self, nb_clients, seed=None, bit_generator="pcg64", antithetic=False):
+        """
+        Tire les variables de base d'une réplication
+        
+        Paramètres:
+        -----------
+        nb_clients : int
+            Nombre de clients couverts
+        seed : int ou np.random.SeedSequence
+            Graine de la réplication
+        bit_generator : str
+            Générateur de bits (voir BIT_GENERATORS)
+        antithetic : bool
+            Si True, utilise 1 - U à la place des uniformes tirées
+        """
+        self.nb_clients = nb_clients
+        self.antithetic = antithetic
+        seed_sequence = derive_seed_sequence(seed)
+        self.uniforms = {}
+        for stream in (ARRIVAL_STREAM, SERVICE_STREAM):
+            rng = np.random.Generator(BIT_GENERATORS[bit_generator](derive_seed_sequence(seed_sequence, stream)))
+            uniforms = rng.random(nb_clients)
+            self.uniforms[stream] = 1.0 - uniforms if antithetic else uniforms
+        self._unit_times = {}
+    
+    def unit_times(self, stream, distribution):
+        """
+        Temps de moyenne 1 selon la distribution, déduits des uniformes du flux
+        
+        Paramètres:
+        -----------
+        stream : int
+            ARRIVAL_STREAM ou SERVICE_STREAM
+        distribution : str, dict ou Distribution
+            Spécification de loi (voir distributions.get_distribution)
+            
+        Retourne:
+        ---------
+        np.array : Temps de moyenne 1 (calculés une seule fois)
+        """
+        key = (stream, distribution_key(distribution))
+        if key not in self._unit_times:
+            self._unit_times[key] = get_distribution(distribution).ppf(self.uniforms[stream])
+        return self._unit_times[key]
+    
+    def sampler(self, stream, rate, distribution):
+        """
+        Fonction size -> np.array renvoyant les temps successifs du flux
+        
+        Les appels successifs (blocs du mode stream) parcourent les
+        variables de base dans l'ordre.
+        
+        Paramètres:
+        -----------
+        stream : int
+            ARRIVAL_STREAM ou SERVICE_STREAM
+        rate : float
+            Taux associé (moyenne 1/rate)
+        distribution : str, dict ou Distribution
+            Spécification de loi (voir distributions.get_distribution)
+        """
+        unit_times = self.unit_times(stream, distribution)
+        position = [0]
+        
+        def sample(size):
+            start = position[0]
+            position[0] = start + size
+            return unit_times[start:start + size] / rate
+        
+        return sample
+
 
 class QueueSimulator:
     """
     Classe pour simuler différents types de files d'attente mono-serveur
+    (et multi-serveurs G/G/c avec simulate_GGc)
     """
     
-    def __init__(self, lmbda, mu, nb_clients=1000000, seed=None):
+    def __init__(self, lmbda, mu, nb_clients=1000000, seed=None, backend="numpy", bit_generator="pcg64",
+                 keep_traces=False, crn=None, warmup=None, trace_dir=None, trace_dtypes=None,
+                 queue_metrics=False, servers=1, capacity=None):
         """
         Initialisation du simulateur
         
@@ -22,23 +315,95 @@ class QueueSimulator:
             Taux de service moyen (μ)
         nb_clients : int
             Nombre de clients à simuler
-        seed : int
-            Graine pour le générateur aléatoire
+        seed : int ou np.random.SeedSequence
+            Graine pour le générateur aléatoire ; le simulateur possède ses
+            propres flux (arrivées et services) dérivés de cette graine
+        backend : str
+            Noyau de la récursion FIFO : "numpy" (vectorisé), "python"
+            (boucle de référence) ou "numba" (boucle compilée, optionnel)
+        bit_generator : str
+            Générateur de bits : "pcg64", "sfc64", "philox" ou "mt19937"
+        keep_traces : bool
+            Si True, les résultats contiennent aussi les tableaux par client
+            (wait_times, response_times) ; sinon seulement des statistiques
+        crn : CommonRandomNumbers
+            Variables de base communes ; si fourni, les temps sont obtenus
+            par transformation de ces variables au lieu de nouveaux tirages
+        warmup : str
+            Suppression du régime transitoire : None (aucune) ou "mser5"
+            (point de troncature choisi sur la série des temps d'attente ;
+            en mode stream sur le premier bloc, avec simulate_batch sur la
+            série moyennée entre réplications)
+        trace_dir : str
+            Si fourni, les temps d'arrivée, de départ, d'attente et de
+            réponse de chaque client sont écrits dans des fichiers .npy
+            projetés en mémoire de ce répertoire (voir traces.py), bloc par
+            bloc en mode stream
+        trace_dtypes : dict
+            Types numpy des traces (par défaut traces.TRACE_DTYPES)
+        queue_metrics : bool
+            Si True, calcule aussi le nombre moyen de clients dans le système
+            (L) et dans la file (Lq) et la distribution P(N=n) en moyenne
+            temporelle (voir online_stats.QueueLengthStats)
+        servers : int
+            Nombre de serveurs c utilisé par simulate_GGc (ρ = λ / (c μ)) ;
+            les autres modèles sont mono-serveur
+        capacity : int
+            Capacité K du système (clients en service compris) ; un client
+            arrivant quand K clients sont présents est refusé (voir
+            finite_capacity.py). None = capacité infinie. Les statistiques
+            d'attente et de réponse portent sur les clients admis.
         """
         self.lmbda = lmbda          # Taux d'arrivée des clients
         self.mu = mu                # Taux de service
         self.nb_clients = nb_clients  # Nombre de clients à simuler
-        self.rho = lmbda / mu       # Taux d'occupation théorique
+        self.servers = servers      # Nombre de serveurs (simulate_GGc)
+        self.rho = lmbda / (servers * mu)  # Taux d'occupation théorique
+        self.backend = backend      # Noyau de calcul de la récursion
+        self.keep_traces = keep_traces  # Conserver les tableaux par client
+        self.crn = crn              # Variables aléatoires communes (optionnel)
+        if nb_clients < 1:
+            raise ValueError(f"Le nombre de clients doit être au moins 1 (reçu : {nb_clients})")
+        if warmup not in (None, "mser5"):
+            raise ValueError(f"Méthode de troncature non supportée : {warmup}")
+        self.warmup = warmup        # Détection du régime transitoire
+        self.trace_dir = trace_dir  # Répertoire des traces par client (optionnel)
+        self.trace_dtypes = trace_dtypes
+        self.queue_metrics = queue_metrics  # Métriques L, Lq et P(N=n)
+        self.capacity = capacity    # Capacité K (None = infinie)
+        if crn is not None and crn.nb_clients < nb_clients:
+            raise ValueError("Les variables communes (crn) couvrent moins de clients que nb_clients")
         
-        # Vérifier la stabilité de la file d'attente
-        if self.rho >= 1:
+        # Vérifier la stabilité de la file d'attente (toujours stable avec K fini)
+        if self.rho >= 1 and capacity is None:
             print(f"⚠️ Attention: ρ = {self.rho:.2f} ≥ 1, la file n'est pas stable")
         
-        # Initialiser le générateur aléatoire
-        if seed is not None:
-            np.random.seed(seed)
+        # Initialiser les générateurs aléatoires propres au simulateur
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"Générateur non supporté : {bit_generator}")
+        self.bit_generator = bit_generator
+        self.seed_sequence = derive_seed_sequence(seed)
+        self.rng = self.make_rng(self.seed_sequence)
+        self.arrival_rng, self.service_rng = self.make_streams(self.seed_sequence)
     
-    def generate_exponential(self, rate, size=1):
+    def make_rng(self, seed_sequence):
+        """
+        Crée un générateur numpy.random.Generator à partir d'une graine
+        """
+        return np.random.Generator(BIT_GENERATORS[self.bit_generator](seed_sequence))
+    
+    def make_streams(self, seed_sequence):
+        """
+        Crée les flux indépendants des arrivées et des services d'une graine
+        
+        Retourne:
+        ---------
+        tuple : (générateur des arrivées, générateur des services)
+        """
+        return (self.make_rng(derive_seed_sequence(seed_sequence, ARRIVAL_STREAM)),
+                self.make_rng(derive_seed_sequence(seed_sequence, SERVICE_STREAM)))
+    
+    def generate_exponential(self, rate, size=1, rng=None):
         """
         Génère des temps suivant une loi exponentielle
         
@@ -48,14 +413,16 @@ class QueueSimulator:
             Paramètre de la loi exponentielle
         size : int
             Nombre de valeurs à générer
+        rng : np.random.Generator
+            Flux à utiliser (par défaut le générateur du simulateur)
             
         Retourne:
         ---------
         np.array : Tableau de temps générés
         """
-        return np.random.exponential(1.0/rate, size)
+        return (self.rng if rng is None else rng).exponential(1.0/rate, size)
     
-    def generate_uniform(self, a, b, size=1):
+    def generate_uniform(self, a, b, size=1, rng=None):
         """
         Génère des temps suivant une loi uniforme
         
@@ -67,16 +434,22 @@ class QueueSimulator:
             Borne supérieure
         size : int
             Nombre de valeurs à générer
+        rng : np.random.Generator
+            Flux à utiliser (par défaut le générateur du simulateur)
             
         Retourne:
         ---------
         np.array : Tableau de temps générés
         """
-        return np.random.uniform(a, b, size)
+        return (self.rng if rng is None else rng).uniform(a, b, size)
     
-    def generate_normal(self, mean, std, size=1):
+    def generate_normal(self, mean, std, size=1, rng=None):
         """
-        Génère des temps suivant une loi normale (avec valeurs positives uniquement)
+        Génère des temps suivant une loi normale tronquée à ]0, ∞[
+        
+        La loi est ajustée pour garder exactement la moyenne et l'écart-type
+        demandés (voir distributions.TruncatedNormal), là où |X| décalerait
+        la moyenne vers le haut.
         
         Paramètres:
         -----------
@@ -86,101 +459,1031 @@ class QueueSimulator:
             Écart-type de la loi normale
         size : int
             Nombre de valeurs à générer
+        rng : np.random.Generator
+            Flux à utiliser (par défaut le générateur du simulateur)
             
         Retourne:
         ---------
         np.array : Tableau de temps générés (tous positifs)
         """
-        # Génère des valeurs selon une loi normale et prend la valeur absolue
-        # pour s'assurer que tous les temps sont positifs
-        return np.abs(np.random.normal(mean, std, size))
+        distribution = get_distribution({"name": "normal", "scv": (std / mean)**2}, mean)
+        return distribution.sample(self.rng if rng is None else rng, size)
     
-    def simulate_MM1(self):
+    def generate_times(self, rate, distribution="exponential", size=1, rng=None):
+        """
+        Génère des durées de moyenne 1/rate selon la distribution choisie
+        
+        Paramètres:
+        -----------
+        rate : float
+            Taux associé (λ pour les arrivées, μ pour les services)
+        distribution : str, dict ou Distribution
+            Spécification de loi du registre de distributions.py : nom
+            ("exponential", "uniform", "normal", "lognormal", "gamma",
+            "pareto"), dictionnaire ({"name": "gamma", "scv": 4}) ou loi
+            construite (ex. distributions.Empirical(mesures)), ramenée à la
+            moyenne 1/rate
+        size : int ou tuple
+            Nombre (ou forme) des valeurs à générer
+        rng : np.random.Generator
+            Flux à utiliser (par défaut le générateur du simulateur)
+            
+        Retourne:
+        ---------
+        np.array : Tableau de temps générés
+        """
+        return get_distribution(distribution, 1.0/rate).sample(self.rng if rng is None else rng, size)
+    
+    def _sampler(self, stream, rate, distribution):
+        """
+        Fonction size -> np.array tirant les temps d'un flux (arrivées ou services)
+        
+        Les tirages viennent du flux propre au simulateur, ou des variables
+        de base communes si le simulateur a été créé avec crn=...
+        
+        Paramètres:
+        -----------
+        stream : int
+            ARRIVAL_STREAM ou SERVICE_STREAM
+        rate : float
+            Taux associé (moyenne 1/rate)
+        distribution : str, dict ou Distribution
+            Spécification de loi (voir generate_times)
+        """
+        if self.crn is not None:
+            return self.crn.sampler(stream, rate, distribution)
+        rng = self.arrival_rng if stream == ARRIVAL_STREAM else self.service_rng
+        # Loi construite une seule fois pour tous les blocs
+        return partial(get_distribution(distribution, 1.0/rate).sample, rng)
+    
+    def simulate_MM1(self, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
         """
         Simule une file d'attente M/M/1
         
+        Paramètres:
+        -----------
+        stream : bool
+            Si True, simulation par blocs à mémoire constante (voir _run_streaming)
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+        
         Retourne:
         ---------
         dict : Dictionnaire contenant les résultats de la simulation
         """
         print("Simulation de la file M/M/1 en cours...")
         
-        # Générer les temps inter-arrivées (loi exponentielle)
-        inter_arrival_times = self.generate_exponential(self.lmbda, self.nb_clients)
+        # Temps inter-arrivées (loi exponentielle)
+        sample_inter_arrival = self._sampler(ARRIVAL_STREAM, self.lmbda, "exponential")
+        
+        # Temps de service (loi exponentielle)
+        sample_service = self._sampler(SERVICE_STREAM, self.mu, "exponential")
+        
+        # Calculer les résultats avec la simulation
+        return self._simulate(sample_inter_arrival, sample_service, stream, chunk_size)
+    
+    def simulate_GM1(self, distribution="uniform", stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Simule une file d'attente G/M/1 avec une loi générale pour les arrivées
+        
+        Paramètres:
+        -----------
+        distribution : str, dict ou Distribution
+            Loi des arrivées (voir generate_times)
+        stream : bool
+            Si True, simulation par blocs à mémoire constante (voir _run_streaming)
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation
+        """
+        print(f"Simulation de la file G/M/1 ({distribution}) en cours...")
+        
+        # Temps inter-arrivées selon la distribution choisie
+        sample_inter_arrival = self._sampler(ARRIVAL_STREAM, self.lmbda, distribution)
         
-        # Générer les temps de service (loi exponentielle)
-        service_times = self.generate_exponential(self.mu, self.nb_clients)
+        # Temps de service (loi exponentielle)
+        sample_service = self._sampler(SERVICE_STREAM, self.mu, "exponential")
         
         # Calculer les résultats avec la simulation
-        return self._run_simulation(inter_arrival_times, service_times)
+        return self._simulate(sample_inter_arrival, sample_service, stream, chunk_size)
+    
+    def simulate_MG1(self, distribution="uniform", stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Simule une file d'attente M/G/1 avec une loi générale pour le service
+        
+        Paramètres:
+        -----------
+        distribution : str, dict ou Distribution
+            Loi des services (voir generate_times)
+        stream : bool
+            Si True, simulation par blocs à mémoire constante (voir _run_streaming)
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation
+        """
+        print(f"Simulation de la file M/G/1 ({distribution}) en cours...")
+        
+        # Temps inter-arrivées (loi exponentielle)
+        sample_inter_arrival = self._sampler(ARRIVAL_STREAM, self.lmbda, "exponential")
+        
+        # Temps de service selon la distribution choisie
+        sample_service = self._sampler(SERVICE_STREAM, self.mu, distribution)
+        
+        # Calculer les résultats avec la simulation
+        return self._simulate(sample_inter_arrival, sample_service, stream, chunk_size)
+    
+    def simulate_GG1(self, arrival_distribution="uniform", service_distribution="uniform", stream=False,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Simule une file d'attente G/G/1 avec des lois générales pour les arrivées et le service
+        
+        Paramètres:
+        -----------
+        arrival_distribution : str, dict ou Distribution
+            Loi des arrivées (voir generate_times)
+        service_distribution : str, dict ou Distribution
+            Loi des services (voir generate_times)
+        stream : bool
+            Si True, simulation par blocs à mémoire constante (voir _run_streaming)
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation
+        """
+        print(f"Simulation de la file G/G/1 ({arrival_distribution} / {service_distribution}) en cours...")
+        
+        sample_inter_arrival = self._sampler(ARRIVAL_STREAM, self.lmbda, arrival_distribution)
+        sample_service = self._sampler(SERVICE_STREAM, self.mu, service_distribution)
+        
+        # Calculer les résultats avec la simulation
+        return self._simulate(sample_inter_arrival, sample_service, stream, chunk_size)
+    
+    def simulate_GGc(self, c=None, arrival_distribution="exponential", service_distribution="exponential",
+                     stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Simule une file d'attente FIFO à c serveurs (G/G/c)
+        
+        Mêmes générateurs et même dictionnaire de résultats que les modèles
+        mono-serveur ; la récursion est celle de Kiefer-Wolfowitz (voir
+        multiserver.py). server_utilization est l'occupation moyenne des c
+        serveurs, per_server_utilization celle de chaque serveur.
+        
+        Paramètres:
+        -----------
+        c : int
+            Nombre de serveurs (None = servers du simulateur)
+        arrival_distribution : str, dict ou Distribution
+            Loi des arrivées (voir generate_times)
+        service_distribution : str, dict ou Distribution
+            Loi des services (voir generate_times)
+        stream : bool
+            Si True, simulation par blocs à mémoire constante (voir _run_streaming)
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation, avec
+               "n_servers" et "per_server_utilization"
+        """
+        c = self.servers if c is None else c
+        rho = self.lmbda / (c * self.mu)
+        if rho >= 1 and self.capacity is None:
+            print(f"⚠️ Attention: ρ = λ/(cμ) = {rho:.2f} ≥ 1, la file n'est pas stable")
+        print(f"Simulation de la file G/G/{c} ({arrival_distribution} / {service_distribution}) en cours...")
+        
+        sample_inter_arrival = self._sampler(ARRIVAL_STREAM, self.lmbda, arrival_distribution)
+        sample_service = self._sampler(SERVICE_STREAM, self.mu, service_distribution)
+        
+        # Calculer les résultats avec la simulation
+        return self._simulate(sample_inter_arrival, sample_service, stream, chunk_size, servers=c)
+    
+    def simulate_discipline(self, discipline="priority", arrival_distribution="exponential",
+                            service_distribution="exponential", class_probabilities=(0.5, 0.5), c=None):
+        """
+        Simule une file à c serveurs avec une discipline de service autre que FIFO
+        
+        Les disciplines "priority" (priorités non préemptives), "sjf" (plus
+        court service d'abord) et "ps" (partage de processeur) passent par
+        le moteur à événements de events.py (calendrier en tas binaire) ;
+        "fifo" reste sur les récursions vectorisées (simulate_GGc). Mêmes
+        générateurs et même dictionnaire de résultats que les autres modèles
+        (sans mode stream ; en PS, l'attente est le temps de réponse moins
+        le service).
+        
+        Paramètres:
+        -----------
+        discipline : str
+            "fifo", "priority", "sjf" ou "ps"
+        arrival_distribution : str, dict ou Distribution
+            Loi des arrivées (voir generate_times)
+        service_distribution : str, dict ou Distribution
+            Loi des services (voir generate_times)
+        class_probabilities : tuple
+            Probabilité de chaque classe de priorité, de la plus prioritaire
+            à la moins prioritaire (discipline "priority", tirées sur le flux
+            CLASS_STREAM)
+        c : int
+            Nombre de serveurs (None = servers du simulateur)
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation, avec
+               pour "priority" les moyennes par classe ("class_mean_wait_time",
+               "class_mean_response_time", "class_counts") et le nombre
+               d'événements traités ("n_events")
+        """
+        if discipline not in DISCIPLINES:
+            raise ValueError(f"Discipline non supportée : {discipline} (choix : {', '.join(DISCIPLINES)})")
+        c = self.servers if c is None else c
+        if discipline == "fifo":
+            return self.simulate_GGc(c, arrival_distribution, service_distribution)
+        if self.capacity is not None:
+            raise ValueError("La capacité finie (K) n'est disponible qu'avec la discipline FIFO")
+        print(f"Simulation de la file G/G/{c} ({discipline}) en cours...")
+        
+        inter_arrival_times = self._sampler(ARRIVAL_STREAM, self.lmbda, arrival_distribution)(self.nb_clients)
+        service_times = self._sampler(SERVICE_STREAM, self.mu, service_distribution)(self.nb_clients)
+        classes = None
+        if discipline == "priority":
+            class_rng = self.make_rng(derive_seed_sequence(self.seed_sequence, CLASS_STREAM))
+            probabilities = np.asarray(class_probabilities, dtype=np.float64)
+            classes = class_rng.choice(len(probabilities), self.nb_clients, p=probabilities / probabilities.sum())
+        
+        arrival_times = arrival_times_from(inter_arrival_times)
+        departure_times, wait_times, n_events = run_event_simulation(arrival_times, service_times, discipline,
+                                                                     classes, c)
+        response_times = departure_times - arrival_times
+        
+        # Les clients ne sont plus servis dans l'ordre d'arrivée : la fenêtre
+        # d'observation commence à l'arrivée du premier client retenu
+        start = self._warmup_point(wait_times)
+        observation_start = arrival_times[start] if start > 0 else 0.0
+        results = self._summarize(RunningStats().update(wait_times[start:]),
+                                  RunningStats().update(response_times[start:]),
+                                  np.sum(service_times[start:]), np.max(departure_times), start,
+                                  observation_start, QuantileSketch().update(wait_times[start:]),
+                                  QuantileSketch().update(response_times[start:]), c)
+        results["discipline"] = discipline
+        results["n_events"] = n_events
+        if classes is not None:
+            retained = classes[start:]
+            counts = np.bincount(retained, minlength=len(class_probabilities))
+            with np.errstate(invalid="ignore"):
+                results["class_counts"] = counts
+                results["class_mean_wait_time"] = np.bincount(retained, weights=wait_times[start:],
+                                                              minlength=len(counts)) / counts
+                results["class_mean_response_time"] = np.bincount(retained, weights=response_times[start:],
+                                                                  minlength=len(counts)) / counts
+        if self.queue_metrics:
+            # Départs triés : l'ordre de sortie diffère de l'ordre d'arrivée
+            queue_length = QueueLengthStats(observation_start, c).update(arrival_times, np.sort(departure_times))
+            results.update(queue_length.summary())
+        if self.keep_traces:
+            results["wait_times"] = wait_times
+            results["response_times"] = response_times
+        return results
+    
+    def simulate_network(self, stations, routing=None, arrival_distribution="exponential",
+                         entry_probabilities=None):
+        """
+        Simule un réseau de files FIFO sans retour (tandem, séparations, jonctions)
+        
+        Les stations sont traitées dans l'ordre topologique du routage : les
+        arrivées d'une station (arrivées externes et départs des stations
+        amont qui y sont routés) sont fusionnées par tri, puis la récursion
+        vectorisée de la station (Lindley, ou Kiefer-Wolfowitz avec plusieurs
+        serveurs) donne d'un coup tous ses départs. La destination de chaque
+        départ est tirée sur un tableau de probabilités cumulées (recherche
+        dichotomique), sans boucle sur les clients. nb_clients est le nombre
+        d'arrivées externes, de taux λ.
+        
+        Paramètres:
+        -----------
+        stations : list
+            Une spécification par station : dictionnaire {"mu": taux de
+            service par serveur, "distribution": loi des services,
+            "servers": nombre de serveurs} (par défaut mu du simulateur,
+            "exponential" et 1)
+        routing : np.array
+            Matrice de routage P (voir network.py) ; None = tandem dans
+            l'ordre de la liste
+        arrival_distribution : str, dict ou Distribution
+            Loi des inter-arrivées externes (voir generate_times)
+        entry_probabilities : np.array
+            Probabilité d'entrée par chaque station (None = station 0)
+        
+        Une station qui ne reçoit aucun client a une occupation, des temps
+        moyens et des longueurs de file nuls (quantiles NaN).
+            
+        Retourne:
+        ---------
+        dict : Latence de bout en bout (mean_response_time, quantiles,
+               histogrammes), attente totale (mean_wait_time), et sous
+               "stations" un dictionnaire de résultats par station (même
+               schéma que les modèles mono-station, avec "arrival_rate" et
+               "visits")
+        """
+        if self.capacity is not None:
+            raise ValueError("simulate_network ne gère pas la capacité finie (K)")
+        routing, entry_probabilities = check_routing(tandem_routing(len(stations)) if routing is None else routing,
+                                                     entry_probabilities)
+        order = topological_order(routing)
+        stations = [{"mu": self.mu, "distribution": "exponential", "servers": 1, **station} for station in stations]
+        n_stations = len(stations)
+        print(f"Simulation d'un réseau de {n_stations} stations en cours...")
+        
+        # Arrivées externes et station d'entrée de chaque client
+        entry_times = arrival_times_from(self._sampler(ARRIVAL_STREAM, self.lmbda, arrival_distribution)(self.nb_clients))
+        routing_rngs = [self.make_rng(derive_seed_sequence(self.seed_sequence, ROUTING_STREAM, k))
+                        for k in range(n_stations + 1)]
+        jobs = np.arange(self.nb_clients)
+        entry_station = route(routing_rngs[n_stations], entry_probabilities, self.nb_clients)
+        inbound = [[(entry_times[entry_station == k], jobs[entry_station == k])] for k in range(n_stations)]
+        
+        exit_times = np.full(self.nb_clients, np.nan)
+        total_wait = np.zeros(self.nb_clients)
+        visits = [None] * n_stations
+        for k in order:
+            station = stations[k]
+            # Arrivées fusionnées, dans l'ordre du temps
+            arrival_times = np.concatenate([times for times, _ in inbound[k]])
+            visit_jobs = np.concatenate([job for _, job in inbound[k]])
+            chronological = np.argsort(arrival_times, kind="stable")
+            arrival_times, visit_jobs = arrival_times[chronological], visit_jobs[chronological]
+            
+            service_rng = self.make_rng(derive_seed_sequence(self.seed_sequence, SERVICE_STREAM, k))
+            service_times = self.generate_times(station["mu"], station["distribution"], len(arrival_times),
+                                                service_rng)
+            departure_times, wait_times, server_index, _ = self._serve(arrival_times, service_times, None,
+                                                                       station["servers"])
+            total_wait += np.bincount(visit_jobs, weights=wait_times, minlength=self.nb_clients)
+            
+            # Routage des départs
+            destination = route(routing_rngs[k], routing[k], len(departure_times))
+            for target in np.flatnonzero(routing[k] > 0):
+                routed = destination == target
+                inbound[target].append((departure_times[routed], visit_jobs[routed]))
+            leaving = destination == n_stations
+            exit_times[visit_jobs[leaving]] = departure_times[leaving]
+            visits[k] = (arrival_times, service_times, departure_times, wait_times, server_index, visit_jobs)
+        
+        # Régime transitoire : choisi sur la latence de bout en bout, dans
+        # l'ordre d'entrée des clients
+        latency = exit_times - entry_times
+        start = self._warmup_point(latency)
+        observation_start = entry_times[start] if start > 0 else 0.0
+        duration = entry_times[-1] - observation_start
+        loads = traffic_rates(self.lmbda, routing, entry_probabilities) / np.array(
+            [station["servers"] * station["mu"] for station in stations])
+        
+        station_results = []
+        for k, station in enumerate(stations):
+            arrival_times, service_times, departure_times, wait_times, server_index, visit_jobs = visits[k]
+            kept = visit_jobs >= start
+            response_times = departure_times - arrival_times
+            per_server_busy = None
+            if server_index is not None:
+                per_server_busy = np.bincount(server_index[kept], weights=service_times[kept],
+                                              minlength=station["servers"])
+            # Station sans arrivée (non atteinte, ou trop peu de clients) :
+            # occupation nulle sur toute la fenêtre d'observation
+            makespan = np.max(departure_times) if len(departure_times) else entry_times[-1]
+            summary = self._summarize(RunningStats().update(wait_times[kept]),
+                                      RunningStats().update(response_times[kept]),
+                                      np.sum(service_times[kept]), makespan,
+                                      start, observation_start, QuantileSketch().update(wait_times[kept]),
+                                      QuantileSketch().update(response_times[kept]), station["servers"],
+                                      per_server_busy)
+            summary["theoretical_utilization"] = loads[k]
+            summary["visits"] = int(np.count_nonzero(kept))
+            summary["arrival_rate"] = summary["visits"] / duration
+            if self.queue_metrics and len(arrival_times) == 0:
+                summary.update({"mean_number_in_system": 0.0, "mean_number_in_queue": 0.0,
+                                "queue_length_distribution": np.ones(1)})
+            elif self.queue_metrics:
+                queue_length = QueueLengthStats(observation_start, station["servers"])
+                summary.update(queue_length.update(arrival_times, np.sort(departure_times)).summary())
+            station_results.append(summary)
+        
+        wait_sketch = QuantileSketch().update(total_wait[start:])
+        response_sketch = QuantileSketch().update(latency[start:])
+        results = {
+            "mean_wait_time": np.mean(total_wait[start:]),
+            "mean_response_time": np.mean(latency[start:]),
+            "theoretical_utilization": np.max(loads),
+            "wait_stats": RunningStats().update(total_wait[start:]),
+            "response_stats": RunningStats().update(latency[start:]),
+            "makespan": np.max(exit_times),
+            "warmup_clients": start,
+            "stations": station_results,
+            "wait_time_sketch": wait_sketch,
+            "response_time_sketch": response_sketch
+        }
+        results.update(quantile_metrics("wait_time", wait_sketch))
+        results.update(quantile_metrics("response_time", response_sketch))
+        if self.keep_traces:
+            results["wait_times"] = total_wait
+            results["response_times"] = latency
+        return results
+    
+    def simulate_trace(self, trace, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Rejoue une trace enregistrée (arrivées, services) au lieu de tirages aléatoires
+        
+        Les nb_clients premiers enregistrements passent par le moteur par
+        blocs (_run_streaming), à mémoire constante quelle que soit la taille
+        du fichier. λ, μ et ρ mesurés sur la trace rejouée (après mise à
+        l'échelle de la charge) sont retournés dans les résultats ; les
+        paramètres du simulateur ne sont pas modifiés.
+        
+        Paramètres:
+        -----------
+        trace : TraceReader
+            Trace à rejouer (voir traces.TraceReader)
+        chunk_size : int
+            Nombre de clients par bloc
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation, avec les
+               taux mesurés "arrival_rate" et "service_rate"
+        """
+        print(f"Rejeu de la trace {trace.path} (charge × {trace.load_factor:g}) en cours...")
+        
+        sample_inter_arrival, sample_service = trace.samplers()
+        results = self._run_streaming(sample_inter_arrival, sample_service, chunk_size)
+        
+        # Taux mesurés sur les clients rejoués
+        arrival_rate = trace.count / trace.inter_arrival_total
+        service_rate = trace.count / trace.service_total
+        results["arrival_rate"] = arrival_rate
+        results["service_rate"] = service_rate
+        results["theoretical_utilization"] = arrival_rate / service_rate
+        return results
+    
+    def simulate_batch(self, model="MM1", n_reps=5, distribution="uniform", confidence=0.95,
+                       first_replication=0):
+        """
+        Simule n_reps réplications indépendantes d'un modèle en une seule passe
+        
+        Les temps inter-arrivées et de service sont tirés sous forme de
+        matrices (n_reps, nb_clients), une ligne par flux de réplication, et
+        la récursion FIFO est appliquée à toutes les lignes à la fois.
+        Prévoir environ 50 octets par client et par réplication (≈ 250 Mo
+        pour 5 × 10^6).
+        
+        Paramètres:
+        -----------
+        model : str
+            "MM1", "GM1" ou "MG1"
+        n_reps : int
+            Nombre de réplications
+        distribution : str, dict ou Distribution
+            Loi générale utilisée par G/M/1 (arrivées) ou M/G/1 (services)
+        confidence : float
+            Niveau de l'intervalle de confiance (loi de Student)
+        first_replication : int
+            Indice du flux de la première réplication (pour compléter un lot
+            déjà simulé avec de nouvelles réplications)
+            
+        Retourne:
+        ---------
+        dict : Pour chaque métrique, la moyenne inter-réplications, les
+               valeurs par réplication (suffixe "_reps"), la variance
+               ("_var") et l'intervalle de confiance ("_ci")
+        """
+        if model not in MODEL_DISTRIBUTIONS:
+            raise ValueError(f"Modèle non supporté : {model}")
+        if self.capacity is not None:
+            raise ValueError("simulate_batch ne gère pas la capacité finie (K) : utiliser simulate_MM1, ...")
+        print(f"Simulation de {n_reps} réplications de la file {model} en cours...")
+        
+        arrival_distribution, service_distribution = MODEL_DISTRIBUTIONS[model]
+        inter_arrival_times = np.empty((n_reps, self.nb_clients))
+        service_times = np.empty((n_reps, self.nb_clients))
+        for r in range(n_reps):
+            # Flux de la réplication r : mêmes tirages qu'une simulation isolée
+            # avec la graine replication_seed_sequence(graine, r)
+            replication_seed = replication_seed_sequence(self.seed_sequence, first_replication + r)
+            arrival_rng, service_rng = self.make_streams(replication_seed)
+            inter_arrival_times[r] = self.generate_times(self.lmbda, arrival_distribution or distribution,
+                                                         self.nb_clients, arrival_rng)
+            service_times[r] = self.generate_times(self.mu, service_distribution or distribution,
+                                                   self.nb_clients, service_rng)
+        
+        # Récursion sur toutes les réplications à la fois
+        arrival_times = arrival_times_from(inter_arrival_times)
+        departure_times, wait_times = lindley_recursion(arrival_times, service_times, self.backend)
+        
+        # Troncature du régime transitoire commune aux réplications, choisie
+        # sur la série des attentes moyennée entre réplications (moins
+        # sensible aux excursions d'une réplication isolée)
+        start = self._warmup_point(np.mean(wait_times, axis=0)) if self.warmup is not None else 0
+        observation_start = departure_times[:, start - 1] if start > 0 else 0.0
+        replications = {
+            "mean_wait_time": np.mean(wait_times[:, start:], axis=1),
+            "mean_response_time": np.mean(departure_times[:, start:] - arrival_times[:, start:], axis=1),
+            "server_utilization": (np.sum(service_times[:, start:], axis=1)
+                                   / (departure_times[:, -1] - observation_start)),
+            "warmup_clients": np.full(n_reps, start)
+        }
+        
+        results = {"model": model, "n_reps": n_reps, "confidence": confidence,
+                   "theoretical_utilization": self.lmbda / self.mu}
+        
+        # Histogrammes par réplication : quantiles par réplication (avec
+        # intervalle de confiance) et histogramme fusionné du lot
+        for name, times in (("wait_time", wait_times[:, start:]),
+                            ("response_time", departure_times[:, start:] - arrival_times[:, start:])):
+            sketches = [QuantileSketch().update(row) for row in times]
+            for label in QUANTILES:
+                replications[f"{name}_{label}"] = np.empty(n_reps)
+            for r, sketch in enumerate(sketches):
+                for metric, value in quantile_metrics(name, sketch).items():
+                    replications[metric][r] = value
+            results[name + "_sketch"] = sketches[0]
+            for sketch in sketches[1:]:
+                results[name + "_sketch"].merge(sketch)
+        
+        for name, values in replications.items():
+            mean, variance, interval = confidence_interval(values, confidence)
+            results[name] = mean
+            results[name + "_reps"] = values
+            results[name + "_var"] = variance
+            results[name + "_ci"] = interval
+        return results
+    
+    def simulate_variance_reduced(self, model="MM1", n_reps=10, distribution="uniform", antithetic=True,
+                                  control_variates=("service", "arrival"), confidence=0.95):
+        """
+        Simule n_reps réplications d'un modèle avec réduction de variance
+        
+        Chaque réplication r est pilotée par des uniformes (CommonRandomNumbers
+        de graine replication_seed_sequence(graine, r)), ce qui permet de
+        combiner deux techniques :
+        - variables antithétiques : la réplication r est doublée d'une
+          réplication pilotée par 1 - U, et l'observation est la moyenne
+          de la paire ;
+        - variables de contrôle : grandeurs d'espérance connue dont l'écart
+          observé corrige les moyennes par régression (control_variate_estimate) :
+              "service" : moyenne empirique des temps de service (E[S])
+              "arrival" : moyenne empirique des inter-arrivées (E[A])
+              "mm1"     : même métrique pour la file M/M/1 pilotée par les
+                          mêmes uniformes (espérance de
+                          calculate_theoretical_metrics ; le biais de régime
+                          transitoire de M/M/1 se reporte sur l'estimation)
+        
+        Le facteur de réduction de variance rapporte la variance de la
+        moyenne d'autant de simulations indépendantes (estimée sur les
+        simulations elles-mêmes) à celle de l'estimateur : à précision
+        égale, le nombre de clients simulés peut être divisé par ce facteur.
+        
+        Paramètres:
+        -----------
+        model : str
+            "MM1", "GM1" ou "MG1"
+        n_reps : int
+            Nombre de réplications (de paires avec antithetic)
+        distribution : str, dict ou Distribution
+            Loi générale utilisée par G/M/1 (arrivées) ou M/G/1 (services)
+        antithetic : bool
+            Si True, chaque réplication est appariée à sa réplication antithétique
+        control_variates : tuple
+            Contrôles utilisés parmi "service", "arrival" et "mm1" (vide = aucun)
+        confidence : float
+            Niveau de l'intervalle de confiance
+            
+        Retourne:
+        ---------
+        dict : Pour mean_wait_time et mean_response_time, l'estimation, sa
+               variance ("_var"), l'intervalle de confiance ("_ci"), les
+               observations ("_reps"), les coefficients β ("_beta") et le
+               facteur de réduction de variance ("_variance_reduction")
+        """
+        if model not in MODEL_DISTRIBUTIONS:
+            raise ValueError(f"Modèle non supporté : {model}")
+        controls = tuple(control_variates or ())
+        for control in controls:
+            if control not in ("service", "arrival", "mm1"):
+                raise ValueError(f"Variable de contrôle non supportée : {control}")
+        if "mm1" in controls and model == "MM1":
+            raise ValueError("Le contrôle 'mm1' n'a pas de sens pour le modèle M/M/1 lui-même")
+        if self.capacity is not None:
+            raise ValueError("simulate_variance_reduced ne gère pas la capacité finie (K)")
+        print(f"Simulation de {n_reps} réplications de la file {model} avec réduction de variance...")
+        
+        arrival_distribution, service_distribution = (law or distribution for law in MODEL_DISTRIBUTIONS[model])
+        metrics = ("mean_wait_time", "mean_response_time")
+        members = (False, True) if antithetic else (False,)
+        
+        # Espérances connues des contrôles, par métrique
+        known = {"service": moments(self.mu, service_distribution)[0],
+                 "arrival": moments(self.lmbda, arrival_distribution)[0]}
+        if "mm1" in controls:
+            theory = calculate_theoretical_metrics(np.array([self.lmbda]), self.mu)
+        control_means = {name: [theory[name][0] if control == "mm1" else known[control] for control in controls]
+                         for name in metrics}
+        
+        observed = {name: np.empty((n_reps, len(members))) for name in metrics}
+        observed_controls = {name: np.empty((n_reps, len(members), len(controls))) for name in metrics}
+        for r in range(n_reps):
+            replication_seed = replication_seed_sequence(self.seed_sequence, r)
+            for k, member in enumerate(members):
+                crn = CommonRandomNumbers(self.nb_clients, replication_seed, self.bit_generator, antithetic=member)
+                simulator = QueueSimulator(self.lmbda, self.mu, self.nb_clients, backend=self.backend,
+                                           crn=crn, warmup=self.warmup)
+                if model == "MM1":
+                    results = simulator.simulate_MM1()
+                elif model == "GM1":
+                    results = simulator.simulate_GM1(distribution=distribution)
+                else:
+                    results = simulator.simulate_MG1(distribution=distribution)
+                if "mm1" in controls:
+                    reference = QueueSimulator(self.lmbda, self.mu, self.nb_clients, backend=self.backend,
+                                               crn=crn, warmup=self.warmup).simulate_MM1()
+                
+                # Contrôles calculés sur les clients retenus (après le régime transitoire)
+                start = results["warmup_clients"]
+                sample_means = {
+                    "service": np.mean(crn.unit_times(SERVICE_STREAM, service_distribution)[start:]) / self.mu,
+                    "arrival": np.mean(crn.unit_times(ARRIVAL_STREAM, arrival_distribution)[start:]) / self.lmbda
+                }
+                for name in metrics:
+                    observed[name][r, k] = results[name]
+                    observed_controls[name][r, k] = [reference[name] if control == "mm1" else sample_means[control]
+                                                     for control in controls]
+        
+        results = {"model": model, "n_reps": n_reps, "antithetic": antithetic, "control_variates": controls,
+                   "confidence": confidence, "theoretical_utilization": self.lmbda / self.mu}
+        for name in metrics:
+            # Observations : moyennes des paires antithétiques
+            values = np.mean(observed[name], axis=1)
+            if controls:
+                estimate, variance, interval, beta = control_variate_estimate(
+                    values, np.mean(observed_controls[name], axis=1), control_means[name], confidence)
+            else:
+                estimate, sample_variance, interval = confidence_interval(values, confidence)
+                variance, beta = sample_variance / n_reps, np.empty(0)
+            # Référence : moyenne d'autant de simulations indépendantes
+            plain_variance = np.var(observed[name], ddof=1) / observed[name].size
+            results[name] = estimate
+            results[name + "_var"] = variance
+            results[name + "_ci"] = interval
+            results[name + "_reps"] = values
+            results[name + "_beta"] = beta
+            results[name + "_variance_reduction"] = plain_variance / variance
+        return results
+    
+    def estimate_wait_tail(self, x, model="MM1", distribution="uniform", n_paths=10000, confidence=0.95):
+        """
+        Estime la probabilité d'attente P(W > x) en régime stationnaire
+        par échantillonnage préférentiel (algorithme de Siegmund)
+        
+        Au lieu de simuler la file jusqu'à observer assez d'attentes
+        supérieures à x (≈ 1/P(W > x) clients par événement), on simule
+        n_paths marches de Lindley sous une loi basculée exponentiellement
+        et on pondère par le rapport de vraisemblance (voir
+        importance_sampling.py) : l'estimation est sans biais et son erreur
+        relative ne se dégrade pas quand x grandit.
+        
+        Paramètres:
+        -----------
+        x : float
+            Seuil d'attente (par exemple 50 × E[S])
+        model : str
+            "MM1", "GM1" ou "MG1"
+        distribution : str, dict ou Distribution
+            Loi générale utilisée par G/M/1 (arrivées) ou M/G/1 (services)
+        n_paths : int
+            Nombre de marches simulées
+        confidence : float
+            Niveau de l'intervalle de confiance
+            
+        Retourne:
+        ---------
+        dict : Probabilité ("probability"), erreur relative, intervalle de
+               confiance ("ci"), basculement θ* ("theta"), nombre moyen de pas
+               ("mean_steps"), réduction de variance et gain de calcul
+               par rapport à la simulation directe
+        """
+        if model not in MODEL_DISTRIBUTIONS:
+            raise ValueError(f"Modèle non supporté : {model}")
+        arrival_distribution, service_distribution = (law or distribution for law in MODEL_DISTRIBUTIONS[model])
+        return siegmund_tail_probability(x, self.lmbda, self.mu, arrival_distribution, service_distribution,
+                                         n_paths, self.arrival_rng, self.service_rng, confidence)
+    
+    def _simulate(self, sample_inter_arrival, sample_service, stream=False, chunk_size=DEFAULT_CHUNK_SIZE,
+                  servers=1):
+        """
+        Tire les temps puis exécute la simulation, en une fois ou par blocs
+        
+        Paramètres:
+        -----------
+        sample_inter_arrival, sample_service : callable
+            Fonctions size -> np.array tirant les temps inter-arrivées et de service
+        stream : bool
+            Si True, simulation par blocs à mémoire constante
+        chunk_size : int
+            Nombre de clients par bloc en mode stream
+        servers : int
+            Nombre de serveurs
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation
+        """
+        if stream:
+            return self._run_streaming(sample_inter_arrival, sample_service, chunk_size, servers)
+        return self._run_simulation(sample_inter_arrival(self.nb_clients), sample_service(self.nb_clients),
+                                    servers)
+    
+    def _serve(self, arrival_times, service_times, state, servers=1):
+        """
+        Applique la récursion FIFO à un bloc de clients
+        
+        Mono-serveur : récursion de Lindley (lindley.py), l'état est le
+        départ du client précédent. Avec c serveurs : récursion de
+        Kiefer-Wolfowitz (multiserver.py), l'état est le vecteur des dates
+        de libération des serveurs (None au départ). Avec une capacité K,
+        récursion avec refus de finite_capacity.py (départs et attentes NaN
+        pour les clients refusés).
+        
+        Retourne:
+        ---------
+        tuple : (departure_times, wait_times, indice du serveur de chaque
+                client (None en mono-serveur), état à la fin du bloc)
+        """
+        if self.capacity is not None:
+            if servers != 1:
+                raise ValueError("La capacité finie (K) n'est disponible qu'avec un seul serveur")
+            departure_times, wait_times, state = finite_capacity_recursion(arrival_times, service_times,
+                                                                           self.capacity, self.backend, state)
+            return departure_times, wait_times, None, state
+        if servers == 1:
+            departure_times, wait_times = lindley_recursion(arrival_times, service_times, self.backend,
+                                                            state if state is not None else 0.0)
+            return departure_times, wait_times, None, departure_times[-1] if len(departure_times) else state
+        return multiserver_recursion(arrival_times, service_times, servers, self.backend, state)
+    
+    def _run_streaming(self, sample_inter_arrival, sample_service, chunk_size=DEFAULT_CHUNK_SIZE, servers=1):
+        """
+        Exécute la simulation par blocs de chunk_size clients
+        
+        Chaque bloc est tiré, simulé puis résumé dans des agrégats courants ;
+        l'horloge (dernière arrivée) et le dernier départ sont reportés d'un
+        bloc à l'autre. La mémoire dépend donc de chunk_size et non de
+        nb_clients. Les flux aléatoires étant consommés séquentiellement, les
+        temps tirés sont les mêmes que sans découpage : les résultats sont
+        identiques (aux arrondis de sommation près) avec les backends
+        "python"/"numba", et à l'arrondi de l'horloge près avec "numpy" (voir
+        lindley_recursion).
+        
+        Paramètres:
+        -----------
+        sample_inter_arrival, sample_service : callable
+            Fonctions size -> np.array tirant les temps inter-arrivées et de service
+        chunk_size : int
+            Nombre de clients par bloc
+        servers : int
+            Nombre de serveurs (l'état reporté est alors le vecteur des
+            dates de libération des serveurs)
+            
+        Retourne:
+        ---------
+        dict : Dictionnaire contenant les résultats de la simulation
+        """
+        clock = 0.0               # Arrivée du dernier client simulé
+        state = None              # Dernier départ (ou libération de chaque serveur)
+        makespan = 0.0            # Dernier départ observé
+        count = 0
+        wait_stats = RunningStats()
+        response_stats = RunningStats()
+        wait_sketch = QuantileSketch()
+        response_sketch = QuantileSketch()
+        server_busy_time = 0.0
+        per_server_busy = np.zeros(servers) if servers > 1 else None
+        wait_chunks, response_chunks = [], []
+        
+        warmup_clients = 0
+        observation_start = 0.0
+        blocking_start = 0.0      # Début du comptage des refus (après le régime transitoire)
+        queue_length = None
+        offered, refused = 0, 0   # Clients arrivés et refusés (capacité finie)
+        trace_writer = self._open_trace_writer()
+        # Blocs retenus tant que les WARMUP_WINDOW premiers clients admis ne sont pas simulés
+        buffered = []
+        
+        while count < self.nb_clients:
+            size = min(chunk_size, self.nb_clients - count)
+            service_times = sample_service(size)
+            arrival_times = arrival_times_from(sample_inter_arrival(size), clock)
+            departure_times, wait_times, server_index, state = self._serve(arrival_times, service_times, state,
+                                                                           servers)
+            response_times = departure_times - arrival_times
+            if trace_writer is not None:
+                trace_writer.write(count, arrival_times=arrival_times, departure_times=departure_times,
+                                   wait_times=wait_times, response_times=response_times)
+            clock = arrival_times[-1]
+            count += size
+            
+            # Capacité finie : les clients refusés sortent des statistiques
+            offered_arrivals = refused_arrivals = None
+            if self.capacity is not None:
+                offered_arrivals = arrival_times
+                arrival_times, service_times, departure_times, wait_times, response_times, refused_arrivals = (
+                    self._admitted(arrival_times, service_times, departure_times, wait_times, response_times))
+            
+            # Régime transitoire : cherché sur le même préfixe que sans découpage
+            start = 0
+            if buffered is not None:
+                buffered.append((arrival_times, service_times, departure_times, wait_times, response_times,
+                                 server_index, offered_arrivals, refused_arrivals))
+                if sum(len(chunk[3]) for chunk in buffered) < WARMUP_WINDOW and count < self.nb_clients:
+                    continue
+                (arrival_times, service_times, departure_times, wait_times, response_times, server_index,
+                 offered_arrivals, refused_arrivals) = (
+                    None if chunk[0] is None else np.concatenate(chunk) for chunk in zip(*buffered))
+                buffered = None
+                start = warmup_clients = self._warmup_point(wait_times)
+                observation_start = self._observation_start(arrival_times, departure_times, wait_times, start,
+                                                            servers)
+                blocking_start = arrival_times[start] if start > 0 else 0.0
+                queue_length = QueueLengthStats(observation_start, servers) if self.queue_metrics else None
+            if queue_length is not None:
+                queue_length.update(arrival_times, departure_times, horizon=clock)
+            if self.capacity is not None:
+                offered += np.count_nonzero(offered_arrivals >= blocking_start)
+                refused += np.count_nonzero(refused_arrivals >= blocking_start)
+            
+            # Agrégats courants
+            wait_stats.update(wait_times[start:])
+            response_stats.update(response_times[start:])
+            wait_sketch.update(wait_times[start:])
+            response_sketch.update(response_times[start:])
+            server_busy_time += np.sum(service_times[start:])
+            if server_index is not None:
+                per_server_busy += np.bincount(server_index[start:], weights=service_times[start:],
+                                               minlength=servers)
+            if self.keep_traces:
+                wait_chunks.append(wait_times)
+                response_chunks.append(response_times)
+            
+            # Report de l'état vers le bloc suivant
+            makespan = np.max(departure_times, initial=makespan)
+        
+        results = self._summarize(wait_stats, response_stats, server_busy_time, makespan,
+                                  warmup_clients, observation_start, wait_sketch, response_sketch,
+                                  servers, per_server_busy)
+        if self.capacity is not None:
+            results.update(self._capacity_metrics(offered, refused, clock - blocking_start))
+        if queue_length is not None:
+            # Départs restants après la dernière arrivée
+            results.update(queue_length.update(np.empty(0), np.empty(0)).summary())
+        if self.keep_traces:
+            results["wait_times"] = np.concatenate(wait_chunks)
+            results["response_times"] = np.concatenate(response_chunks)
+        if trace_writer is not None:
+            trace_writer.close()
+            results["trace_dir"] = self.trace_dir
+        return results
+    
+    def _open_trace_writer(self):
+        """
+        Crée l'écrivain de traces projetées en mémoire si trace_dir est défini
+        """
+        if self.trace_dir is None:
+            return None
+        return TraceWriter(self.trace_dir, self.nb_clients, self.trace_dtypes)
     
-    def simulate_GM1(self, distribution="uniform"):
+    def _summarize(self, wait_stats, response_stats, server_busy_time, makespan, warmup_clients=0,
+                   observation_start=0.0, wait_sketch=None, response_sketch=None, servers=1, per_server_busy=None):
         """
-        Simule une file d'attente G/M/1 avec une loi générale pour les arrivées
+        Construit le dictionnaire de résultats à partir des agrégats
         
         Paramètres:
         -----------
-        distribution : str
-            Type de distribution à utiliser pour les arrivées
+        wait_stats, response_stats : RunningStats
+            Statistiques des temps d'attente et de réponse (régime stationnaire)
+        server_busy_time : float
+            Temps où le serveur est occupé par les clients retenus
+        makespan : float
+            Départ du dernier client (durée totale de la simulation)
+        warmup_clients : int
+            Nombre de clients supprimés au titre du régime transitoire
+        observation_start : float
+            Début de la fenêtre d'observation (départ du dernier client supprimé)
+        wait_sketch, response_sketch : QuantileSketch
+            Histogrammes des temps d'attente et de réponse (quantiles QUANTILES)
+        servers : int
+            Nombre de serveurs (l'occupation est la moyenne sur les serveurs,
+            l'occupation théorique λ/(cμ))
+        per_server_busy : np.array
+            Temps d'occupation de chaque serveur (multi-serveurs)
             
         Retourne:
         ---------
         dict : Dictionnaire contenant les résultats de la simulation
         """
-        print(f"Simulation de la file G/M/1 ({distribution}) en cours...")
+        results = {
+            "mean_wait_time": wait_stats.mean,
+            "mean_response_time": response_stats.mean,
+            "server_utilization": server_busy_time / (servers * (makespan - observation_start)),
+            "theoretical_utilization": self.lmbda / (servers * self.mu),
+            "wait_stats": wait_stats,
+            "response_stats": response_stats,
+            "server_busy_time": server_busy_time,
+            "makespan": makespan,
+            "warmup_clients": warmup_clients
+        }
+        if servers > 1:
+            results["n_servers"] = servers
+        if per_server_busy is not None:
+            results["per_server_utilization"] = per_server_busy / (makespan - observation_start)
+        for name, sketch in (("wait_time", wait_sketch), ("response_time", response_sketch)):
+            if sketch is not None:
+                results[name + "_sketch"] = sketch
+                results.update(quantile_metrics(name, sketch))
+        return results
+    
+    def _warmup_point(self, wait_times):
+        """
+        Nombre de clients du régime transitoire à supprimer (0 sans troncature)
         
-        # Générer les temps inter-arrivées selon la distribution choisie
-        if distribution == "uniform":
-            # Loi uniforme avec moyenne 1/lambda
-            mean = 1.0/self.lmbda
-            inter_arrival_times = self.generate_uniform(0.5*mean, 1.5*mean, self.nb_clients)
-        elif distribution == "normal":
-            # Loi normale avec moyenne 1/lambda et écart-type ajusté
-            mean = 1.0/self.lmbda
-            inter_arrival_times = self.generate_normal(mean, mean/3, self.nb_clients)
-        else:
-            raise ValueError("Distribution non supportée")
-        
-        # Générer les temps de service (loi exponentielle)
-        service_times = self.generate_exponential(self.mu, self.nb_clients)
+        La règle est appliquée aux WARMUP_WINDOW premières valeurs, préfixe
+        commun aux modes stream et non découpé.
         
-        # Calculer les résultats avec la simulation
-        return self._run_simulation(inter_arrival_times, service_times)
+        Paramètres:
+        -----------
+        wait_times : np.array
+            Série des temps d'attente
+        """
+        if self.warmup == "mser5":
+            return mser_truncation(wait_times[..., :WARMUP_WINDOW], batch_size=5)
+        return 0
     
-    def simulate_MG1(self, distribution="uniform"):
+    @staticmethod
+    def _observation_start(arrival_times, departure_times, wait_times, start, servers=1):
         """
-        Simule une file d'attente M/G/1 avec une loi générale pour le service
+        Début de la fenêtre d'observation après suppression de `start` clients
+        
+        Mono-serveur : départ du dernier client supprimé. Avec c serveurs,
+        les clients retenus commencent leur service au plus tôt au début de
+        service du client `start` (débuts de service croissants en FIFO).
+        """
+        if start == 0:
+            return 0.0
+        if servers == 1:
+            return departure_times[start - 1]
+        return arrival_times[start] + wait_times[start]
+    
+    @staticmethod
+    def _admitted(arrival_times, service_times, departure_times, wait_times, response_times):
+        """
+        Restreint les tableaux d'un bloc aux clients admis (attente non NaN)
+        
+        Retourne:
+        ---------
+        tuple : Les cinq tableaux restreints, puis les dates d'arrivée des clients refusés
+        """
+        admitted = ~np.isnan(wait_times)
+        return (arrival_times[admitted], service_times[admitted], departure_times[admitted],
+                wait_times[admitted], response_times[admitted], arrival_times[~admitted])
+    
+    def _capacity_metrics(self, offered, refused, duration):
+        """
+        Métriques de la file à capacité finie
         
         Paramètres:
         -----------
-        distribution : str
-            Type de distribution à utiliser pour le service
+        offered : int
+            Nombre de clients arrivés pendant la fenêtre d'observation
+        refused : int
+            Nombre de clients refusés parmi eux
+        duration : float
+            Durée de la fenêtre d'observation des arrivées
             
         Retourne:
         ---------
-        dict : Dictionnaire contenant les résultats de la simulation
+        dict : Capacité, probabilité de blocage (P_K) et débit effectif λ (1 - P_K)
         """
-        print(f"Simulation de la file M/G/1 ({distribution}) en cours...")
-        
-        # Générer les temps inter-arrivées (loi exponentielle)
-        inter_arrival_times = self.generate_exponential(self.lmbda, self.nb_clients)
-        
-        # Générer les temps de service selon la distribution choisie
-        if distribution == "uniform":
-            # Loi uniforme avec moyenne 1/mu
-            mean = 1.0/self.mu
-            service_times = self.generate_uniform(0.5*mean, 1.5*mean, self.nb_clients)
-        elif distribution == "normal":
-            # Loi normale avec moyenne 1/mu et écart-type ajusté
-            mean = 1.0/self.mu
-            service_times = self.generate_normal(mean, mean/3, self.nb_clients)
-        else:
-            raise ValueError("Distribution non supportée")
-        
-        # Calculer les résultats avec la simulation
-        return self._run_simulation(inter_arrival_times, service_times)
+        return {
+            "capacity": self.capacity,
+            "offered_clients": offered,
+            "blocked_clients": refused,
+            "blocking_probability": refused / offered,
+            "effective_throughput": (offered - refused) / duration
+        }
     
-    def _run_simulation(self, inter_arrival_times, service_times):
+    def _run_simulation(self, inter_arrival_times, service_times, servers=1):
         """
         Exécute la simulation à partir des temps d'arrivée et de service
         
@@ -190,50 +1493,337 @@ class QueueSimulator:
             Tableau des temps inter-arrivées
         service_times : np.array
             Tableau des temps de service
+        servers : int
+            Nombre de serveurs
             
         Retourne:
         ---------
         dict : Dictionnaire contenant les résultats de la simulation
         """
-        # Initialisation des variables
-        arrival_times = np.cumsum(inter_arrival_times)  # Temps d'arrivée absolus
-        departure_times = np.zeros(self.nb_clients)     # Temps de départ
-        wait_times = np.zeros(self.nb_clients)         # Temps d'attente dans la file
-        
-        # Premier client
-        departure_times[0] = arrival_times[0] + service_times[0]
+        # Temps d'arrivée absolus
+        arrival_times = arrival_times_from(inter_arrival_times)
         
-        # Traitement client par client
-        for i in range(1, self.nb_clients):
-            # Le client attend si le serveur est encore occupé à son arrivée
-            wait_times[i] = max(0, departure_times[i-1] - arrival_times[i])
-            
-            # Le temps de départ est la somme du temps d'arrivée, du temps d'attente et du temps de service
-            departure_times[i] = arrival_times[i] + wait_times[i] + service_times[i]
+        # Temps de départ et d'attente (récursion FIFO, voir lindley.py et multiserver.py)
+        departure_times, wait_times, server_index, _ = self._serve(arrival_times, service_times, None, servers)
         
         # Calcul des métriques
         response_times = departure_times - arrival_times  # Temps de réponse = temps dans le système
+        trace_writer = self._open_trace_writer()
+        if trace_writer is not None:
+            trace_writer.write(0, arrival_times=arrival_times, departure_times=departure_times,
+                               wait_times=wait_times, response_times=response_times)
+            trace_writer.close()
+        
+        # Capacité finie : les clients refusés sortent des statistiques
+        offered_arrivals = arrival_times
+        if self.capacity is not None:
+            arrival_times, service_times, departure_times, wait_times, response_times, refused_arrivals = (
+                self._admitted(arrival_times, service_times, departure_times, wait_times, response_times))
         
         # Calcul du taux d'occupation (temps serveur occupé / temps total)
-        total_time = departure_times[-1]  # Temps total de la simulation
-        server_busy_time = np.sum(service_times)  # Temps total où le serveur est occupé
-        server_utilization = server_busy_time / total_time
+        total_time = np.max(departure_times)  # Temps total de la simulation
         
-        # Retourne un dictionnaire avec les résultats
-        return {
-            "mean_wait_time": np.mean(wait_times),
-            "mean_response_time": np.mean(response_times),
-            "server_utilization": server_utilization,
-            "theoretical_utilization": self.rho,
-            "wait_times": wait_times,
-            "response_times": response_times
-        }
+        # Suppression du régime transitoire (les clients servis après le
+        # départ du dernier client supprimé forment la fenêtre d'observation)
+        start = self._warmup_point(wait_times)
+        observation_start = self._observation_start(arrival_times, departure_times, wait_times, start, servers)
+        per_server_busy = None
+        if server_index is not None:
+            per_server_busy = np.bincount(server_index[start:], weights=service_times[start:], minlength=servers)
+        
+        # Statistiques en une passe ; tableaux bruts seulement sur demande
+        results = self._summarize(RunningStats().update(wait_times[start:]),
+                                  RunningStats().update(response_times[start:]),
+                                  np.sum(service_times[start:]), total_time, start, observation_start,
+                                  QuantileSketch().update(wait_times[start:]),
+                                  QuantileSketch().update(response_times[start:]),
+                                  servers, per_server_busy)
+        if self.capacity is not None:
+            blocking_start = arrival_times[start] if start > 0 else 0.0
+            results.update(self._capacity_metrics(np.count_nonzero(offered_arrivals >= blocking_start),
+                                                  np.count_nonzero(refused_arrivals >= blocking_start),
+                                                  offered_arrivals[-1] - blocking_start))
+        if self.queue_metrics:
+            queue_length = QueueLengthStats(observation_start, servers).update(arrival_times, departure_times)
+            results.update(queue_length.summary())
+        if self.keep_traces:
+            results["wait_times"] = wait_times
+            results["response_times"] = response_times
+        if trace_writer is not None:
+            results["trace_dir"] = self.trace_dir
+        return results
+
+
+# Métriques moyennes retournées par chaque cellule de la grille d'expériences
+CELL_METRICS = ("mean_response_time", "mean_wait_time", "server_utilization", "warmup_clients",
+                "mean_number_in_system", "mean_number_in_queue")
+
+# Grandeurs dont chaque cellule retourne l'histogramme (effectifs de QuantileSketch,
+# fusionnés entre réplications par run_experiments)
+SKETCH_METRICS = ("wait_time", "response_time")
+
+def simulate_cell(lmbda, mu, nb_clients, model, seed, backend="numpy", n_reps=None, distribution="uniform",
+                  crn=None, first_replication=0, warmup=None, queue_metrics=False):
+    """
+    Simule une cellule (λ, modèle, répétition) de la grille d'expériences
+    
+    Seules les moyennes et les effectifs des histogrammes de quantiles
+    sont retournés : les tableaux par client restent
+    dans le processus qui les a calculés, ce qui rend la fonction adaptée
+    à une exécution dans un pool de processus.
+    
+    Paramètres:
+    -----------
+    lmbda, mu, nb_clients, seed, backend :
+        Voir QueueSimulator
+    model : str
+        "MM1", "GM1" ou "MG1"
+    n_reps : int
+        Si fourni, simule n_reps réplications en lot (simulate_batch)
+    distribution : str, dict ou Distribution
+        Loi générale utilisée par G/M/1 et M/G/1
+    crn : CommonRandomNumbers
+        Variables de base communes (voir QueueSimulator)
+    first_replication : int
+        Indice de la première réplication du lot (mode n_reps)
+    warmup : str
+        Suppression du régime transitoire (voir QueueSimulator)
+    queue_metrics : bool
+        Calcul de L et Lq (voir QueueSimulator)
+        
+    Retourne:
+    ---------
+    dict : Pour chaque métrique de CELL_METRICS, un tableau d'une valeur par
+           réplication (NaN pour les métriques non calculées), et pour chaque
+           grandeur de SKETCH_METRICS les effectifs de son histogramme
+           (toutes réplications confondues, clé name + "_sketch")
+    """
+    simulator = QueueSimulator(lmbda, mu, nb_clients, seed=seed, backend=backend, crn=crn, warmup=warmup,
+                               queue_metrics=queue_metrics)
+    if n_reps is not None:
+        results = simulator.simulate_batch(model, n_reps, distribution=distribution,
+                                           first_replication=first_replication)
+        output = {name: results.get(name + "_reps", np.full(n_reps, np.nan)) for name in CELL_METRICS}
+    elif model == "MM1":
+        results = simulator.simulate_MM1()
+    elif model == "GM1":
+        results = simulator.simulate_GM1(distribution=distribution)
+    elif model == "MG1":
+        results = simulator.simulate_MG1(distribution=distribution)
+    else:
+        raise ValueError(f"Modèle non supporté : {model}")
+    if n_reps is None:
+        output = {name: np.array([results.get(name, np.nan)]) for name in CELL_METRICS}
+    for name in SKETCH_METRICS:
+        output[name + "_sketch"] = results[name + "_sketch"].counts
+    return output
+
+
+def simulate_crn_replication(lambda_values, mu, nb_clients, seed, backend="numpy", distribution="uniform",
+                             warmup=None, queue_metrics=False):
+    """
+    Simule une réplication de toute la grille λ × modèles avec des variables communes
+    
+    Les variables de base sont tirées une seule fois (CommonRandomNumbers)
+    puis transformées pour chaque λ et chaque modèle.
+    
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Valeurs de λ de la grille
+    mu, nb_clients, seed, backend :
+        Voir QueueSimulator
+    distribution : str, dict ou Distribution
+        Loi générale utilisée par G/M/1 et M/G/1
+    warmup : str
+        Suppression du régime transitoire (voir QueueSimulator)
+    queue_metrics : bool
+        Calcul de L et Lq (voir QueueSimulator)
+        
+    Retourne:
+    ---------
+    dict : {(indice de λ, modèle): résultats de simulate_cell}
+    """
+    crn = CommonRandomNumbers(nb_clients, seed)
+    outputs = {}
+    for i, lmbda in enumerate(lambda_values):
+        for model in MODEL_INDEX:
+            outputs[(i, model)] = simulate_cell(lmbda, mu, nb_clients, model, None, backend,
+                                                distribution=distribution, crn=crn, warmup=warmup,
+                                                queue_metrics=queue_metrics)
+    return outputs
+
+
+def replay_trace(path, load_factor=1.0, nb_clients=None, chunk_size=DEFAULT_CHUNK_SIZE, backend="numpy",
+                 warmup=None, queue_metrics=False, trace_dir=None, **reader_options):
+    """
+    Rejoue un journal d'arrivées et de services dans la file FIFO mono-serveur
+    
+    Paramètres:
+    -----------
+    path : str
+        Fichier .npy ou .csv, ou répertoire (voir traces.TraceReader)
+    load_factor : float
+        Facteur appliqué au taux d'arrivée (1.2 : « et si la charge augmentait de 20 % ? »)
+    nb_clients : int
+        Nombre d'enregistrements rejoués (None = toute la trace)
+    chunk_size : int
+        Nombre d'enregistrements lus et simulés à la fois
+    backend : str
+        Noyau de la récursion FIFO ("numpy", "python" ou "numba")
+    warmup : str
+        Suppression du régime transitoire : None ou "mser5"
+    queue_metrics : bool
+        Si True, calcule aussi L, Lq et P(N=n)
+    trace_dir : str
+        Répertoire des traces par client en sortie (optionnel)
+    reader_options : dict
+        Options de lecture (arrival_column, service_column, timestamps, delimiter)
+        
+    Retourne:
+    ---------
+    dict : Résultats de la simulation (voir QueueSimulator.simulate_trace)
+    """
+    trace = TraceReader(path, load_factor=load_factor, chunk_size=chunk_size, **reader_options)
+    # Taux inconnus avant la lecture : ils sont mesurés pendant le rejeu
+    simulator = QueueSimulator(np.nan, np.nan, len(trace) if nb_clients is None else nb_clients,
+                               backend=backend, warmup=warmup, trace_dir=trace_dir,
+                               queue_metrics=queue_metrics)
+    return simulator.simulate_trace(trace, chunk_size)
+
+
+def _run_task(task):
+    """
+    Exécute une tâche (fonction, arguments) ; utilisée par le pool de processus
+    """
+    function, args = task
+    return function(*args)
+
+
+def _execute_tasks(tasks, executor=None, cache=None, work_queue=None, workers=1):
+    """
+    Exécute une liste de tâches (fonction, arguments), en lisant d'abord le cache
+    
+    Paramètres:
+    -----------
+    tasks : list
+        Tâches à exécuter
+    executor : ProcessPoolExecutor
+        Pool de processus (None = exécution séquentielle)
+    cache : ResultCache
+        Cache disque des résultats (None = pas de cache)
+    work_queue : WorkQueue
+        File de travail sur disque (None = exécution directe) : les tâches
+        manquantes y sont soumises, puis réservées et exécutées ou
+        attendues (voir work_queue.py)
+    workers : int
+        Nombre de processus du pool
+        
+    Retourne:
+    ---------
+    list : Résultats dans l'ordre des tâches
+    """
+    outputs = [None] * len(tasks)
+    keys = [cache.key(task) for task in tasks] if cache is not None else [None] * len(tasks)
+    if cache is not None:
+        for index, key in enumerate(keys):
+            outputs[index] = cache.get(key)
+    missing = [index for index, output in enumerate(outputs) if output is None]
+    if cache is not None:
+        print(f"{len(tasks) - len(missing)} cellule(s) lue(s) dans le cache, {len(missing)} à simuler")
+    
+    # map conserve l'ordre de la grille
+    if work_queue is not None:
+        computed = work_queue.run([tasks[index] for index in missing], executor, workers)
+    elif executor is not None:
+        print(f"Exécution de {len(missing)} cellules sur le pool de processus...")
+        computed = executor.map(_run_task, [tasks[index] for index in missing])
+    else:
+        computed = map(_run_task, [tasks[index] for index in missing])
+    for index, output in zip(missing, computed):
+        outputs[index] = output
+        if cache is not None:
+            cache.put(keys[index], output)
+    if cache is not None and missing:
+        cache.evict()
+    return outputs
+
+
+def _grid_results(lambda_values, models, collected, sketches, nb_clients, confidence=0.95):
+    """
+    Agrège les répétitions de chaque cellule (λ, modèle) en tableaux par λ
+    
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Valeurs de λ de la grille
+    models : tuple
+        Modèles simulés
+    collected : dict
+        {(indice de λ, modèle): {métrique de CELL_METRICS: valeurs par répétition}}
+    sketches : dict
+        {(indice de λ, modèle): {grandeur de SKETCH_METRICS: QuantileSketch fusionné}}
+    nb_clients : int ou np.array
+        Nombre de clients par répétition (éventuellement un par λ)
+    confidence : float
+        Niveau de confiance des intervalles
+        
+    Retourne:
+    ---------
+    dict : {modèle: résultats} au format de run_experiments
+    """
+    nb_clients = np.broadcast_to(nb_clients, len(lambda_values))
+    results = {}
+    for model in models:
+        results[model] = {"lambda": lambda_values}
+        for name in CELL_METRICS + ("response_time_rel_ci",):
+            results[model][name] = np.zeros(len(lambda_values))
+        for name in SKETCH_METRICS:
+            for label in QUANTILES:
+                results[model][f"{name}_{label}"] = np.zeros(len(lambda_values))
+        results[model]["n_replications"] = np.zeros(len(lambda_values), dtype=int)
+        results[model]["nb_customers"] = np.zeros(len(lambda_values), dtype=int)
+    
+    for i in range(len(lambda_values)):
+        # Moyennes des répétitions
+        for model in models:
+            values = collected[(i, model)]
+            for name in CELL_METRICS:
+                results[model][name][i] = np.mean(values[name])
+            n = len(values["mean_response_time"])
+            mean, _, (low, high) = confidence_interval(values["mean_response_time"], confidence)
+            results[model]["response_time_rel_ci"][i] = (high - low) / 2 / abs(mean)
+            results[model]["n_replications"][i] = n
+            results[model]["nb_customers"][i] = n * nb_clients[i]
+            # Quantiles sur l'histogramme fusionné de toutes les répétitions
+            for name, sketch in sketches[(i, model)].items():
+                for metric, value in quantile_metrics(name, sketch).items():
+                    results[model][metric][i] = value
+    return results
 
 
-def run_experiments(mu=1.0, nb_clients=1000000, n_repeats=5):
+def run_experiments(mu=1.0, nb_clients=1000000, n_repeats=5, backend="numpy", batch=False, workers=1,
+                    seed=0, crn=False, target_rel_ci=None, confidence=0.95, max_repeats=100, warmup=None,
+                    cache=None, queue_metrics=False, mode="simulate", distribution="uniform", work_queue=None,
+                    lambda_values=None):
     """
     Exécute les expériences pour différentes valeurs de lambda
     
+    La grille est découpée en cellules indépendantes (λ, modèle, répétition),
+    ou (λ, modèle) en mode batch. Avec workers > 1 les cellules sont
+    réparties sur un pool de processus ; chaque cellule ayant son propre
+    flux aléatoire et les résultats étant agrégés dans l'ordre de la
+    grille, le résultat est identique à l'exécution séquentielle. Les modes
+    batch et séquentiel utilisent les mêmes flux et donnent les mêmes
+    valeurs par réplication (sauf avec warmup, la troncature étant alors
+    commune aux réplications d'un lot).
+    
+    Avec target_rel_ci, les répétitions sont ajoutées par tours : après
+    chaque tour, toute cellule (λ, modèle) dont la demi-largeur de
+    l'intervalle de confiance du temps de réponse moyen dépasse
+    target_rel_ci × moyenne reçoit le nombre de répétitions estimé
+    nécessaire (n × (demi-largeur / cible)²), dans la limite de max_repeats.
+    
     Paramètres:
     -----------
     mu : float
@@ -241,103 +1831,402 @@ def run_experiments(mu=1.0, nb_clients=1000000, n_repeats=5):
     nb_clients : int
         Nombre de clients à simuler
     n_repeats : int
-        Nombre de répétitions pour chaque expérience
+        Nombre de répétitions pour chaque expérience (nombre initial avec
+        target_rel_ci, au moins 2)
+    backend : str
+        Noyau de la récursion FIFO ("numpy", "python" ou "numba")
+    batch : bool
+        Si True, les répétitions de chaque modèle sont simulées en une seule
+        passe vectorisée (voir QueueSimulator.simulate_batch)
+    workers : int
+        Nombre de processus utilisés (1 = exécution séquentielle)
+    seed : int
+        Graine racine ; chaque (λ, modèle, répétition) reçoit son propre
+        flux dérivé (voir cell_seed_sequence et replication_seed_sequence)
+    crn : bool
+        Si True, chaque répétition tire une seule fois des variables communes
+        à tous les λ et aux trois modèles (flux replication_seed_sequence(seed, j)) ;
+        une cellule correspond alors à une répétition de toute la grille et
+        l'option batch est ignorée
+    target_rel_ci : float
+        Précision relative visée sur le temps de réponse moyen (ex. 0.01) ;
+        None pour un nombre fixe de répétitions
+    confidence : float
+        Niveau de confiance des intervalles
+    max_repeats : int
+        Nombre maximal de répétitions par cellule avec target_rel_ci
+    warmup : str
+        Suppression du régime transitoire : None ou "mser5" ; le nombre
+        moyen de clients supprimés est reporté dans "warmup_clients"
+    cache : ResultCache
+        Cache disque des cellules (voir cache.py) : seules les cellules dont
+        les paramètres ont changé sont recalculées
+    queue_metrics : bool
+        Si True, calcule aussi L et Lq par moyenne temporelle de N(t)
+        ("mean_number_in_system", "mean_number_in_queue" ; NaN sinon et en mode batch)
+    mode : str
+        "simulate" (simulation seule), "analytic" (formules exactes de
+        analytic.py, sans simulation : Pollaczek-Khinchine pour M/G/1,
+        racine σ pour G/M/1 et M/M/1) ou "both" (simulation, avec les
+        valeurs exactes de chaque modèle sous la clé "analytic")
+    distribution : str, dict ou Distribution
+        Loi générale de G/M/1 (arrivées) et M/G/1 (services), voir
+        QueueSimulator.generate_times ; une loi construite (ex. empirique)
+        est réutilisée telle quelle par toutes les cellules
+    work_queue : WorkQueue
+        File de travail sur disque (voir work_queue.py) : chaque cellule y
+        est enregistrée dès qu'elle est terminée ; une relance reprend les
+        cellules terminées, et d'autres processus ou machines (même appel,
+        ou WorkQueue.work) peuvent exécuter les cellules en parallèle.
+        Les résultats sont regroupés dans l'ordre de la grille, donc
+        identiques à une exécution directe
+    lambda_values : np.array
+        Valeurs de λ de la grille (None = 0.1 à 0.9 par pas de 0.1)
         
     Retourne:
     ---------
-    dict : Dictionnaire contenant les résultats des expériences
+    dict : Dictionnaire contenant les résultats des expériences, avec pour
+           chaque λ le nombre de répétitions ("n_replications"), de clients
+           simulés ("nb_customers"), la demi-largeur relative de
+           l'intervalle de confiance du temps de réponse ("response_time_rel_ci")
+           et les quantiles des temps d'attente et de réponse sur toutes les
+           répétitions ("wait_time_p50", ..., "response_time_p999")
     """
     # Valeurs de lambda à tester
-    lambda_values = np.arange(0.1, 1.0, 0.1)
+    lambda_values = np.arange(0.1, 1.0, 0.1) if lambda_values is None else np.asarray(lambda_values, dtype=float)
+    models = ("MM1", "GM1", "MG1")
     
-    # Dictionnaires pour stocker les résultats
-    results_mm1 = {
-        "lambda": lambda_values,
-        "mean_response_time": np.zeros(len(lambda_values)),
-        "mean_wait_time": np.zeros(len(lambda_values)),
-        "server_utilization": np.zeros(len(lambda_values))
-    }
+    if mode not in ("simulate", "analytic", "both"):
+        raise ValueError(f"Mode non supporté : {mode} (choix : simulate, analytic, both)")
+    if mode != "simulate":
+        # Valeurs exactes, calculées pour tous les λ à la fois
+        analytic = {model: analytic_metrics(model, lambda_values, mu, distribution, QUANTILES) for model in models}
+    if mode == "analytic":
+        for model in models:
+            analytic[model]["n_replications"] = np.zeros(len(lambda_values), dtype=int)
+            analytic[model]["nb_customers"] = np.zeros(len(lambda_values), dtype=int)
+        print("Métriques exactes calculées (aucune simulation)")
+        return tuple(analytic[model] for model in models)
     
-    results_gm1 = {
-        "lambda": lambda_values,
-        "mean_response_time": np.zeros(len(lambda_values)),
-        "mean_wait_time": np.zeros(len(lambda_values)),
-        "server_utilization": np.zeros(len(lambda_values))
-    }
+    if target_rel_ci is not None:
+        if crn:
+            raise ValueError("target_rel_ci n'est pas compatible avec crn (répétitions communes à toute la grille)")
+        n_repeats = max(n_repeats, 2)
     
-    results_mg1 = {
-        "lambda": lambda_values,
-        "mean_response_time": np.zeros(len(lambda_values)),
-        "mean_wait_time": np.zeros(len(lambda_values)),
-        "server_utilization": np.zeros(len(lambda_values))
-    }
+    # Répétitions restant à simuler par cellule (λ, modèle) et indice de la prochaine
+    pending = {(i, model): n_repeats for i in range(len(lambda_values)) for model in models}
+    next_replication = {key: 0 for key in pending}
+    collected = {key: {name: [] for name in CELL_METRICS} for key in pending}
+    sketches = {key: {name: QuantileSketch() for name in SKETCH_METRICS} for key in pending}
+    
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while pending:
+            # Construction des cellules : clé (indice de λ, modèle) et tâche (fonction, arguments)
+            keys, tasks = [], []
+            if crn:
+                # Une cellule par répétition, couvrant toute la grille (clé None)
+                for j in range(n_repeats):
+                    keys.append(None)
+                    tasks.append((simulate_crn_replication, (lambda_values, mu, nb_clients,
+                                                             replication_seed_sequence(seed, j), backend,
+                                                             distribution, warmup, queue_metrics)))
+            else:
+                for (i, model), count in pending.items():
+                    cell_seed = cell_seed_sequence(seed, i, model)
+                    first = next_replication[(i, model)]
+                    if batch:
+                        keys.append((i, model))
+                        tasks.append((simulate_cell, (lambda_values[i], mu, nb_clients, model, cell_seed, backend,
+                                                      count, distribution, None, first, warmup, queue_metrics)))
+                    else:
+                        for j in range(first, first + count):
+                            keys.append((i, model))
+                            tasks.append((simulate_cell, (lambda_values[i], mu, nb_clients, model,
+                                                          replication_seed_sequence(cell_seed, j), backend,
+                                                          None, distribution, None, 0, warmup, queue_metrics)))
+                    next_replication[(i, model)] = first + count
+            
+            # Exécution des cellules
+            outputs = _execute_tasks(tasks, executor, cache, work_queue, workers)
+            
+            # Regroupement des répétitions par (λ, modèle)
+            for key, output in zip(keys, outputs):
+                items = output.items() if key is None else [(key, output)]
+                for cell_key, cell_output in items:
+                    for name in CELL_METRICS:
+                        collected[cell_key][name].extend(cell_output[name])
+                    for name in SKETCH_METRICS:
+                        sketches[cell_key][name].merge(cell_output[name + "_sketch"])
+            
+            if target_rel_ci is None:
+                break
+            
+            # Règle d'arrêt séquentielle : répétitions supplémentaires où la précision manque
+            pending = {}
+            for key, values in collected.items():
+                n = len(values["mean_response_time"])
+                mean, _, (low, high) = confidence_interval(values["mean_response_time"], confidence)
+                half_width = (high - low) / 2
+                if half_width <= target_rel_ci * abs(mean) or n >= max_repeats:
+                    continue
+                needed = int(np.ceil(n * (half_width / (target_rel_ci * abs(mean))) ** 2))
+                pending[key] = min(max(needed - n, 1), max_repeats - n)
+            if pending:
+                print(f"Précision non atteinte pour {len(pending)} cellule(s), "
+                      f"{sum(pending.values())} répétition(s) supplémentaire(s)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    results = _grid_results(lambda_values, models, collected, sketches, nb_clients, confidence)
+    if mode == "both":
+        for model in models:
+            results[model]["analytic"] = analytic[model]
     
-    # Pour chaque valeur de lambda
     for i, lmbda in enumerate(lambda_values):
-        print(f"\nExpérience pour λ = {lmbda:.1f}, μ = {mu:.1f} (ρ = {lmbda/mu:.2f})")
-        
-        # Répéter l'expérience plusieurs fois pour stabiliser les résultats
-        mm1_response_times = []
-        mm1_wait_times = []
-        mm1_utilizations = []
-        
-        gm1_response_times = []
-        gm1_wait_times = []
-        gm1_utilizations = []
-        
-        mg1_response_times = []
-        mg1_wait_times = []
-        mg1_utilizations = []
-        
-        for j in range(n_repeats):
-            print(f"Répétition {j+1}/{n_repeats}")
-            
-            # Simulation M/M/1
-            simulator = QueueSimulator(lmbda, mu, nb_clients, seed=j)
-            results = simulator.simulate_MM1()
-            mm1_response_times.append(results["mean_response_time"])
-            mm1_wait_times.append(results["mean_wait_time"])
-            mm1_utilizations.append(results["server_utilization"])
-            
-            # Simulation G/M/1 (avec loi uniforme)
-            simulator = QueueSimulator(lmbda, mu, nb_clients, seed=j+100)
-            results = simulator.simulate_GM1(distribution="uniform")
-            gm1_response_times.append(results["mean_response_time"])
-            gm1_wait_times.append(results["mean_wait_time"])
-            gm1_utilizations.append(results["server_utilization"])
-            
-            # Simulation M/G/1 (avec loi uniforme)
-            simulator = QueueSimulator(lmbda, mu, nb_clients, seed=j+200)
-            results = simulator.simulate_MG1(distribution="uniform")
-            mg1_response_times.append(results["mean_response_time"])
-            mg1_wait_times.append(results["mean_wait_time"])
-            mg1_utilizations.append(results["server_utilization"])
-        
-        # Moyennes des répétitions
-        results_mm1["mean_response_time"][i] = np.mean(mm1_response_times)
-        results_mm1["mean_wait_time"][i] = np.mean(mm1_wait_times)
-        results_mm1["server_utilization"][i] = np.mean(mm1_utilizations)
-        
-        results_gm1["mean_response_time"][i] = np.mean(gm1_response_times)
-        results_gm1["mean_wait_time"][i] = np.mean(gm1_wait_times)
-        results_gm1["server_utilization"][i] = np.mean(gm1_utilizations)
-        
-        results_mg1["mean_response_time"][i] = np.mean(mg1_response_times)
-        results_mg1["mean_wait_time"][i] = np.mean(mg1_wait_times)
-        results_mg1["server_utilization"][i] = np.mean(mg1_utilizations)
-        
         # Afficher les résultats intermédiaires
-        print(f"M/M/1 - Temps de réponse moyen: {results_mm1['mean_response_time'][i]:.4f}, "
-              f"Taux d'occupation: {results_mm1['server_utilization'][i]:.4f}")
-        print(f"G/M/1 - Temps de réponse moyen: {results_gm1['mean_response_time'][i]:.4f}, "
-              f"Taux d'occupation: {results_gm1['server_utilization'][i]:.4f}")
-        print(f"M/G/1 - Temps de réponse moyen: {results_mg1['mean_response_time'][i]:.4f}, "
-              f"Taux d'occupation: {results_mg1['server_utilization'][i]:.4f}")
+        print(f"\nExpérience pour λ = {lmbda:g}, μ = {mu:.1f} (ρ = {lmbda/mu:.2f})")
+        for model, label in zip(models, ("M/M/1", "G/M/1", "M/G/1")):
+            print(f"{label} - Temps de réponse moyen: {results[model]['mean_response_time'][i]:.4f}, "
+                  f"p99: {results[model]['response_time_p99'][i]:.4f}, "
+                  f"Taux d'occupation: {results[model]['server_utilization'][i]:.4f}, "
+                  f"Clients simulés: {results[model]['nb_customers'][i]}")
+            if mode == "both":
+                exact = analytic[model]["mean_response_time"][i]
+                print(f"{label} - Temps de réponse exact: {exact:.4f} "
+                      f"(écart: {(results[model]['mean_response_time'][i] - exact) / exact * 100:+.2f}%)")
+    
+    results_mm1, results_gm1, results_mg1 = (results[model] for model in models)
+    return results_mm1, results_gm1, results_mg1
+
+
+def _replication_length(nb_clients, rho, scale_length=True):
+    """
+    Nombre de clients d'une répétition à la charge ρ (grille adaptative)
+    
+    Le temps de relaxation d'une file mono-serveur croît comme 1 / (1 - ρ)² :
+    à longueur fixe, les répétitions proches de la saturation restent
+    biaisées par le départ à vide, quel que soit leur nombre. Avec
+    scale_length, la longueur est multipliée par (0.1 / (1 - ρ))² au-delà de
+    ρ = 0.9 (× 100 à ρ = 0.99).
+    """
+    if not scale_length:
+        return nb_clients
+    return int(nb_clients * max(1.0, (0.1 / (1 - rho)) ** 2))
+
+
+def _refinement_candidates(rho_values, collected, models, nb_clients, n_repeats, tolerance, min_spacing,
+                           confidence, scale_length=True):
+    """
+    Actions possibles d'un tour de raffinement adaptatif, avec leur score
     
+    Les deux sources d'erreur de la courbe sont exprimées en erreur
+    relative sur le temps de réponse moyen T, donc comparables :
+    - entre deux points voisins, l'erreur d'interpolation linéaire de log T,
+      |(log T)''| h² / 8, la dérivée seconde étant estimée par différences
+      divisées aux extrémités de l'intervalle (action : ajouter le milieu) ;
+    - en un point, la demi-largeur relative de l'intervalle de confiance
+      (action : répétitions supplémentaires, au plus le double, selon la
+      même règle que target_rel_ci dans run_experiments).
+    
+    Retourne:
+    ---------
+    list : (score, coût en clients, action) pour chaque action de score
+           supérieur à tolerance ; action = ("split", ρ du milieu) ou
+           ("repeat", indice du point, modèle, répétitions)
+    """
+    order = np.argsort(rho_values)
+    rho = np.asarray(rho_values)[order]
+    candidates = []
+    
+    # Précision statistique en chaque point
+    for point in order:
+        for model in models:
+            values = collected[(point, model)]["mean_response_time"]
+            n = len(values)
+            mean, _, (low, high) = confidence_interval(values, confidence)
+            rel_ci = (high - low) / 2 / abs(mean)
+            if rel_ci > tolerance:
+                needed = int(np.ceil(n * (rel_ci / tolerance) ** 2))
+                extra = min(max(needed - n, 1), n)
+                cost = extra * _replication_length(nb_clients, rho_values[point], scale_length)
+                candidates.append((rel_ci, cost, ("repeat", point, model, extra)))
+    
+    # Courbure entre points voisins
+    log_response = np.array([[np.log(np.mean(collected[(point, model)]["mean_response_time"])) for point in order]
+                             for model in models])
+    slopes = np.diff(log_response, axis=1) / np.diff(rho)
+    curvature = np.zeros(log_response.shape)
+    curvature[:, 1:-1] = np.abs(2 * np.diff(slopes, axis=1) / (rho[2:] - rho[:-2]))
+    curvature[:, 0], curvature[:, -1] = curvature[:, 1], curvature[:, -2]
+    widths = np.diff(rho)
+    errors = np.max(np.maximum(curvature[:, :-1], curvature[:, 1:]), axis=0) * widths**2 / 8
+    for k, (width, error) in enumerate(zip(widths, errors)):
+        if error > tolerance and width / 2 >= min_spacing:
+            middle = (rho[k] + rho[k + 1]) / 2
+            cost = len(models) * n_repeats * _replication_length(nb_clients, middle, scale_length)
+            candidates.append((error, cost, ("split", middle)))
+    return candidates
+
+
+def run_adaptive_experiments(mu=1.0, nb_clients=100000, n_repeats=3, budget=None, rho_max=0.99,
+                             initial_points=5, tolerance=0.01, min_spacing=0.005, scale_length=True,
+                             backend="numpy", workers=1, seed=0, confidence=0.95, warmup=None, cache=None,
+                             queue_metrics=False, mode="simulate", distribution="uniform", work_queue=None):
+    """
+    Exécute les expériences sur une grille de λ raffinée adaptativement
+    
+    La grille part de initial_points valeurs de ρ régulièrement espacées
+    entre 0.1 et rho_max. À chaque tour, les actions de plus grand score
+    (voir _refinement_candidates) sont exécutées : ajout du milieu des
+    intervalles où la courbe log T(ρ) est la plus courbée, ou répétitions
+    supplémentaires aux points dont l'intervalle de confiance est trop
+    large. Les calculs se concentrent ainsi près de la saturation, là où
+    la courbe et la variance explosent. Le raffinement s'arrête quand
+    toutes les erreurs estimées sont sous tolerance, ou quand plus aucune
+    action ne tient dans le budget total.
+    
+    Chaque point reçoit à sa création un indice fixe qui détermine son flux
+    aléatoire (cell_seed_sequence) : le résultat est reproductible et
+    indépendant de workers et du cache.
+    
+    Paramètres:
+    -----------
+    mu, backend, workers, seed, confidence, warmup, cache, queue_metrics,
+    distribution, work_queue :
+        Voir run_experiments
+    nb_clients : int
+        Nombre de clients par répétition (jusqu'à ρ = 0.9 avec scale_length)
+    n_repeats : int
+        Répétitions initiales de chaque (point, modèle), au moins 2
+    budget : int
+        Nombre total de clients simulés, tous points et modèles confondus
+        (None = coût de la grille fixe de run_experiments, 9 λ)
+    rho_max : float
+        Charge du dernier point de la grille (< 1)
+    initial_points : int
+        Nombre de points de la grille initiale (au moins 3)
+    tolerance : float
+        Erreur relative visée sur le temps de réponse moyen
+    min_spacing : float
+        Écart minimal en ρ entre deux points
+    scale_length : bool
+        Si True, allonge les répétitions proches de la saturation comme le
+        temps de relaxation (voir _replication_length) ; le nombre de
+        clients par λ est reporté dans "nb_customers"
+    mode : str
+        "simulate" ou "both" (valeurs exactes sous la clé "analytic")
+        
+    Retourne:
+    ---------
+    tuple : (results_mm1, results_gm1, results_mg1) au format de
+            run_experiments, λ croissants (compatibles avec plot_results et
+            save_results_to_txt)
+    """
+    models = ("MM1", "GM1", "MG1")
+    if mode not in ("simulate", "both"):
+        raise ValueError(f"Mode non supporté : {mode} (choix : simulate, both)")
+    if initial_points < 3 or not 0.1 < rho_max < 1:
+        raise ValueError("La grille adaptative demande au moins 3 points initiaux et 0.1 < rho_max < 1")
+    n_repeats = max(n_repeats, 2)
+    initial_rho = np.linspace(0.1, rho_max, initial_points)
+    initial_cost = len(models) * n_repeats * sum(_replication_length(nb_clients, rho, scale_length)
+                                                 for rho in initial_rho)
+    if budget is None:
+        budget = 9 * len(models) * n_repeats * nb_clients
+    if initial_cost > budget:
+        raise ValueError(f"Budget insuffisant pour la grille initiale ({initial_cost} clients)")
+    
+    # Points par ordre de création ; requêtes (indice du point, modèle, répétitions)
+    rho_values, requests = [], []
+    collected, sketches, next_replication = {}, {}, {}
+    
+    def add_point(rho):
+        point = len(rho_values)
+        rho_values.append(rho)
+        for model in models:
+            collected[(point, model)] = {name: [] for name in CELL_METRICS}
+            sketches[(point, model)] = {name: QuantileSketch() for name in SKETCH_METRICS}
+            next_replication[(point, model)] = 0
+            requests.append((point, model, n_repeats))
+    
+    for rho in initial_rho:
+        add_point(rho)
+    spent = 0
+    n_rounds = 0
+    round_size = max(workers, 4)
+    
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while requests:
+            n_rounds += 1
+            keys, tasks = [], []
+            for point, model, count in requests:
+                cell_seed = cell_seed_sequence(seed, point, model)
+                first = next_replication[(point, model)]
+                length = _replication_length(nb_clients, rho_values[point], scale_length)
+                for j in range(first, first + count):
+                    keys.append((point, model))
+                    tasks.append((simulate_cell, (rho_values[point] * mu, mu, length, model,
+                                                  replication_seed_sequence(cell_seed, j), backend, None,
+                                                  distribution, None, 0, warmup, queue_metrics)))
+                next_replication[(point, model)] = first + count
+                spent += count * length
+            
+            for key, output in zip(keys, _execute_tasks(tasks, executor, cache, work_queue, workers)):
+                for name in CELL_METRICS:
+                    collected[key][name].extend(output[name])
+                for name in SKETCH_METRICS:
+                    sketches[key][name].merge(output[name + "_sketch"])
+            
+            # Actions du tour suivant, par score décroissant, dans la limite du budget
+            requests = []
+            candidates = _refinement_candidates(rho_values, collected, models, nb_clients, n_repeats,
+                                                tolerance, min_spacing, confidence, scale_length)
+            committed, n_actions = 0, 0
+            for score, cost, action in sorted(candidates, key=lambda candidate: -candidate[0]):
+                if n_actions == round_size:
+                    break
+                if spent + committed + cost > budget:
+                    continue
+                committed += cost
+                n_actions += 1
+                if action[0] == "split":
+                    add_point(action[1])
+                else:
+                    requests.append(action[1:])
+            if requests:
+                print(f"Tour {n_rounds} : {len(rho_values)} points, {spent} clients simulés, "
+                      f"{n_actions} action(s) (erreur estimée max {max(c[0] for c in candidates):.4f})")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    # Grille triée par λ croissant
+    order = np.argsort(rho_values)
+    lambda_values = np.asarray(rho_values)[order] * mu
+    sorted_collected = {(i, model): collected[(point, model)] for i, point in enumerate(order) for model in models}
+    sorted_sketches = {(i, model): sketches[(point, model)] for i, point in enumerate(order) for model in models}
+    lengths = [_replication_length(nb_clients, rho, scale_length) for rho in lambda_values / mu]
+    results = _grid_results(lambda_values, models, sorted_collected, sorted_sketches, lengths, confidence)
+    if mode == "both":
+        for model in models:
+            results[model]["analytic"] = analytic_metrics(model, lambda_values, mu, distribution, QUANTILES)
+    
+    print(f"\nGrille adaptative : {len(lambda_values)} valeurs de λ, {spent} clients simulés "
+          f"(budget {budget}), {n_rounds} tour(s)")
+    for i, lmbda in enumerate(lambda_values):
+        print(f"λ = {lmbda:.4f} (ρ = {lmbda/mu:.4f}) - Temps de réponse moyen "
+              + ", ".join(f"{label}: {results[model]['mean_response_time'][i]:.4f} "
+                          f"(±{results[model]['response_time_rel_ci'][i] * 100:.2f}%)"
+                          for model, label in zip(models, ("M/M/1", "G/M/1", "M/G/1"))))
+    
+    results_mm1, results_gm1, results_mg1 = (results[model] for model in models)
     return results_mm1, results_gm1, results_mg1
 
 
-def plot_results(results_mm1, results_gm1, results_mg1):
+def plot_results(results_mm1, results_gm1, results_mg1, show=True):
     """
     Affiche les graphiques des résultats
     
@@ -349,14 +2238,25 @@ def plot_results(results_mm1, results_gm1, results_mg1):
         Résultats pour G/M/1
     results_mg1 : dict
         Résultats pour M/G/1
+    show : bool
+        Si False, la figure est seulement enregistrée (traitement par lots)
     """
-    plt.figure(figsize=(18, 12))
+    import matplotlib.pyplot as plt
+    
+    # Deux graphiques supplémentaires pour les quantiles de queue, s'ils sont fournis
+    quantiles = "response_time_p99" in results_mm1
+    n_columns = 3 if quantiles else 2
+    plt.figure(figsize=(9 * n_columns, 12))
     
     # Graphique du temps de réponse moyen
-    plt.subplot(2, 2, 1)
-    plt.plot(results_mm1["lambda"], results_mm1["mean_response_time"], 'o-', label='M/M/1')
-    plt.plot(results_gm1["lambda"], results_gm1["mean_response_time"], 's-', label='G/M/1')
-    plt.plot(results_mg1["lambda"], results_mg1["mean_response_time"], '^-', label='M/G/1')
+    plt.subplot(2, n_columns, 1)
+    for results, marker, label in ((results_mm1, 'o', 'M/M/1'), (results_gm1, 's', 'G/M/1'),
+                                   (results_mg1, '^', 'M/G/1')):
+        line, = plt.plot(results["lambda"], results["mean_response_time"], marker + '-', label=label)
+        # Valeurs exactes (run_experiments(..., mode="both"))
+        if "analytic" in results:
+            plt.plot(results["lambda"], results["analytic"]["mean_response_time"], '--',
+                     color=line.get_color(), label=f'{label} exact')
     plt.xlabel('Taux d\'arrivée (λ)')
     plt.ylabel('Temps de réponse moyen')
     plt.title('Temps de réponse moyen en fonction du taux d\'arrivée')
@@ -364,7 +2264,7 @@ def plot_results(results_mm1, results_gm1, results_mg1):
     plt.legend()
     
     # Graphique du temps d'attente moyen
-    plt.subplot(2, 2, 2)
+    plt.subplot(2, n_columns, 2)
     plt.plot(results_mm1["lambda"], results_mm1["mean_wait_time"], 'o-', label='M/M/1')
     plt.plot(results_gm1["lambda"], results_gm1["mean_wait_time"], 's-', label='G/M/1')
     plt.plot(results_mg1["lambda"], results_mg1["mean_wait_time"], '^-', label='M/G/1')
@@ -375,7 +2275,7 @@ def plot_results(results_mm1, results_gm1, results_mg1):
     plt.legend()
     
     # Graphique du taux d'occupation
-    plt.subplot(2, 2, 3)
+    plt.subplot(2, n_columns, n_columns + 1)
     plt.plot(results_mm1["lambda"], results_mm1["server_utilization"], 'o-', label='M/M/1')
     plt.plot(results_gm1["lambda"], results_gm1["server_utilization"], 's-', label='G/M/1')
     plt.plot(results_mg1["lambda"], results_mg1["server_utilization"], '^-', label='M/G/1')
@@ -388,7 +2288,7 @@ def plot_results(results_mm1, results_gm1, results_mg1):
     plt.legend()
     
     # Comparaison des distributions
-    plt.subplot(2, 2, 4)
+    plt.subplot(2, n_columns, n_columns + 2)
     # Calculer le ratio entre les temps de réponse
     ratio_gm1_mm1 = results_gm1["mean_response_time"] / results_mm1["mean_response_time"]
     ratio_mg1_mm1 = results_mg1["mean_response_time"] / results_mm1["mean_response_time"]
@@ -402,9 +2302,39 @@ def plot_results(results_mm1, results_gm1, results_mg1):
     plt.grid(True)
     plt.legend()
     
+    if quantiles:
+        # Quantiles du temps de réponse (p95 en pointillés, p99 en trait plein)
+        plt.subplot(2, n_columns, 3)
+        for results, marker, label in ((results_mm1, 'o', 'M/M/1'), (results_gm1, 's', 'G/M/1'),
+                                       (results_mg1, '^', 'M/G/1')):
+            line, = plt.plot(results["lambda"], results["response_time_p99"], marker + '-', label=f'{label} p99')
+            plt.plot(results["lambda"], results["response_time_p95"], marker + ':', color=line.get_color(),
+                     label=f'{label} p95')
+        # Théorie M/M/1 (μ = 1) : T ~ Exp(μ - λ)
+        plt.plot(results_mm1["lambda"], -np.log(0.01) / (1 - results_mm1["lambda"]), 'k--',
+                 label='Théorique M/M/1 p99')
+        plt.xlabel('Taux d\'arrivée (λ)')
+        plt.ylabel('Quantile du temps de réponse')
+        plt.title('Temps de réponse p95 / p99 en fonction du taux d\'arrivée')
+        plt.grid(True)
+        plt.legend()
+        
+        # Queue extrême du temps d'attente
+        plt.subplot(2, n_columns, 6)
+        plt.plot(results_mm1["lambda"], results_mm1["wait_time_p999"], 'o-', label='M/M/1')
+        plt.plot(results_gm1["lambda"], results_gm1["wait_time_p999"], 's-', label='G/M/1')
+        plt.plot(results_mg1["lambda"], results_mg1["wait_time_p999"], '^-', label='M/G/1')
+        plt.xlabel('Taux d\'arrivée (λ)')
+        plt.ylabel('Quantile p99.9 du temps d\'attente')
+        plt.title('Temps d\'attente p99.9 en fonction du taux d\'arrivée')
+        plt.grid(True)
+        plt.legend()
+    
     plt.tight_layout()
     plt.savefig('resultats_files_attente.png', dpi=300)
-    plt.show()
+    if show:
+        plt.show()
+    plt.close()
 
 
 def calculate_theoretical_metrics(lambda_values, mu=1.0):
@@ -431,15 +2361,177 @@ def calculate_theoretical_metrics(lambda_values, mu=1.0):
     # Temps moyen d'attente: E[W] = ρ / (μ - λ)
     wait_times = rho_values / (mu - lambda_values)
     
+    # Nombre moyen de clients (loi de Little : L = λ E[T], Lq = λ E[W])
+    number_in_system = rho_values / (1 - rho_values)
+    number_in_queue = rho_values**2 / (1 - rho_values)
+    
+    theory = {
+        "lambda": lambda_values,
+        "rho": rho_values,
+        "mean_response_time": response_times,
+        "mean_wait_time": wait_times,
+        "mean_number_in_system": number_in_system,
+        "mean_number_in_queue": number_in_queue
+    }
+    
+    # Quantiles : T suit une loi Exp(μ - λ) et P(W > t) = ρ exp(-(μ - λ) t)
+    for label, level in QUANTILES.items():
+        theory[f"response_time_{label}"] = -np.log(1 - level) / (mu - lambda_values)
+        theory[f"wait_time_{label}"] = np.maximum(np.log(rho_values / (1 - level)), 0) / (mu - lambda_values)
+    
+    return theory
+
+
+def calculate_erlang_c_metrics(lambda_values, mu=1.0, c=1):
+    """
+    Calcule les métriques théoriques pour le modèle M/M/c (formule d'Erlang C)
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Valeurs de lambda à utiliser
+    mu : float
+        Taux de service moyen de chaque serveur
+    c : int
+        Nombre de serveurs
+
+    Retourne:
+    ---------
+    dict : Dictionnaire contenant les métriques théoriques (NaN si ρ ≥ 1)
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    offered_load = lambda_values / mu       # a = λ/μ (en Erlangs)
+    rho_values = offered_load / c           # ρ = λ/(cμ)
+
+    # Erlang B par récurrence (stable numériquement) : B(k) = a B(k-1) / (k + a B(k-1))
+    erlang_b = np.ones(lambda_values.shape)
+    for k in range(1, c + 1):
+        erlang_b = offered_load * erlang_b / (k + offered_load * erlang_b)
+
+    # Probabilité d'attente (Erlang C) : C = B / (1 - ρ (1 - B))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability_of_wait = np.where(rho_values < 1, erlang_b / (1 - rho_values * (1 - erlang_b)), np.nan)
+        decay = np.where(rho_values < 1, c * mu - lambda_values, np.nan)
+
+        # Temps moyen d'attente: E[W] = C / (cμ - λ) ; E[T] = E[W] + 1/μ
+        wait_times = probability_of_wait / decay
+    response_times = wait_times + 1 / mu
+
+    theory = {
+        "lambda": lambda_values,
+        "rho": rho_values,
+        "n_servers": c,
+        "probability_of_wait": probability_of_wait,
+        "mean_response_time": response_times,
+        "mean_wait_time": wait_times,
+        "mean_number_in_system": lambda_values * response_times,
+        "mean_number_in_queue": lambda_values * wait_times
+    }
+
+    # Quantiles de l'attente : P(W > t) = C exp(-(cμ - λ) t)
+    for label, level in QUANTILES.items():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            theory[f"wait_time_{label}"] = np.maximum(np.log(probability_of_wait / (1 - level)), 0) / decay
+
+    return theory
+
+
+def calculate_mm1k_metrics(lambda_values, mu=1.0, capacity=10):
+    """
+    Calcule les métriques théoriques pour le modèle M/M/1/K (capacité finie)
+
+    Paramètres:
+    -----------
+    lambda_values : np.array
+        Valeurs de lambda à utiliser (ρ ≥ 1 autorisé : le système reste stable)
+    mu : float
+        Taux de service moyen
+    capacity : int
+        Capacité K du système (clients en service compris)
+
+    Retourne:
+    ---------
+    dict : Dictionnaire contenant les métriques théoriques ; temps d'attente
+           et de réponse des clients admis
+    """
+    lambda_values = np.asarray(lambda_values, dtype=np.float64)
+    rho_values = lambda_values / mu
+    n = np.arange(capacity + 1)
+
+    # Distribution stationnaire : P(N=n) ∝ ρ^n pour n = 0..K (valable aussi pour ρ = 1)
+    weights = rho_values[:, None] ** n
+    probabilities = weights / np.sum(weights, axis=1, keepdims=True)
+    blocking_probability = probabilities[:, -1]
+
+    # Débit effectif λ (1 - P_K) ; loi de Little pour les clients admis
+    effective_throughput = lambda_values * (1 - blocking_probability)
+    number_in_system = probabilities @ n
+    number_in_queue = number_in_system - (1 - probabilities[:, 0])
+    response_times = number_in_system / effective_throughput
+    wait_times = number_in_queue / effective_throughput
+
     return {
         "lambda": lambda_values,
         "rho": rho_values,
+        "capacity": capacity,
+        "blocking_probability": blocking_probability,
+        "effective_throughput": effective_throughput,
+        "server_utilization": 1 - probabilities[:, 0],
         "mean_response_time": response_times,
-        "mean_wait_time": wait_times
+        "mean_wait_time": wait_times,
+        "mean_number_in_system": number_in_system,
+        "mean_number_in_queue": number_in_queue,
+        "queue_length_distribution": probabilities
     }
 
 
-def compare_with_theory(results_mm1, theory):
+def calculate_jackson_metrics(lmbda, stations, routing=None, entry_probabilities=None, mu=1.0):
+    """
+    Calcule les métriques théoriques d'un réseau de Jackson (forme produit)
+
+    Arrivées externes poissonniennes et services exponentiels : chaque
+    station k se comporte comme une file M/M/c isolée de taux d'arrivée
+    λ_k (équations de trafic, network.traffic_rates). La latence moyenne de
+    bout en bout s'en déduit par la loi de Little : E[T] = Σ_k λ_k E[T_k] / λ.
+
+    Paramètres:
+    -----------
+    lmbda : float
+        Taux des arrivées externes
+    stations : list
+        Spécifications des stations (voir QueueSimulator.simulate_network)
+    routing : np.array
+        Matrice de routage (None = tandem)
+    entry_probabilities : np.array
+        Probabilité d'entrée par chaque station (None = station 0)
+    mu : float
+        Taux de service par défaut des stations
+
+    Retourne:
+    ---------
+    dict : Métriques de bout en bout et, par station (tableaux), taux
+           d'arrivée, charge et temps moyens
+    """
+    routing, entry_probabilities = check_routing(tandem_routing(len(stations)) if routing is None else routing,
+                                                 entry_probabilities)
+    arrival_rates = traffic_rates(lmbda, routing, entry_probabilities)
+    per_station = [calculate_erlang_c_metrics(np.array([rate]), station.get("mu", mu), station.get("servers", 1))
+                   for rate, station in zip(arrival_rates, stations)]
+    station_response = np.array([metrics["mean_response_time"][0] for metrics in per_station])
+    station_wait = np.array([metrics["mean_wait_time"][0] for metrics in per_station])
+    return {
+        "lambda": lmbda,
+        "arrival_rates": arrival_rates,
+        "rho": np.array([metrics["rho"][0] for metrics in per_station]),
+        "station_mean_response_time": station_response,
+        "station_mean_wait_time": station_wait,
+        "mean_response_time": np.dot(arrival_rates, station_response) / lmbda,
+        "mean_wait_time": np.dot(arrival_rates, station_wait) / lmbda,
+        "mean_number_in_system": np.dot(arrival_rates, station_response)
+    }
+
+
+def compare_with_theory(results_mm1, theory, show=True):
     """
     Compare les résultats de simulation avec la théorie pour M/M/1
     
@@ -449,7 +2541,11 @@ def compare_with_theory(results_mm1, theory):
         Résultats de la simulation pour M/M/1
     theory : dict
         Métriques théoriques calculées
+    show : bool
+        Si False, la figure est seulement enregistrée (traitement par lots)
     """
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(15, 10))
     
     # Temps de réponse
@@ -474,12 +2570,14 @@ def compare_with_theory(results_mm1, theory):
     
     plt.tight_layout()
     plt.savefig('comparaison_theorie.png', dpi=300)
-    plt.show()
+    if show:
+        plt.show()
+    plt.close()
 
 
-def main():
+def run_interactive():
     """
-    Fonction principale qui exécute les simulations et affiche les résultats
+    Session interactive : paramètres demandés au clavier, graphiques affichés
     """
     print("=== TP : Simulation des files d'attente M/M/1, G/M/1 et M/G/1 ===")
     
@@ -528,5 +2626,172 @@ def main():
     print("\nSimulations terminées! Les graphiques et les résultats texte ont été enregistrés.")
 
 
+def load_config(path):
+    """
+    Lit le fichier de configuration d'un balayage (TOML, ou JSON si l'extension est .json)
+    
+    Les options du balayage sont les arguments de run_experiments (ou de
+    run_adaptive_experiments avec adaptive = true), dans une section [sweep]
+    ou au premier niveau :
+    
+        [sweep]
+        nb_clients = 1000000
+        n_repeats = 5
+        lambda_values = {start = 0.1, stop = 1.0, step = 0.1}   # ou une liste
+        distribution = {name = "gamma", scv = 4}
+        mode = "both"
+        cache = ".cache_simulation"      # répertoire de ResultCache
+        work_queue = "/partage/balayage" # répertoire de WorkQueue
+    
+    Retourne:
+    ---------
+    tuple : (fonction de balayage, dictionnaire de ses arguments)
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        import tomllib
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    options = dict(config.get("sweep", config))
+    function = run_adaptive_experiments if options.pop("adaptive", False) else run_experiments
+    unknown = set(options) - set(inspect.signature(function).parameters)
+    if unknown:
+        raise ValueError(f"Option(s) inconnue(s) pour {function.__name__} : {', '.join(sorted(unknown))}")
+    grid = options.get("lambda_values")
+    if isinstance(grid, dict):
+        # Borne stop exclue, sans le point parasite qu'ajoute l'arrondi de np.arange (0.5 + 3 × 0.1 < 0.8)
+        n_points = int(np.ceil((grid["stop"] - grid["start"]) / grid["step"] - 1e-9))
+        options["lambda_values"] = grid["start"] + grid["step"] * np.arange(n_points)
+    if isinstance(options.get("cache"), str):
+        options["cache"] = ResultCache(options["cache"])
+    if isinstance(options.get("work_queue"), str):
+        options["work_queue"] = WorkQueue(options["work_queue"])
+    return function, options
+
+
+def _to_json(value):
+    """
+    Convertit des résultats (tableaux numpy, dictionnaires imbriqués) en types JSON
+    
+    NaN et infinis deviennent null.
+    """
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return [_to_json(item) for item in np.asarray(value).tolist()] if isinstance(value, np.ndarray) \
+            else [_to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (ResultCache, WorkQueue)):
+        return value.directory
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    return str(value)
+
+
+def run_batch(config_path, workers=None, output="-", report=None, plot=True):
+    """
+    Exécute sans interaction le balayage décrit par un fichier de configuration
+    
+    Les messages de progression sont écrits sur la sortie d'erreur ; le
+    document JSON des résultats (options, durée, résultats des trois
+    modèles, théorie M/M/1) est écrit sur la sortie standard ou dans output.
+    Les graphiques sont enregistrés avec le backend non graphique Agg.
+    
+    Paramètres:
+    -----------
+    config_path : str
+        Fichier de configuration (voir load_config)
+    workers : int
+        Nombre de processus (None = valeur du fichier, sinon 1)
+    output : str
+        Fichier JSON des résultats ("-" = sortie standard)
+    report : str
+        Fichier du rapport texte (save_results_to_txt), optionnel
+    plot : bool
+        Si True, enregistre les graphiques (PNG)
+        
+    Retourne:
+    ---------
+    dict : Document JSON écrit
+    """
+    function, options = load_config(config_path)
+    if workers is not None:
+        options["workers"] = workers
+    start_time = time.time()
+    with redirect_stdout(sys.stderr):
+        results_mm1, results_gm1, results_mg1 = function(**options)
+        theory = calculate_theoretical_metrics(results_mm1["lambda"], options.get("mu", 1.0))
+        if report is not None:
+            save_results_to_txt(results_mm1, results_gm1, results_mg1, theory, filename=report)
+        if plot:
+            import matplotlib
+            matplotlib.use("Agg")
+            plot_results(results_mm1, results_gm1, results_mg1, show=False)
+            compare_with_theory(results_mm1, theory, show=False)
+    document = _to_json({
+        "config": config_path,
+        "sweep": function.__name__,
+        "options": options,
+        "elapsed_seconds": time.time() - start_time,
+        "results": {"MM1": results_mm1, "GM1": results_gm1, "MG1": results_mg1},
+        "theory_mm1": theory
+    })
+    if output == "-":
+        json.dump(document, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=1)
+    return document
+
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande
+    
+        python -m simulation run --config sweep.toml --workers 16 --no-plot
+        python -m simulation work --queue /partage/balayage --workers 16
+        python -m simulation                 (session interactive)
+    """
+    parser = argparse.ArgumentParser(prog="python -m simulation",
+                                     description="Simulation des files d'attente M/M/1, G/M/1 et M/G/1")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="balayage sans interaction décrit par un fichier de configuration")
+    run.add_argument("--config", required=True, help="fichier TOML (ou JSON) des options du balayage")
+    run.add_argument("--workers", type=int, help="nombre de processus (remplace la valeur du fichier)")
+    run.add_argument("--output", default="-", help="fichier JSON des résultats (défaut : sortie standard)")
+    run.add_argument("--report", help="fichier du rapport texte (optionnel)")
+    run.add_argument("--no-plot", action="store_true", help="ne pas tracer (ni importer matplotlib)")
+    work = commands.add_parser("work", help="exécuter les cellules d'une file de travail (voir work_queue.py)")
+    work.add_argument("--queue", required=True, help="répertoire de la file de travail")
+    work.add_argument("--workers", type=int, default=1, help="nombre de processus")
+    work.add_argument("--lease", type=float, default=600.0, help="bail des réservations (s)")
+    args = parser.parse_args(argv)
+    
+    if args.command == "run":
+        run_batch(args.config, args.workers, args.output, args.report, plot=not args.no_plot)
+    elif args.command == "work":
+        queue = WorkQueue(args.queue, lease=args.lease)
+        executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+        try:
+            with redirect_stdout(sys.stderr):
+                executed = queue.work(executor, args.workers)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        print(json.dumps({"queue": args.queue, "executed": executed, **queue.status()}))
+    else:
+        run_interactive()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Exécution via le module importé plutôt que __main__ : les tâches
+    # sérialisées (pool, file de travail) et les clés du cache désignent
+    # alors simulation.simulate_cell, quel que soit le mode de lancement
+    import simulation
+    simulation.main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules du simulateur sont à la racine du dépôt (pas de paquet installé)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
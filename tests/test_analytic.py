@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from analytic import analytic_metrics, gm1_metrics, gm1_sigma, mg1_metrics
+from simulation import QUANTILES, QueueSimulator, calculate_theoretical_metrics, run_experiments
+
+LAMBDA_VALUES = np.array([0.1, 0.5, 0.9, 0.99])
+
+
+def test_pollaczek_khinchine_reduces_to_mm1():
+    exact = calculate_theoretical_metrics(LAMBDA_VALUES, 1.0)
+    metrics = mg1_metrics(LAMBDA_VALUES, 1.0, "exponential")
+    for name in ("mean_wait_time", "mean_response_time", "mean_number_in_system", "mean_number_in_queue"):
+        np.testing.assert_allclose(metrics[name], exact[name], rtol=1e-12, err_msg=name)
+
+
+def test_gm1_sigma_with_poisson_arrivals_is_rho():
+    np.testing.assert_allclose(gm1_sigma(LAMBDA_VALUES, 1.0, "exponential"), LAMBDA_VALUES, atol=1e-12)
+
+
+def test_gm1_sigma_below_rho_for_regular_arrivals():
+    # Arrivées moins variables que Poisson : attente plus courte qu'en M/M/1
+    sigma = gm1_metrics(LAMBDA_VALUES, 1.0, "uniform")["sigma"]
+    assert np.all((sigma > 0) & (sigma < LAMBDA_VALUES))
+
+
+def test_mm1_analytic_metrics_match_closed_form():
+    exact = calculate_theoretical_metrics(LAMBDA_VALUES, 1.0)
+    metrics = analytic_metrics("MM1", LAMBDA_VALUES, 1.0, quantiles=QUANTILES)
+    for name in exact:
+        if name not in ("lambda", "rho"):
+            np.testing.assert_allclose(metrics[name], exact[name], rtol=1e-9, err_msg=name)
+
+
+def test_unstable_load_is_nan():
+    assert np.isnan(mg1_metrics([1.2], 1.0)["mean_wait_time"][0])
+    assert np.isnan(gm1_sigma([1.2], 1.0)[0])
+
+
+@pytest.mark.parametrize("model", ["GM1", "MG1"])
+def test_analytic_metrics_match_simulation(model):
+    simulator = QueueSimulator(0.7, 1.0, 400000, seed=0)
+    results = simulator.simulate_GM1("uniform") if model == "GM1" else simulator.simulate_MG1("uniform")
+    exact = analytic_metrics(model, [0.7], 1.0, "uniform")
+    assert results["mean_response_time"] == pytest.approx(exact["mean_response_time"][0], rel=0.03)
+
+
+def test_analytic_mode_runs_no_simulation():
+    results = run_experiments(mode="analytic", lambda_values=[0.5, 0.8], distribution="uniform")
+    for model, model_results in zip(("MM1", "GM1", "MG1"), results):
+        np.testing.assert_array_equal(model_results["n_replications"], 0)
+        np.testing.assert_allclose(model_results["mean_response_time"],
+                                   analytic_metrics(model, [0.5, 0.8], 1.0, "uniform")["mean_response_time"])
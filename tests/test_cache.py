@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+
+import cache as cache_module
+from cache import ResultCache, _kernel_files
+from simulation import _execute_tasks, simulate_cell
+
+
+def _tasks():
+    return [(simulate_cell, (lmbda, 1.0, 2000, "MM1", seed)) for lmbda, seed in ((0.5, 0), (0.8, 1))]
+
+
+def test_replay_returns_stored_results(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    computed = _execute_tasks(_tasks(), cache=cache)
+    assert all(cache.contains(cache.key(task)) for task in _tasks())
+
+    # Relance : aucune cellule ne doit être recalculée
+    def fail(task):
+        raise AssertionError(f"cellule recalculée : {task}")
+
+    monkeypatch.setattr("simulation._run_task", fail)
+    replayed = _execute_tasks(_tasks(), cache=ResultCache(str(tmp_path)))
+    for first, second in zip(computed, replayed):
+        assert first.keys() == second.keys()
+        for name in first:
+            np.testing.assert_array_equal(first[name], second[name])
+
+
+def test_key_depends_on_parameters(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    first, second = _tasks()
+    assert cache.key(first) == cache.key((simulate_cell, first[1]))
+    assert cache.key(first) != cache.key(second)
+
+
+def test_code_version_covers_kernels():
+    # Un changement dans un module appelé par simulate_cell invalide le cache
+    names = {os.path.basename(path) for path in _kernel_files(os.path.dirname(cache_module.__file__))}
+    assert {"simulation.py", "lindley.py", "multiserver.py", "distributions.py"} <= names
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for index, key in enumerate(("a", "b", "c")):
+        cache.put(key, {"values": np.zeros(1000)})
+        os.utime(cache._path(key), (index, index))
+    cache.get("a")
+    cache.max_bytes = 2 * os.path.getsize(cache._path("a"))
+    cache.evict()
+    assert cache.contains("a") and cache.contains("c") and not cache.contains("b")
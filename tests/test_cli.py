@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from simulation import load_config, main, run_experiments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIG = """
+[sweep]
+nb_clients = 2000
+n_repeats = 2
+seed = 3
+lambda_values = {start = 0.5, stop = 0.8, step = 0.1}
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "sweep.toml"
+    path.write_text(CONFIG, encoding="utf-8")
+    return str(path)
+
+
+def test_run_writes_sweep_results(config_path, tmp_path, capsys):
+    output, report = str(tmp_path / "results.json"), str(tmp_path / "report.txt")
+    main(["run", "--config", config_path, "--no-plot", "--output", output, "--report", report])
+    # Progression sur la sortie d'erreur, rien sur la sortie standard
+    assert capsys.readouterr().out == ""
+    with open(output, encoding="utf-8") as f:
+        document = json.load(f)
+    expected = run_experiments(nb_clients=2000, n_repeats=2, seed=3, lambda_values=[0.5, 0.6, 0.7])
+    assert document["sweep"] == "run_experiments"
+    np.testing.assert_allclose(document["results"]["MM1"]["lambda"], [0.5, 0.6, 0.7])
+    np.testing.assert_allclose(document["results"]["MG1"]["mean_response_time"], expected[2]["mean_response_time"])
+    assert os.path.getsize(report) > 0
+
+
+def test_cli_does_not_import_matplotlib(config_path):
+    # Processus neuf : seul le tracé importe matplotlib
+    code = ("import sys, simulation; simulation.main(sys.argv[1:]); "
+            "sys.stderr.write('matplotlib' in sys.modules and 'IMPORTED' or 'LAZY')")
+    completed = subprocess.run([sys.executable, "-c", code, "run", "--config", config_path, "--no-plot"],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(completed.stdout)["results"]["MM1"]["n_replications"] == [2, 2, 2]
+    assert completed.stderr.endswith("LAZY")
+
+
+def test_unknown_option_is_rejected(tmp_path):
+    path = tmp_path / "sweep.toml"
+    path.write_text("[sweep]\nnb_client = 10\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_config(str(path))
+
+
+def test_adaptive_option_selects_adaptive_sweep(tmp_path):
+    path = tmp_path / "sweep.json"
+    path.write_text(json.dumps({"adaptive": True, "nb_clients": 1000, "budget": 100000}), encoding="utf-8")
+    function, options = load_config(str(path))
+    assert function.__name__ == "run_adaptive_experiments"
+    assert options == {"nb_clients": 1000, "budget": 100000}
+
+
+def test_grid_excludes_stop(tmp_path):
+    path = tmp_path / "sweep.toml"
+    path.write_text("lambda_values = {start = 0.5, stop = 1.0, step = 0.05}\n", encoding="utf-8")
+    _, options = load_config(str(path))
+    assert len(options["lambda_values"]) == 10
+    assert options["lambda_values"][-1] == pytest.approx(0.95)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from distributions import Empirical, get_distribution
+
+
+def test_alias_table_reproduces_weights():
+    weights = np.random.default_rng(0).random(50)
+    weights /= weights.sum()
+    probability, alias = Empirical._alias_table(weights)
+    # Masse de chaque case : sa part propre plus les parts qui la désignent comme alias
+    n = len(weights)
+    mass = probability / n + np.bincount(alias, weights=(1 - probability) / n, minlength=n)
+    np.testing.assert_allclose(mass, weights, atol=1e-12)
+
+
+def test_weighted_sampling_frequencies():
+    values = np.array([1.0, 2.0, 5.0, 10.0])
+    weights = np.array([0.1, 0.4, 0.3, 0.2])
+    distribution = Empirical(values, weights)
+    samples = distribution.sample(np.random.default_rng(1), 200000)
+    frequencies = np.array([np.mean(np.isclose(samples, value)) for value in values])
+    np.testing.assert_allclose(frequencies, weights, atol=0.005)
+    assert np.mean(samples) == pytest.approx(distribution.mean, rel=0.01)
+
+
+def test_unweighted_sampling_uses_sample_values():
+    values = np.array([3.0, 1.0, 2.0])
+    distribution = Empirical(values, mean=4.0)
+    samples = distribution.sample(np.random.default_rng(2), 1000)
+    assert set(np.round(samples, 12)) <= set(np.round(values * 4.0 / 2.0, 12))
+
+
+@pytest.mark.parametrize("spec", ["exponential", "uniform", {"name": "gamma", "scv": 4.0},
+                                  {"name": "lognormal", "scv": 2.0}, {"name": "pareto", "scv": 0.5}])
+def test_registry_sampler_moments(spec):
+    distribution = get_distribution(spec, mean=2.0)
+    samples = distribution.sample(np.random.default_rng(4), 400000)
+    assert np.mean(samples) == pytest.approx(2.0, rel=0.02)
+    assert np.var(samples) / np.mean(samples) ** 2 == pytest.approx(distribution.scv, rel=0.1)
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        get_distribution("weibull")
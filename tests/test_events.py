@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from analytic import mg1_discipline_metrics
+from events import benchmark, run_event_simulation
+from lindley import lindley_recursion
+from simulation import QueueSimulator
+
+CLASS_PROBABILITIES = (0.3, 0.7)
+
+
+def test_fifo_calendar_matches_lindley():
+    rng = np.random.default_rng(0)
+    arrival_times = np.cumsum(rng.exponential(1 / 0.9, 20000))
+    service_times = rng.exponential(1.0, 20000)
+    departure_times, wait_times, n_events = run_event_simulation(arrival_times, service_times, "fifo")
+    _, expected_waits = lindley_recursion(arrival_times, service_times, "python")
+    np.testing.assert_allclose(wait_times, expected_waits, rtol=0, atol=1e-9)
+    assert n_events == 2 * len(arrival_times)
+
+
+@pytest.mark.parametrize("discipline", ["priority", "sjf", "ps"])
+def test_disciplines_match_mg1_formulas(discipline):
+    results = QueueSimulator(0.8, 1.0, 200000, seed=0).simulate_discipline(
+        discipline, class_probabilities=CLASS_PROBABILITIES)
+    exact = mg1_discipline_metrics([0.8], 1.0, "exponential", discipline, CLASS_PROBABILITIES)
+    # PS : E[T] = 1 / (μ - λ)
+    assert results["mean_response_time"] == pytest.approx(exact["mean_response_time"][0], rel=0.03)
+    if discipline == "priority":
+        np.testing.assert_allclose(results["class_mean_wait_time"], exact["class_mean_wait_time"][0], rtol=0.03)
+
+
+def test_benchmark_reports_throughput():
+    # Plancher très en dessous des débits mesurés (≥ 6·10^5 événements/s) : détecte une régression d'ordre
+    for discipline in ("priority", "sjf", "ps"):
+        results = benchmark(discipline, nb_clients=20000)
+        assert results["events"] == 2 * 20000
+        assert results["events_per_second"] > 5e4
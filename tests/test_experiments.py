@@ -0,0 +1,51 @@
+import numpy as np
+
+from simulation import run_adaptive_experiments, run_experiments
+
+
+def _assert_same_results(first, second):
+    for model_first, model_second in zip(first, second):
+        assert model_first.keys() == model_second.keys()
+        for name, value in model_first.items():
+            np.testing.assert_array_equal(value, model_second[name], err_msg=name)
+
+
+def test_process_pool_matches_sequential_run():
+    options = dict(nb_clients=2000, n_repeats=2, seed=3, lambda_values=[0.5, 0.8])
+    _assert_same_results(run_experiments(workers=1, **options), run_experiments(workers=2, **options))
+
+
+def test_crn_sweep_is_reproducible():
+    options = dict(nb_clients=2000, n_repeats=2, seed=5, crn=True, lambda_values=[0.3, 0.6, 0.9])
+    first = run_experiments(**options)
+    _assert_same_results(first, run_experiments(**options))
+    # Aléas communs à tous les λ : arrivées plus serrées point par point, attente croissante
+    for results in first:
+        assert np.all(np.diff(results["mean_wait_time"]) > 0)
+
+
+def test_target_relative_ci_is_reached():
+    results = run_experiments(nb_clients=5000, n_repeats=5, seed=1, target_rel_ci=0.02, max_repeats=200,
+                              lambda_values=[0.5, 0.7])
+    for model_results in results:
+        assert np.all(model_results["response_time_rel_ci"] <= 0.02)
+        assert np.all(model_results["n_replications"] < 200)
+    # Cinq répétitions ne suffisent pas partout : des tours supplémentaires ont eu lieu
+    assert max(np.max(model_results["n_replications"]) for model_results in results) > 5
+
+
+def test_adaptive_grid_refines_near_saturation():
+    budget = 400000
+    results = run_adaptive_experiments(nb_clients=1000, n_repeats=2, budget=budget, rho_max=0.95, tolerance=0.02)
+    lambda_values = results[0]["lambda"]
+    assert np.all(np.diff(lambda_values) > 0)
+    assert len(lambda_values) > 5
+    added = np.setdiff1d(lambda_values, np.linspace(0.1, 0.95, 5))
+    assert np.all(added > 0.5)
+    assert sum(np.sum(model_results["nb_customers"]) for model_results in results) <= budget
+
+
+def test_adaptive_grid_is_independent_of_workers():
+    options = dict(nb_clients=1000, n_repeats=2, budget=150000, rho_max=0.95, tolerance=0.02, seed=4)
+    _assert_same_results(run_adaptive_experiments(workers=1, **options),
+                         run_adaptive_experiments(workers=2, **options))
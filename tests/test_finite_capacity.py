@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import finite_capacity
+from finite_capacity import finite_capacity_recursion
+from simulation import QueueSimulator, calculate_mm1k_metrics
+
+
+def _times(n, rho, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.exponential(1 / rho, n)), rng.exponential(1.0, n)
+
+
+@pytest.mark.parametrize("capacity", [1, 5, 50])
+def test_segmented_numpy_kernel_refuses_same_customers(monkeypatch, capacity):
+    # Sans numba, le backend "numpy" passe par les segments en forme close
+    monkeypatch.setattr(finite_capacity, "_numba_available", lambda: False)
+    arrival_times, service_times = _times(20000, 1.1, seed=capacity)
+    departure_numpy, wait_numpy, _ = finite_capacity_recursion(arrival_times, service_times, capacity, "numpy")
+    departure_loop, wait_loop, _ = finite_capacity_recursion(arrival_times, service_times, capacity, "python")
+    np.testing.assert_array_equal(np.isnan(wait_numpy), np.isnan(wait_loop))
+    assert np.any(np.isnan(wait_loop))
+    np.testing.assert_allclose(wait_numpy, wait_loop, rtol=0, atol=1e-9)
+
+
+def test_numba_kernel_matches_python_loop():
+    pytest.importorskip("numba")
+    arrival_times, service_times = _times(20000, 0.95, seed=1)
+    compiled = finite_capacity_recursion(arrival_times, service_times, 10, "numba")
+    interpreted = finite_capacity_recursion(arrival_times, service_times, 10, "python")
+    np.testing.assert_array_equal(compiled[1], interpreted[1])
+
+
+def test_stream_matches_one_shot():
+    def run(stream):
+        simulator = QueueSimulator(0.9, 1.0, 30000, seed=2, capacity=8)
+        return simulator.simulate_MM1(stream=stream, chunk_size=997)
+
+    one_shot, streamed = run(False), run(True)
+    assert streamed["blocked_clients"] == one_shot["blocked_clients"] > 0
+    assert streamed["mean_wait_time"] == pytest.approx(one_shot["mean_wait_time"], rel=1e-12)
+
+
+def test_mm1k_matches_theory():
+    results = QueueSimulator(0.9, 1.0, 200000, seed=0, capacity=5, queue_metrics=True).simulate_MM1()
+    theory = calculate_mm1k_metrics(np.array([0.9]), 1.0, capacity=5)
+    for name in ("blocking_probability", "effective_throughput", "mean_wait_time", "mean_number_in_system"):
+        assert results[name] == pytest.approx(theory[name][0], rel=0.05), name
+    np.testing.assert_allclose(results["queue_length_distribution"], theory["queue_length_distribution"][0],
+                               atol=0.01)
+
+
+def test_invalid_capacity_is_rejected():
+    with pytest.raises(ValueError):
+        finite_capacity_recursion(np.ones(3), np.ones(3), 0)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from importance_sampling import cramer_root, siegmund_tail_probability
+from simulation import QueueSimulator
+
+
+def test_cramer_root_mm1():
+    # M/M/1 : θ* = μ - λ
+    assert cramer_root(0.95, 1.0) == pytest.approx(0.05, rel=1e-10)
+
+
+def test_siegmund_matches_exact_mm1_tail():
+    # M/M/1 : P(W > x) = ρ exp(-(μ - λ) x)
+    exact = 0.95 * np.exp(-0.05 * 50)
+    results = siegmund_tail_probability(50, 0.95, 1.0, n_paths=10000, arrival_rng=np.random.default_rng(8),
+                                        service_rng=np.random.default_rng(9))
+    assert results["probability"] == pytest.approx(exact, rel=0.005)
+    assert abs(results["probability"] - exact) <= 4 * results["relative_error"] * results["probability"]
+
+
+def test_estimate_wait_tail_uses_model_laws():
+    results = QueueSimulator(0.9, 1.0, 1000, seed=0).estimate_wait_tail(20, "MM1", n_paths=5000)
+    assert results["probability"] == pytest.approx(0.9 * np.exp(-0.1 * 20), rel=0.02)
+
+
+def test_unstable_queue_is_rejected():
+    with pytest.raises(ValueError):
+        cramer_root(1.0, 1.0)
+    with pytest.raises(ValueError):
+        siegmund_tail_probability(10, 1.2, 1.0, n_paths=10)
+
+
+@pytest.mark.parametrize("service_distribution", ["pareto", "lognormal"])
+def test_heavy_tailed_service_is_rejected(service_distribution):
+    with pytest.raises(ValueError):
+        cramer_root(0.5, 1.0, "exponential", service_distribution)
+    with pytest.raises(ValueError):
+        QueueSimulator(0.5, 1.0, 1000, seed=0).estimate_wait_tail(10, "MG1", service_distribution, n_paths=10)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from lindley import BLOCK_SIZE, NUMPY_CLOCK_TOLERANCE, lindley_recursion
+
+
+def _fifo_times(n, rho, seed=0):
+    rng = np.random.default_rng(seed)
+    arrival_times = np.cumsum(rng.exponential(1 / rho, n))
+    service_times = rng.exponential(1.0, n)
+    return arrival_times, service_times
+
+
+def test_numpy_matches_loop():
+    # Plusieurs blocs de la forme close, dont un incomplet
+    arrival_times, service_times = _fifo_times(3 * BLOCK_SIZE + 17, 0.95)
+    departure_loop, wait_loop = lindley_recursion(arrival_times, service_times, "python")
+    departure_numpy, wait_numpy = lindley_recursion(arrival_times, service_times, "numpy")
+    # Borne documentée : écart relatif à l'horloge de chaque client
+    tolerance = NUMPY_CLOCK_TOLERANCE * arrival_times
+    assert np.all(np.abs(wait_numpy - wait_loop) <= tolerance)
+    assert np.all(np.abs(departure_numpy - departure_loop) <= tolerance)
+    assert np.all(wait_numpy >= 0)
+
+
+def test_numpy_exact_on_small_clock():
+    # Horloge < 1 : l'objectif de 1e-12 en absolu est tenu
+    arrival_times, service_times = _fifo_times(200, 0.9, seed=3)
+    arrival_times, service_times = arrival_times / arrival_times[-1], service_times / arrival_times[-1]
+    _, wait_loop = lindley_recursion(arrival_times, service_times, "python")
+    _, wait_numpy = lindley_recursion(arrival_times, service_times, "numpy")
+    np.testing.assert_allclose(wait_numpy, wait_loop, rtol=0, atol=1e-12)
+
+
+def test_numpy_rows_match_loop():
+    arrival_times, service_times = _fifo_times(2 * 1000, 0.9, seed=1)
+    arrival_times, service_times = arrival_times.reshape(2, -1), service_times.reshape(2, -1)
+    _, wait_numpy = lindley_recursion(arrival_times, service_times, "numpy")
+    for row in range(2):
+        _, wait_loop = lindley_recursion(arrival_times[row], service_times[row], "python")
+        assert np.all(np.abs(wait_numpy[row] - wait_loop) <= NUMPY_CLOCK_TOLERANCE * arrival_times[row])
+
+
+def test_carried_departure_matches_single_block():
+    arrival_times, service_times = _fifo_times(5000, 0.99, seed=2)
+    departure_times, wait_times = lindley_recursion(arrival_times, service_times, "numpy")
+    head_departures, head_waits = lindley_recursion(arrival_times[:1234], service_times[:1234], "numpy")
+    tail_departures, tail_waits = lindley_recursion(arrival_times[1234:], service_times[1234:], "numpy",
+                                                    head_departures[-1])
+    assert np.all(np.abs(np.concatenate((head_waits, tail_waits)) - wait_times)
+                  <= NUMPY_CLOCK_TOLERANCE * arrival_times)
+
+
+def test_empty_block():
+    departure_times, wait_times = lindley_recursion(np.empty(0), np.empty(0), "numpy", 3.0)
+    assert departure_times.shape == wait_times.shape == (0,)
+
+
+def test_numba_matches_loop_bitwise():
+    pytest.importorskip("numba")
+    arrival_times, service_times = _fifo_times(5000, 0.9, seed=2)
+    departure_loop, wait_loop = lindley_recursion(arrival_times, service_times, "python")
+    departure_numba, wait_numba = lindley_recursion(arrival_times, service_times, "numba")
+    np.testing.assert_array_equal(wait_numba, wait_loop)
+    np.testing.assert_array_equal(departure_numba, departure_loop)
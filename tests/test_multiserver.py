@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import multiserver
+from multiserver import multiserver_recursion
+from simulation import QueueSimulator, calculate_erlang_c_metrics
+
+
+def _times(shape, c, rho, seed=0):
+    rng = np.random.default_rng(seed)
+    arrival_times = np.cumsum(rng.exponential(1 / (rho * c), shape), axis=-1)
+    return arrival_times, rng.exponential(1.0, shape)
+
+
+def test_backends_assign_same_servers():
+    arrival_times, service_times = _times((3, 2000), 4, 0.9)
+    departure_numpy, wait_numpy, servers_numpy, free_numpy = multiserver_recursion(arrival_times, service_times, 4)
+    departure_loop, wait_loop, servers_loop, free_loop = multiserver_recursion(arrival_times, service_times, 4,
+                                                                                 "python")
+    np.testing.assert_array_equal(servers_numpy, servers_loop)
+    np.testing.assert_allclose(wait_numpy, wait_loop, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(free_numpy, free_loop, rtol=0, atol=1e-12)
+
+
+def test_numba_matches_python_loop():
+    pytest.importorskip("numba")
+    arrival_times, service_times = _times(5000, 8, 0.95, seed=2)
+    compiled = multiserver_recursion(arrival_times, service_times, 8, "numba")
+    interpreted = multiserver_recursion(arrival_times, service_times, 8, "python")
+    for first, second in zip(compiled, interpreted):
+        np.testing.assert_array_equal(first, second)
+
+
+def test_carried_free_times_match_single_block():
+    arrival_times, service_times = _times(3000, 3, 0.95, seed=1)
+    _, wait_times, _, _ = multiserver_recursion(arrival_times, service_times, 3, "python")
+    _, head_waits, _, free_times = multiserver_recursion(arrival_times[:1000], service_times[:1000], 3, "python")
+    _, tail_waits, _, _ = multiserver_recursion(arrival_times[1000:], service_times[1000:], 3, "python",
+                                                free_times)
+    np.testing.assert_array_equal(np.concatenate((head_waits, tail_waits)), wait_times)
+
+
+def test_numpy_single_replication_warns_without_numba(monkeypatch):
+    monkeypatch.setattr(multiserver, "_numba_available", lambda: False)
+    arrival_times, service_times = _times(100, 2, 0.8)
+    with pytest.warns(RuntimeWarning):
+        multiserver_recursion(arrival_times, service_times, 2)
+
+
+@pytest.mark.parametrize("servers", [2, 4])
+def test_erlang_c_matches_theory(servers):
+    lmbda = 0.75 * servers
+    results = QueueSimulator(lmbda, 1.0, 200000, seed=1, servers=servers).simulate_GGc()
+    theory = calculate_erlang_c_metrics(np.array([lmbda]), 1.0, servers)
+    assert results["theoretical_utilization"] == pytest.approx(theory["rho"][0])
+    assert results["server_utilization"] == pytest.approx(0.75, rel=0.02)
+    assert results["mean_wait_time"] == pytest.approx(theory["mean_wait_time"][0], rel=0.1)
+    assert results["mean_response_time"] == pytest.approx(theory["mean_response_time"][0], rel=0.05)
+
+
+def test_simulator_parameters_unchanged():
+    simulator = QueueSimulator(1.5, 1.0, 5000, seed=0, servers=2)
+    assert simulator.simulate_GGc(c=3)["theoretical_utilization"] == pytest.approx(0.5)
+    simulator.simulate_discipline("priority", c=4)
+    assert (simulator.lmbda, simulator.mu, simulator.rho) == (1.5, 1.0, 0.75)
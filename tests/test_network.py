@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from network import check_routing, topological_order, traffic_rates
+from simulation import QueueSimulator, calculate_jackson_metrics
+
+# Séparation vers deux stations puis jonction
+ROUTING = np.array([[0.0, 0.3, 0.7, 0.0],
+                    [0.0, 0.0, 0.0, 1.0],
+                    [0.0, 0.0, 0.0, 1.0],
+                    [0.0, 0.0, 0.0, 0.0]])
+STATIONS = [{"mu": 1.0}, {"mu": 0.5}, {"mu": 1.0, "servers": 2}, {"mu": 1.5}]
+
+
+def test_traffic_rates():
+    rates = traffic_rates(0.7, ROUTING, np.eye(4)[0])
+    np.testing.assert_allclose(rates, [0.7, 0.21, 0.49, 0.7])
+
+
+def test_jackson_matches_theory():
+    results = QueueSimulator(0.7, 1.0, 200000, seed=2).simulate_network(STATIONS, ROUTING)
+    theory = calculate_jackson_metrics(0.7, STATIONS, ROUTING)
+    assert results["mean_response_time"] == pytest.approx(theory["mean_response_time"], rel=0.05)
+    for k, station in enumerate(results["stations"]):
+        assert station["arrival_rate"] == pytest.approx(theory["arrival_rates"][k], rel=0.02)
+        assert station["mean_response_time"] == pytest.approx(theory["station_mean_response_time"][k], rel=0.06)
+
+
+def test_unvisited_station():
+    routing = np.array([[0.0, 1.0, 0.0],
+                        [0.0, 0.0, 0.0],
+                        [0.0, 0.0, 0.0]])
+    for servers in (1, 3):
+        simulator = QueueSimulator(0.5, 1.0, 1000, seed=0, queue_metrics=True)
+        results = simulator.simulate_network([{}, {}, {"servers": servers}], routing)
+        station = results["stations"][2]
+        assert station["visits"] == 0
+        assert station["server_utilization"] == 0.0
+        assert station["mean_number_in_system"] == 0.0
+
+
+def test_invalid_routing_is_rejected():
+    with pytest.raises(ValueError):
+        check_routing([[0.0, 0.8], [0.0, 0.5], [0.0, 0.0]])
+    with pytest.raises(ValueError):
+        check_routing([[0.6, 0.6], [0.0, 0.0]])
+    with pytest.raises(ValueError):
+        topological_order(np.array([[0.0, 1.0], [0.5, 0.0]]))
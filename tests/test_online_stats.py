@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from lindley import lindley_recursion
+from online_stats import QuantileSketch, QueueLengthStats, RunningStats
+from simulation import QueueSimulator
+
+
+def test_queue_length_satisfies_littles_law():
+    # Sur une trajectoire complète, ∫ N(t) dt = Σ T_i exactement (L = λ E[T])
+    rng = np.random.default_rng(0)
+    arrival_times = np.cumsum(rng.exponential(1 / 0.8, 50000))
+    departure_times, wait_times = lindley_recursion(arrival_times, rng.exponential(1.0, 50000))
+    response_times = departure_times - arrival_times
+
+    stats = QueueLengthStats()
+    for block in np.array_split(np.arange(len(arrival_times)), 7):
+        stats.update(arrival_times[block], departure_times[block], horizon=arrival_times[block[-1]])
+    summary = stats.update(np.empty(0), np.empty(0)).summary()
+
+    duration = departure_times[-1]
+    assert summary["mean_number_in_system"] * duration == pytest.approx(np.sum(response_times), rel=1e-9)
+    assert summary["mean_number_in_queue"] * duration == pytest.approx(np.sum(wait_times), rel=1e-9)
+    assert np.sum(summary["queue_length_distribution"]) == pytest.approx(1.0)
+
+
+def test_running_stats_merge():
+    values = np.random.default_rng(1).gamma(0.5, 2.0, 10001)
+    merged = RunningStats().update(values[:3000]).merge(RunningStats().update(values[3000:]))
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(np.mean(values))
+    assert merged.variance == pytest.approx(np.var(values, ddof=1))
+
+
+def test_mm1_queue_length_distribution():
+    # M/M/1 : P(N = n) = (1 - ρ) ρ^n
+    results = QueueSimulator(0.5, 1.0, 200000, seed=4, queue_metrics=True).simulate_MM1()
+    expected = 0.5 * 0.5 ** np.arange(5)
+    np.testing.assert_allclose(results["queue_length_distribution"][:5], expected, atol=0.01)
+    assert results["mean_number_in_system"] == pytest.approx(1.0, rel=0.05)
+
+
+def test_quantile_sketch_relative_accuracy():
+    values = np.random.default_rng(2).lognormal(0.0, 3.0, 100000)
+    levels = np.array([0.001, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999])
+    sketch = QuantileSketch(relative_accuracy=0.01).update(values)
+    # Valeur exacte de même rang que celle estimée par l'histogramme
+    exact = np.sort(values)[np.floor(levels * (len(values) - 1)).astype(int)]
+    assert np.all(np.abs(sketch.quantile(levels) - exact) <= 0.01 * exact)
+
+
+def test_quantile_sketch_merge_equals_single_sketch():
+    rng = np.random.default_rng(3)
+    first, second = rng.exponential(1.0, 20000), rng.pareto(2.5, 7000)
+    merged = QuantileSketch().update(first).merge(QuantileSketch().update(second))
+    single = QuantileSketch().update(np.concatenate((first, second)))
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    levels = np.linspace(0, 1, 101)
+    np.testing.assert_array_equal(merged.quantile(levels), single.quantile(levels))
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.02))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from analytic import mg1_metrics
+from online_stats import mser_truncation
+from simulation import QueueSimulator, replication_seed_sequence
+
+
+@pytest.mark.parametrize("model", ["MM1", "GM1", "MG1"])
+def test_batch_matches_serial_runs(model):
+    batch = QueueSimulator(0.8, 1.0, 5000, seed=7).simulate_batch(model, n_reps=3)
+    for r in range(3):
+        simulator = QueueSimulator(0.8, 1.0, 5000, seed=replication_seed_sequence(7, r))
+        serial = simulator.simulate_MM1() if model == "MM1" else getattr(simulator, "simulate_" + model)("uniform")
+        for name in ("mean_wait_time", "mean_response_time", "server_utilization"):
+            assert batch[name + "_reps"][r] == pytest.approx(serial[name], rel=1e-12)
+    assert batch["mean_wait_time"] == pytest.approx(np.mean(batch["mean_wait_time_reps"]))
+
+
+@pytest.mark.parametrize("chunk_size", [997, 10 ** 5])
+def test_stream_matches_one_shot(chunk_size):
+    def run(stream):
+        simulator = QueueSimulator(0.9, 1.0, 30000, seed=0)
+        return simulator.simulate_MG1("uniform", stream=stream, chunk_size=chunk_size)
+
+    one_shot, streamed = run(False), run(True)
+    for name in ("mean_wait_time", "mean_response_time", "server_utilization", "makespan"):
+        assert streamed[name] == pytest.approx(one_shot[name], rel=1e-12)
+
+
+def test_rejects_empty_run():
+    with pytest.raises(ValueError):
+        QueueSimulator(0.5, 1.0, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [9973, 10 ** 5])
+def test_stream_warmup_matches_one_shot(chunk_size):
+    # Plus de clients que WARMUP_WINDOW : la troncature est cherchée sur le même préfixe
+    def run(stream):
+        simulator = QueueSimulator(0.99, 1.0, 150000, seed=0, warmup="mser5")
+        return simulator.simulate_MG1("uniform", stream=stream, chunk_size=chunk_size)
+
+    one_shot, streamed = run(False), run(True)
+    assert one_shot["warmup_clients"] > 0
+    assert streamed["warmup_clients"] == one_shot["warmup_clients"]
+    assert streamed["mean_wait_time"] == pytest.approx(one_shot["mean_wait_time"], rel=1e-9)
+
+
+def test_mser_removes_initial_transient():
+    rng = np.random.default_rng(0)
+    series = np.concatenate((np.linspace(20.0, 1.0, 500), 1.0 + 0.1 * rng.standard_normal(5000)))
+    assert 400 <= mser_truncation(series, batch_size=5) <= 600
+
+
+def test_variance_reduced_interval_covers_pollaczek_khinchine():
+    simulator = QueueSimulator(0.7, 1.0, 20000, seed=0)
+    results = simulator.simulate_variance_reduced("MG1", n_reps=10, distribution="uniform", antithetic=True,
+                                                  control_variates=("service", "mm1"))
+    exact = mg1_metrics([0.7], 1.0, "uniform")["mean_response_time"][0]
+    low, high = results["mean_response_time_ci"]
+    assert low <= exact <= high
+    assert results["mean_response_time_variance_reduction"] > 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from lindley import lindley_recursion
+from simulation import replay_trace
+
+N_RECORDS = 20000
+
+
+@pytest.fixture
+def log(tmp_path):
+    rng = np.random.default_rng(0)
+    arrival_times = np.cumsum(rng.exponential(1 / 0.8, N_RECORDS))
+    service_times = rng.exponential(1.0, N_RECORDS)
+    records = np.column_stack((arrival_times, service_times))
+    npy_path, csv_path = tmp_path / "log.npy", tmp_path / "log.csv"
+    np.save(npy_path, records)
+    np.savetxt(csv_path, records, delimiter=",", header="arrival,service", comments="", fmt="%.17g")
+    return str(npy_path), str(csv_path), records
+
+
+def test_csv_and_npy_replays_agree(log):
+    npy_path, csv_path, _ = log
+    from_npy, from_csv = replay_trace(npy_path), replay_trace(csv_path)
+    for name in ("mean_wait_time", "mean_response_time", "server_utilization", "theoretical_utilization"):
+        assert from_csv[name] == pytest.approx(from_npy[name], rel=1e-12), name
+
+
+def test_chunked_replay_matches_one_shot(log):
+    npy_path, _, records = log
+    chunked = replay_trace(npy_path, chunk_size=997)
+    one_shot = replay_trace(npy_path, chunk_size=N_RECORDS)
+    assert chunked["mean_wait_time"] == pytest.approx(one_shot["mean_wait_time"], rel=1e-12)
+    # Même file que la récursion appliquée directement au journal (première arrivée à la date 0)
+    _, wait_times = lindley_recursion(records[:, 0] - records[0, 0], records[:, 1])
+    assert one_shot["mean_wait_time"] == pytest.approx(np.mean(wait_times), rel=1e-9)
+
+
+def test_load_factor_scales_utilisation(log):
+    npy_path, _, _ = log
+    base = replay_trace(npy_path)
+    heavier = replay_trace(npy_path, load_factor=1.2)
+    assert heavier["arrival_rate"] == pytest.approx(1.2 * base["arrival_rate"], rel=1e-12)
+    assert heavier["service_rate"] == pytest.approx(base["service_rate"], rel=1e-12)
+    assert heavier["theoretical_utilization"] == pytest.approx(1.2 * base["theoretical_utilization"], rel=1e-12)
+    assert heavier["mean_wait_time"] > base["mean_wait_time"]
+    with pytest.raises(ValueError):
+        replay_trace(npy_path, load_factor=0)
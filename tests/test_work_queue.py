@@ -0,0 +1,91 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from simulation import run_experiments, simulate_cell
+from work_queue import WorkQueue
+
+
+def _tasks():
+    return [(simulate_cell, (lmbda, 1.0, 2000, "MM1", seed)) for seed, lmbda in enumerate((0.3, 0.5, 0.7, 0.9))]
+
+
+def _write_dead_claim(queue, key):
+    # Réservation laissée par un processus terminé sur cette machine
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    with open(queue._claim_path(key), "w") as f:
+        f.write(f"{socket.gethostname()}:{process.pid}")
+
+
+def _assert_same_outputs(first, second):
+    for output_first, output_second in zip(first, second):
+        assert output_first.keys() == output_second.keys()
+        for name in output_first:
+            np.testing.assert_array_equal(output_first[name], output_second[name])
+
+
+def test_cell_cannot_be_claimed_twice(tmp_path):
+    first, second = WorkQueue(str(tmp_path)), WorkQueue(str(tmp_path))
+    key = first.submit(_tasks()[0])
+    assert first.claim(key)
+    # Réservation vivante (processus en cours, bail non expiré) : refusée à tous
+    assert not second.claim(key)
+    assert not first.claim(key)
+    first.complete(key, {"value": np.ones(1)})
+    assert not os.path.exists(first._claim_path(key))
+
+
+def test_expired_lease_can_be_claimed_again(tmp_path):
+    owner, other = WorkQueue(str(tmp_path), lease=60.0), WorkQueue(str(tmp_path), lease=60.0)
+    key = owner.submit(_tasks()[0])
+    assert owner.claim(key)
+    stale = time.time() - 120.0
+    os.utime(owner._claim_path(key), (stale, stale))
+    assert other.claim(key)
+    assert not owner.claim(key)
+
+
+def test_claim_of_dead_process_can_be_taken_over(tmp_path):
+    queue = WorkQueue(str(tmp_path))
+    key = queue.submit(_tasks()[0])
+    _write_dead_claim(queue, key)
+    assert queue.claim(key)
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    tasks = _tasks()
+    uninterrupted = WorkQueue(str(tmp_path / "direct")).run(tasks)
+
+    # Première exécution interrompue : deux cellules terminées, une réservation abandonnée
+    directory = str(tmp_path / "resumed")
+    WorkQueue(directory).run(tasks[:2])
+    crashed = WorkQueue(directory)
+    key = crashed.submit(tasks[2])
+    _write_dead_claim(crashed, key)
+
+    resumed_queue = WorkQueue(directory)
+    resumed = resumed_queue.run(tasks)
+    _assert_same_outputs(uninterrupted, resumed)
+    assert resumed_queue.status() == {"tasks": 4, "done": 4, "claimed": 0}
+
+
+def test_resume_executes_only_missing_cells(tmp_path):
+    tasks = _tasks()
+    WorkQueue(str(tmp_path)).run(tasks[:3])
+    keys = [WorkQueue(str(tmp_path)).submit(task) for task in tasks]
+    assert WorkQueue(str(tmp_path)).work() == 1
+    assert WorkQueue(str(tmp_path)).status()["done"] == len(set(keys))
+
+
+def test_sweep_through_queue_matches_direct_sweep(tmp_path):
+    options = dict(nb_clients=2000, n_repeats=2, seed=1, lambda_values=[0.5, 0.8])
+    direct = run_experiments(**options)
+    queued = run_experiments(work_queue=WorkQueue(str(tmp_path)), **options)
+    for model_direct, model_queued in zip(direct, queued):
+        for name, value in model_direct.items():
+            np.testing.assert_array_equal(value, model_queued[name], err_msg=name)
@@ -0,0 +1,274 @@
+import itertools
+import os
+
+import numpy as np
+
+# Types compacts par défaut : les dates absolues gardent la double
+# précision (à 10^9 unités de temps, un float32 n'a plus qu'une résolution
+# de 64), les durées tiennent en simple précision
+TRACE_DTYPES = {
+    "arrival_times": np.float64,
+    "departure_times": np.float64,
+    "wait_times": np.float32,
+    "response_times": np.float32
+}
+
+
+class TraceWriter:
+    """
+    Écriture des traces par client dans des fichiers .npy projetés en mémoire
+
+    Un fichier par grandeur (arrival_times.npy, departure_times.npy,
+    wait_times.npy, response_times.npy) est créé à la taille finale, puis
+    rempli bloc par bloc à sa position : seules les pages en cours
+    d'écriture occupent la RAM, et les traces peuvent dépasser la mémoire
+    physique. Les fichiers se relisent sans copie avec open_traces().
+    """
+
+    def __init__(self, directory, nb_clients, dtypes=None):
+        """
+        Paramètres:
+        -----------
+        directory : str
+            Répertoire de sortie (créé si besoin)
+        nb_clients : int
+            Nombre total de clients (taille des fichiers)
+        dtypes : dict
+            Type numpy par grandeur (par défaut TRACE_DTYPES)
+        """
+        self.directory = directory
+        self.nb_clients = nb_clients
+        os.makedirs(directory, exist_ok=True)
+        self.arrays = {}
+        for name, dtype in (dtypes or TRACE_DTYPES).items():
+            path = os.path.join(directory, name + ".npy")
+            self.arrays[name] = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(nb_clients,))
+
+    def write(self, start, **blocks):
+        """
+        Écrit un bloc de valeurs à partir du client d'indice start
+
+        Paramètres:
+        -----------
+        start : int
+            Indice du premier client du bloc
+        blocks : np.array
+            Valeurs par grandeur (arrival_times=..., wait_times=..., ...)
+        """
+        for name, values in blocks.items():
+            if name in self.arrays:
+                self.arrays[name][start:start + len(values)] = values
+
+    def close(self):
+        """
+        Vide les pages modifiées sur le disque et libère les projections
+        """
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+
+
+def open_traces(directory, mode="r"):
+    """
+    Ouvre des traces écrites par TraceWriter, sans copie
+
+    Paramètres:
+    -----------
+    directory : str
+        Répertoire des traces
+    mode : str
+        Mode de projection ("r" lecture seule, "r+" lecture/écriture)
+
+    Retourne:
+    ---------
+    dict : {grandeur: np.memmap}
+    """
+    traces = {}
+    for name in os.listdir(directory):
+        if name.endswith(".npy"):
+            traces[name[:-4]] = np.load(os.path.join(directory, name), mmap_mode=mode)
+    return traces
+
+
+class TraceReader:
+    """
+    Lecture par blocs d'un journal (date d'arrivée, durée de service) pour le rejeu
+
+    Formats acceptés :
+        - fichier .npy de forme (n, k) ou structuré (champs nommés), lu
+          par projection en mémoire ;
+        - répertoire contenant arrival_times.npy et service_times.npy ;
+        - fichier texte .csv (séparateur delimiter, en-tête facultatif),
+          lu ligne à ligne.
+    Seul un bloc de chunk_size enregistrements est converti en mémoire à
+    la fois : la mémoire ne dépend pas de la taille du fichier. Les dates
+    sont transformées en temps inter-arrivées (la première arrivée a lieu
+    à la date 0), divisés par load_factor pour rejouer la trace sous une
+    charge plus forte ou plus faible.
+    """
+
+    def __init__(self, path, arrival_column=0, service_column=1, timestamps=True, load_factor=1.0,
+                 chunk_size=100000, delimiter=","):
+        """
+        Paramètres:
+        -----------
+        path : str
+            Fichier .npy ou .csv, ou répertoire de fichiers .npy
+        arrival_column, service_column : int ou str
+            Colonnes (indice, nom de champ ou nom de l'en-tête CSV) des
+            arrivées et des services ; ignorées pour un répertoire
+        timestamps : bool
+            True si la colonne des arrivées contient des dates croissantes,
+            False si elle contient déjà des temps inter-arrivées
+        load_factor : float
+            Facteur appliqué au taux d'arrivée (1.2 = 20 % de charge en plus)
+        chunk_size : int
+            Nombre d'enregistrements lus à la fois
+        delimiter : str
+            Séparateur des colonnes d'un fichier texte
+        """
+        if load_factor <= 0:
+            raise ValueError("Le facteur de charge doit être strictement positif")
+        self.path = path
+        self.timestamps = timestamps
+        self.load_factor = load_factor
+        self.chunk_size = chunk_size
+        self.delimiter = delimiter
+        self.columns = (arrival_column, service_column)
+        if os.path.isdir(path):
+            self.format = "directory"
+        elif path.endswith(".npy"):
+            self.format = "npy"
+        else:
+            self.format = "text"
+        self._length = None
+
+        # Agrégats des valeurs effectivement rejouées (voir samplers)
+        self.count = 0
+        self.inter_arrival_total = 0.0
+        self.service_total = 0.0
+
+    def __len__(self):
+        """
+        Nombre d'enregistrements (comptage des lignes pour un fichier texte)
+        """
+        if self._length is None:
+            if self.format == "text":
+                lines, last = 0, b"\n"
+                with open(self.path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        lines += block.count(b"\n")
+                        last = block[-1:]
+                lines += last != b"\n"      # Dernière ligne sans saut de ligne
+                self._length = lines - (1 if self._header() is not None else 0)
+            else:
+                self._length = len(self._arrays()[0])
+        return self._length
+
+    def _arrays(self):
+        """
+        Colonnes (arrivées, services) projetées en mémoire, sans copie
+        """
+        if self.format == "directory":
+            return (np.load(os.path.join(self.path, "arrival_times.npy"), mmap_mode="r"),
+                    np.load(os.path.join(self.path, "service_times.npy"), mmap_mode="r"))
+        data = np.load(self.path, mmap_mode="r")
+        if data.dtype.names is not None:
+            return tuple(data[c if isinstance(c, str) else data.dtype.names[c]] for c in self.columns)
+        return data[:, self.columns[0]], data[:, self.columns[1]]
+
+    def _header(self):
+        """
+        Noms des colonnes d'un fichier texte, ou None s'il n'a pas d'en-tête
+        """
+        with open(self.path, encoding="utf-8") as f:
+            fields = [field.strip() for field in f.readline().split(self.delimiter)]
+        try:
+            float(fields[0])
+            return None
+        except ValueError:
+            return fields
+
+    def _raw_chunks(self):
+        """
+        Blocs successifs (colonne des arrivées, services) tels que stockés
+        """
+        if self.format != "text":
+            arrivals, services = self._arrays()
+            for start in range(0, len(arrivals), self.chunk_size):
+                yield (np.asarray(arrivals[start:start + self.chunk_size], dtype=np.float64),
+                       np.asarray(services[start:start + self.chunk_size], dtype=np.float64))
+            return
+        header = self._header()
+        usecols = [header.index(c) if isinstance(c, str) else c for c in self.columns]
+        with open(self.path, encoding="utf-8") as f:
+            if header is not None:
+                f.readline()
+            while True:
+                lines = list(itertools.islice(f, self.chunk_size))
+                if not lines:
+                    return
+                block = np.loadtxt(lines, delimiter=self.delimiter, usecols=usecols, ndmin=2)
+                yield block[:, 0], block[:, 1]
+
+    def chunks(self):
+        """
+        Itère sur les blocs (temps inter-arrivées mis à l'échelle, temps de service)
+
+        Retourne:
+        ---------
+        generator : Couples de np.array d'au plus chunk_size valeurs
+        """
+        previous = None               # Dernière date du bloc précédent
+        for arrivals, services in self._raw_chunks():
+            if self.timestamps:
+                if previous is None:
+                    previous = arrivals[0]
+                inter_arrivals = np.diff(arrivals, prepend=previous)
+                previous = arrivals[-1]
+                if np.any(inter_arrivals < 0):
+                    raise ValueError("Les dates d'arrivée de la trace doivent être croissantes")
+            else:
+                inter_arrivals = arrivals
+            if np.any(services < 0):
+                raise ValueError("Les temps de service de la trace doivent être positifs")
+            yield inter_arrivals / self.load_factor, services
+
+    def samplers(self):
+        """
+        Fonctions size -> np.array lisant la trace, pour QueueSimulator._simulate
+
+        Les deux fonctions parcourent les mêmes blocs (tampon commun d'au
+        plus un bloc d'avance) et mettent à jour count, inter_arrival_total
+        et service_total.
+
+        Retourne:
+        ---------
+        tuple : (temps inter-arrivées, temps de service)
+        """
+        chunks = self.chunks()
+        buffers = [np.empty(0), np.empty(0)]
+
+        def take(index, size):
+            while len(buffers[index]) < size:
+                try:
+                    block = next(chunks)
+                except StopIteration:
+                    raise ValueError(f"La trace contient moins de {size} enregistrements restants") from None
+                buffers[0] = np.concatenate((buffers[0], block[0]))
+                buffers[1] = np.concatenate((buffers[1], block[1]))
+            values, buffers[index] = buffers[index][:size], buffers[index][size:]
+            return values
+
+        def sample_inter_arrival(size):
+            values = take(0, size)
+            self.inter_arrival_total += float(np.sum(values))
+            return values
+
+        def sample_service(size):
+            values = take(1, size)
+            self.service_total += float(np.sum(values))
+            self.count += len(values)
+            return values
+
+        return sample_inter_arrival, sample_service
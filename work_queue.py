@@ -0,0 +1,277 @@
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from cache import ResultCache
+
+# Organisation du répertoire d'une file de travail (partageable entre
+# processus et machines via un système de fichiers commun) :
+#     tasks/<clé>.pkl     tâche (fonction, arguments) sérialisée
+#     claims/<clé>.claim  réservation en cours (contenu "machine:pid")
+#     results/<clé>.npz   résultat (ResultCache, écriture atomique)
+# Une cellule est terminée dès que son résultat existe. La clé est celle de
+# ResultCache : empreinte des paramètres de la cellule et du code de calcul.
+
+
+class WorkQueue:
+    """
+    File de travail sur disque des cellules d'une expérience
+
+    Les cellules sont soumises une fois (idempotent), réservées par création
+    exclusive d'un fichier (O_CREAT | O_EXCL, atomique) et leurs résultats
+    écrits de façon atomique (fichier temporaire puis os.replace). Un
+    processus interrompu ne perd que ses cellules en cours : une relance
+    reprend les cellules terminées, et plusieurs processus ou machines
+    partageant le répertoire se répartissent les cellules restantes.
+
+    Une réservation est rafraîchie périodiquement tant que la cellule
+    s'exécute ; elle est considérée abandonnée si elle n'a pas été
+    rafraîchie depuis lease secondes, ou si son processus (sur la même
+    machine) n'existe plus, et peut alors être reprise. Au pire, une
+    cellule est calculée deux fois : chaque cellule ayant son propre flux
+    aléatoire, les deux calculs donnent le même résultat.
+    """
+
+    def __init__(self, directory="file_de_travail", lease=600.0, poll=1.0):
+        """
+        Paramètres:
+        -----------
+        directory : str
+            Répertoire de la file (créé si besoin)
+        lease : float
+            Durée (s) après laquelle une réservation non rafraîchie est abandonnée
+        poll : float
+            Intervalle (s) d'attente des cellules réservées par d'autres processus
+        """
+        self.directory = directory
+        self.lease = lease
+        self.poll = poll
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.results = ResultCache(os.path.join(directory, "results"), max_bytes=float("inf"))
+        for name in ("tasks", "claims"):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def _task_path(self, key):
+        return os.path.join(self.directory, "tasks", key + ".pkl")
+
+    def _claim_path(self, key):
+        return os.path.join(self.directory, "claims", key + ".claim")
+
+    def submit(self, task):
+        """
+        Ajoute une tâche (fonction, arguments) à la file si elle n'y est pas déjà
+
+        Retourne:
+        ---------
+        str : Clé de la tâche
+        """
+        key = self.results.key(task)
+        path = self._task_path(key)
+        if not os.path.exists(path):
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as f:
+                pickle.dump(task, f)
+            os.replace(temporary, path)
+        return key
+
+    def _abandoned(self, path):
+        """
+        Indique si une réservation est abandonnée (bail expiré ou processus disparu)
+        """
+        try:
+            age = time.time() - os.stat(path).st_mtime
+            with open(path) as f:
+                host, _, pid = f.read().partition(":")
+        except FileNotFoundError:
+            return False
+        if age > self.lease:
+            return True
+        if host == socket.gethostname() and pid.isdigit():
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        return False
+
+    def claim(self, key):
+        """
+        Réserve une cellule pour ce processus
+
+        Retourne:
+        ---------
+        bool : True si la réservation est obtenue
+        """
+        path = self._claim_path(key)
+        for _ in range(2):
+            try:
+                descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._abandoned(path):
+                    return False
+                # Reprise : un seul processus réussit à écarter la réservation abandonnée
+                stale = f"{path}.{self.owner}.stale"
+                try:
+                    os.rename(path, stale)
+                except FileNotFoundError:
+                    return False
+                os.remove(stale)
+                continue
+            with os.fdopen(descriptor, "w") as f:
+                f.write(self.owner)
+            with self._lock:
+                self._active.add(key)
+            return True
+        return False
+
+    def complete(self, key, output):
+        """
+        Enregistre le résultat d'une cellule réservée et libère sa réservation
+        """
+        self.results.put(key, output)
+        with self._lock:
+            self._active.discard(key)
+        try:
+            os.remove(self._claim_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _heartbeat(self, stop):
+        """
+        Rafraîchit les réservations en cours jusqu'à stop (thread)
+        """
+        while not stop.wait(self.lease / 4):
+            with self._lock:
+                active = list(self._active)
+            for key in active:
+                try:
+                    os.utime(self._claim_path(key))
+                except FileNotFoundError:
+                    pass
+
+    def _process(self, keys, run, executor=None, workers=1, wait_others=True):
+        """
+        Réserve et exécute les cellules de keys non terminées
+
+        Paramètres:
+        -----------
+        keys : list
+            Clés des cellules
+        run : callable
+            Exécute la tâche d'une clé : run(key, executor) retourne le
+            résultat, ou un Future si executor est fourni
+        executor : ProcessPoolExecutor
+            Pool de processus (None = exécution séquentielle)
+        workers : int
+            Nombre maximal de cellules exécutées à la fois sur le pool
+        wait_others : bool
+            Si True, attend aussi les cellules réservées par d'autres processus
+
+        Retourne:
+        ---------
+        int : Nombre de cellules exécutées par ce processus
+        """
+        pending = list(dict.fromkeys(keys))
+        in_flight = {}
+        executed = 0
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop,), daemon=True)
+        heartbeat.start()
+        try:
+            while pending or in_flight:
+                waiting = []
+                for key in pending:
+                    if self.results.contains(key):
+                        continue
+                    if (executor is None or len(in_flight) < workers) and self.claim(key):
+                        if executor is None:
+                            self.complete(key, run(key, None))
+                        else:
+                            in_flight[run(key, executor)] = key
+                        executed += 1
+                    else:
+                        waiting.append(key)
+                pending = waiting if wait_others or in_flight else []
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=self.poll, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.complete(in_flight.pop(future), future.result())
+                elif pending:
+                    time.sleep(self.poll)
+        finally:
+            stop.set()
+        return executed
+
+    def run(self, tasks, executor=None, workers=1):
+        """
+        Exécute une liste de tâches à travers la file et retourne leurs résultats
+
+        Les tâches déjà terminées (relance, autre processus) sont lues sur
+        disque ; les autres sont réservées et exécutées ici, ou attendues si
+        un autre processus les a réservées.
+
+        Paramètres:
+        -----------
+        tasks : list
+            Tâches (fonction, arguments)
+        executor : ProcessPoolExecutor
+            Pool de processus (None = exécution séquentielle)
+        workers : int
+            Nombre de processus du pool
+
+        Retourne:
+        ---------
+        list : Résultats dans l'ordre des tâches
+        """
+        keys = [self.submit(task) for task in tasks]
+        by_key = dict(zip(keys, tasks))
+
+        def run(key, pool):
+            function, args = by_key[key]
+            return function(*args) if pool is None else pool.submit(function, *args)
+
+        executed = self._process(keys, run, executor, workers)
+        print(f"File de travail : {len(set(keys))} cellule(s), {executed} exécutée(s) par ce processus")
+        return [self.results.get(key) for key in keys]
+
+    def work(self, executor=None, workers=1):
+        """
+        Exécute les cellules soumises et non terminées (processus de renfort)
+
+        Lancé sur d'autres processus ou machines partageant le répertoire,
+        il n'a besoin d'aucun paramètre d'expérience : les tâches sont lues
+        dans la file. Il s'arrête quand il ne reste aucune cellule à réserver.
+
+        Retourne:
+        ---------
+        int : Nombre de cellules exécutées
+        """
+        keys = sorted(name[:-len(".pkl")] for name in os.listdir(os.path.join(self.directory, "tasks"))
+                      if name.endswith(".pkl"))
+
+        def run(key, pool):
+            with open(self._task_path(key), "rb") as f:
+                function, args = pickle.load(f)
+            return function(*args) if pool is None else pool.submit(function, *args)
+
+        return self._process(keys, run, executor, workers, wait_others=False)
+
+    def status(self):
+        """
+        Avancement de la file
+
+        Retourne:
+        ---------
+        dict : Nombre de cellules soumises ("tasks"), terminées ("done") et réservées ("claimed")
+        """
+        tasks = [name for name in os.listdir(os.path.join(self.directory, "tasks")) if name.endswith(".pkl")]
+        claims = [name for name in os.listdir(os.path.join(self.directory, "claims")) if name.endswith(".claim")]
+        done = sum(self.results.contains(name[:-len(".pkl")]) for name in tasks)
+        return {"tasks": len(tasks), "done": done, "claimed": len(claims)}